@@ -0,0 +1,103 @@
+"""Cold-start benchmark for the serverless entry point (api/index.py).
+
+Each trial is a fresh interpreter that imports api/index.py and then makes
+its first prediction (model load on first use + encode + inference). The
+MongoDB write is left out because it is network-bound. Both modes are
+measured:
+
+    FAST_COLD_START=0  eager model load from JSON, xgboost engine
+    FAST_COLD_START=1  deferred load from the exported .npz, NumPy engine
+
+followed by a per-package import breakdown from `python -X importtime`.
+Export the artifacts first (python -m noshow.inference).
+
+    python benchmarks/bench_cold_start.py --trials 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TRIAL = """
+import asyncio, json, time
+start = time.perf_counter()
+import api.index as api
+imported = time.perf_counter()
+
+class Request:
+    lead_time_days, party_size, deposit_paid, is_repeated_guest = 30, 2, 0, 0
+    previous_cancellations, special_requests_count, visit_month = 0, 1, 7
+
+async def first_prediction():
+    engine = api.model_manager.get_engine()
+    return await api.predict_probability(api.encode_reservation(Request()), engine)
+
+asyncio.run(first_prediction())
+predicted = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_predict_ms": (predicted - imported) * 1000}))
+"""
+
+
+def run_trial(fast: bool) -> dict:
+    env = dict(os.environ, FAST_COLD_START="1" if fast else "0", PREDICTION_CACHE_SIZE="0")
+    output = subprocess.run(
+        [sys.executable, "-c", TRIAL], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_breakdown(fast: bool, top: int) -> list:
+    """(cumulative ms, package) for the slowest top-level imports"""
+    env = dict(os.environ, FAST_COLD_START="1" if fast else "0")
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api.index"], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    ).stderr
+
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, int(cumulative) / 1000, name.strip()))
+
+    # Direct imports of api.index (one level below it), grouped by top-level package
+    entry_depth = next(depth for depth, _, name in entries if name == "api.index")
+    packages = {}
+    for depth, ms, name in entries:
+        if depth == entry_depth + 1:
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + ms
+    return sorted(((ms, package) for package, ms in packages.items()), reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for api/index.py")
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'mode':<18} {'import ms':>10} {'first predict ms':>17} {'total ms':>9}")
+    for fast in (False, True):
+        trials = [run_trial(fast) for _ in range(args.trials)]
+        import_ms = np.median([t["import_ms"] for t in trials])
+        predict_ms = np.median([t["first_predict_ms"] for t in trials])
+        label = "FAST_COLD_START=1" if fast else "FAST_COLD_START=0"
+        print(f"{label:<18} {import_ms:>10.0f} {predict_ms:>17.0f} {import_ms + predict_ms:>9.0f}")
+
+    for fast in (False, True):
+        print(f"\nSlowest imports, FAST_COLD_START={int(fast)}:")
+        for ms, package in import_breakdown(fast, args.top):
+            print(f"  {ms:>8.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
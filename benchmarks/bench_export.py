@@ -0,0 +1,111 @@
+"""Export throughput (rows/s) and memory for /predictions/export.
+
+By default this drives noshow.export.export_chunks over an in-process
+cursor of --rows synthetic predictions, so it measures encoding cost and
+shows peak traced memory staying flat as --rows grows. With --url it
+streams from a running API instead and counts rows as they arrive:
+
+    python benchmarks/bench_export.py --rows 200000
+    python benchmarks/bench_export.py --url http://127.0.0.1:8000 --format csv
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_projection import stored_prediction
+from noshow.export import FORMATS, export_chunks
+
+
+# Documents are recycled from a pool so the cursor itself costs next to nothing
+POOL = [stored_prediction(index) for index in range(1000)]
+
+
+class SyntheticCursor:
+    """Async cursor yielding `rows` documents, like Motor's"""
+
+    def __init__(self, rows: int):
+        self.rows = rows
+
+    def sort(self, *args):
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    def __aiter__(self):
+        return self._generate()
+
+    async def _generate(self):
+        for index in range(self.rows):
+            yield POOL[index % len(POOL)]
+
+
+class SyntheticCollection:
+    def __init__(self, rows: int):
+        self.rows = rows
+
+    def find(self, query, projection=None):
+        return SyntheticCursor(self.rows)
+
+
+async def drain(rows: int, fmt: str) -> int:
+    total_bytes = 0
+    async for chunk in export_chunks(SyntheticCollection(rows), {}, fmt):
+        total_bytes += len(chunk)
+    return total_bytes
+
+
+def run_local(rows: int, fmt: str):
+    """(seconds, bytes, peak traced bytes); memory is traced in a second pass so it doesn't skew timing"""
+    start = time.perf_counter()
+    total_bytes = asyncio.run(drain(rows, fmt))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    asyncio.run(drain(rows, fmt))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, total_bytes, peak
+
+
+async def run_remote(url: str, fmt: str):
+    import httpx
+    rows = 0
+    total_bytes = 0
+    start = time.perf_counter()
+    async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+        async with client.stream("GET", "/predictions/export", params={"format": fmt}) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                rows += chunk.count(b"\n")
+                total_bytes += len(chunk)
+    if fmt == "csv":
+        rows -= 1  # header
+    return time.perf_counter() - start, total_bytes, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--format", choices=tuple(FORMATS), default=None, help="default: both")
+    parser.add_argument("--url", help="stream from a running API instead")
+    args = parser.parse_args()
+
+    for fmt in [args.format] if args.format else FORMATS:
+        if args.url:
+            elapsed, total_bytes, rows = asyncio.run(run_remote(args.url, fmt))
+            print(f"{fmt:<7} {rows:>10,} rows {total_bytes / 1e6:>8.1f} MB {rows / elapsed:>12,.0f} rows/s")
+        else:
+            # Two sizes: peak memory should not scale with the row count
+            for rows in (args.rows // 10, args.rows):
+                elapsed, total_bytes, peak = run_local(rows, fmt)
+                print(f"{fmt:<7} {rows:>10,} rows {total_bytes / 1e6:>8.1f} MB "
+                      f"{rows / elapsed:>12,.0f} rows/s   peak {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
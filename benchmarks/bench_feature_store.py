@@ -0,0 +1,90 @@
+"""Time to usable train/test arrays: read CSV + encode + split vs the feature store.
+
+Writes a synthetic processed_reservations-style CSV (--rows rows, cached
+between runs), then times
+
+- before: pd.read_csv + encode_frame + train_test_split, as train_model.py
+  and generate_efficiency_graphs.py used to do on every run
+- build: the first load_features() call (hash, encode, split, write .npy)
+- after: a warm load_features() call (hash cache hit + np.load mmap)
+
+and checks that the memory-mapped split equals the one built in memory.
+
+    python benchmarks/bench_feature_store.py --rows 2000000
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.features import encode_frame
+from noshow.featurestore import load_features
+
+
+def generate(path: str, rows: int):
+    from process_kaggle_data import MONTHS, OUTPUT_COLUMNS
+    rng = np.random.default_rng(42)
+    pd.DataFrame({
+        'lead_time': rng.integers(0, 700, rows),
+        'party_size': rng.integers(1, 12, rows),
+        'deposit_paid': rng.integers(0, 2, rows),
+        'is_repeated_guest': rng.integers(0, 2, rows),
+        'previous_cancellations': rng.integers(0, 10, rows),
+        'total_of_special_requests': rng.integers(0, 6, rows),
+        'arrival_date_month': np.asarray(MONTHS, dtype=object)[rng.integers(0, 12, rows)],
+        'target': (rng.random(rows) < 0.05).astype(int)
+    }, columns=OUTPUT_COLUMNS).to_csv(path, index=False)
+
+
+def legacy_split(path: str):
+    from sklearn.model_selection import train_test_split
+    df = pd.read_csv(path)
+    X = encode_frame(df)
+    y = df['target'].to_numpy()
+    return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--source", help="existing processed CSV (default: generated in the temp dir)")
+    args = parser.parse_args()
+
+    source = args.source or os.path.join(tempfile.gettempdir(), f"processed_reservations_{args.rows}.csv")
+    if not os.path.exists(source):
+        print(f"Generating {args.rows:,} synthetic reservations -> {source}")
+        generate(source, args.rows)
+    store = tempfile.mkdtemp(prefix="noshow_feature_store_")
+
+    try:
+        start = time.perf_counter()
+        X_train, X_test, y_train, y_test = legacy_split(source)
+        before = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_features(source, store)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        features = load_features(source, store)
+        after = time.perf_counter() - start
+
+        same = (np.array_equal(X_train, features.X_train) and np.array_equal(X_test, features.X_test)
+                and np.array_equal(y_train, features.y_train) and np.array_equal(y_test, features.y_test))
+        print(f"Rows: {len(features):,}  identical split: {same}")
+        print(f"{'before (csv + encode + split)':<32} {before * 1000:>10.1f} ms")
+        print(f"{'build (first load_features)':<32} {build * 1000:>10.1f} ms")
+        print(f"{'after (warm load_features)':<32} {after * 1000:>10.1f} ms")
+        if not same:
+            raise SystemExit("❌ Feature store split differs from train_test_split")
+    finally:
+        shutil.rmtree(store, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
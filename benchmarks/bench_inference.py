@@ -0,0 +1,77 @@
+"""Compare the NumPy tree engine and lookup table with the xgboost DMatrix path.
+
+Checks that the engines agree on a held-out set (the train_model.py test
+split when processed_reservations.csv is available, random reservations
+otherwise), then reports per-request latency for single rows and batches.
+
+    python benchmarks/bench_inference.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.features import encode_columns
+from noshow.inference import BoosterEngine, LookupEngine, NumpyEngine, model_version
+from noshow.lookup import LookupTable
+from noshow.trees import TreeEnsemble
+
+MODEL_PATH = "noshow_xgb.json"
+TOLERANCE = 1e-5
+
+
+def held_out_features(rows: int = 20000) -> np.ndarray:
+    """Test split from train_model.py, or random reservations when the CSV is missing"""
+    if os.path.exists("processed_reservations.csv"):
+        from noshow.featurestore import load_features
+        return load_features("processed_reservations.csv").X_test
+
+    rng = np.random.default_rng(42)
+    return encode_columns(
+        rng.integers(0, 700, rows), rng.integers(1, 12, rows), rng.integers(0, 2, rows),
+        rng.integers(0, 2, rows), rng.integers(0, 10, rows), rng.integers(0, 6, rows),
+        rng.integers(1, 13, rows)
+    )
+
+
+def time_per_call(predict, features: np.ndarray, repeats: int) -> float:
+    """Median wall time of predict(features) in microseconds"""
+    predict(features)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(features)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e6
+
+
+def main():
+    booster = BoosterEngine.from_file(MODEL_PATH)
+    compiled = NumpyEngine.from_file(MODEL_PATH)
+
+    table = LookupTable.compile(TreeEnsemble.from_file(MODEL_PATH), booster.predict, model_version(MODEL_PATH))
+    lookup = LookupEngine(table, compiled)
+    X = held_out_features()
+
+    expected = booster.predict(X)
+    max_error = float(np.abs(expected - compiled.predict(X)).max())
+    print(f"Held-out rows: {len(X):,}  max |xgboost - numpy| = {max_error:.2e}")
+    if max_error > TOLERANCE:
+        raise SystemExit(f"❌ Engines disagree by more than {TOLERANCE}")
+    if not np.array_equal(expected, lookup.predict(X)):
+        raise SystemExit("❌ Lookup table is not exact")
+    print("Lookup table matches xgboost exactly")
+
+    print(f"\n{'rows':>8} {'xgboost us':>12} {'numpy us':>12} {'lookup us':>12}")
+    for rows in (1, 10, 100, 1000, 10000):
+        batch = np.ascontiguousarray(X[:rows])
+        repeats = 200 if rows <= 100 else 20
+        xgb_us = time_per_call(booster.predict, batch, repeats)
+        numpy_us = time_per_call(compiled.predict, batch, repeats)
+        lookup_us = time_per_call(lookup.predict, batch, repeats)
+        print(f"{rows:>8} {xgb_us:>12.1f} {numpy_us:>12.1f} {lookup_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Peak RSS and wall time of process_kaggle_data.py: whole-file read vs chunked, typed ingestion.
+
+Generates a synthetic hotel_bookings-style CSV (all 32 Kaggle columns,
+--rows rows, cached between runs), then runs each pipeline in a fresh
+subprocess that reports its own peak RSS:
+
+- before: the original prepare_dataset (read everything with default
+  dtypes, per-row .apply for deposit_paid, write CSV)
+- after: process_kaggle_data.prepare_dataset (usecols + compact dtypes,
+  vectorized transforms, 1M-row chunks), CSV output; with pyarrow
+  installed also Parquet and Feather
+
+    python benchmarks/bench_ingest.py --rows 10000000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+KAGGLE_COLUMNS = [
+    "hotel", "is_canceled", "lead_time", "arrival_date_year", "arrival_date_month",
+    "arrival_date_week_number", "arrival_date_day_of_month", "stays_in_weekend_nights",
+    "stays_in_week_nights", "adults", "children", "babies", "meal", "country", "market_segment",
+    "distribution_channel", "is_repeated_guest", "previous_cancellations",
+    "previous_bookings_not_canceled", "reserved_room_type", "assigned_room_type", "booking_changes",
+    "deposit_type", "agent", "company", "days_in_waiting_list", "customer_type", "adr",
+    "required_car_parking_spaces", "total_of_special_requests", "reservation_status",
+    "reservation_status_date"
+]
+
+
+def synthetic_chunk(rng, rows: int) -> pd.DataFrame:
+    from process_kaggle_data import MONTHS
+    pick = lambda values, p=None: np.asarray(values, dtype=object)[rng.choice(len(values), rows, p=p)]
+    children = rng.integers(0, 3, rows).astype(float)
+    children[rng.random(rows) < 0.0001] = np.nan
+    columns = {
+        "hotel": pick(["Resort Hotel", "City Hotel"]),
+        "is_canceled": rng.integers(0, 2, rows),
+        "lead_time": rng.integers(0, 700, rows),
+        "arrival_date_year": rng.integers(2015, 2025, rows),
+        "arrival_date_month": pick(MONTHS),
+        "arrival_date_week_number": rng.integers(1, 54, rows),
+        "arrival_date_day_of_month": rng.integers(1, 32, rows),
+        "stays_in_weekend_nights": rng.integers(0, 5, rows),
+        "stays_in_week_nights": rng.integers(0, 10, rows),
+        "adults": rng.integers(1, 5, rows),
+        "children": children,
+        "babies": rng.integers(0, 2, rows),
+        "meal": pick(["BB", "HB", "FB", "SC"]),
+        "country": pick(["PRT", "GBR", "FRA", "ESP", "DEU", "USA"]),
+        "market_segment": pick(["Online TA", "Offline TA/TO", "Direct", "Groups", "Corporate"]),
+        "distribution_channel": pick(["TA/TO", "Direct", "Corporate"]),
+        "is_repeated_guest": rng.integers(0, 2, rows),
+        "previous_cancellations": rng.integers(0, 4, rows),
+        "previous_bookings_not_canceled": rng.integers(0, 4, rows),
+        "reserved_room_type": pick(list("ABCDEFG")),
+        "assigned_room_type": pick(list("ABCDEFG")),
+        "booking_changes": rng.integers(0, 4, rows),
+        "deposit_type": pick(["No Deposit", "Non Refund", "Refundable"], [0.85, 0.13, 0.02]),
+        "agent": rng.integers(1, 500, rows),
+        "company": pick(["NULL", "40", "223"]),
+        "days_in_waiting_list": rng.integers(0, 30, rows),
+        "customer_type": pick(["Transient", "Contract", "Group", "Transient-Party"]),
+        "adr": np.round(rng.random(rows) * 300, 2),
+        "required_car_parking_spaces": rng.integers(0, 2, rows),
+        "total_of_special_requests": rng.integers(0, 5, rows),
+        "reservation_status": pick(["Check-Out", "Canceled", "No-Show"], [0.62, 0.36, 0.02]),
+        "reservation_status_date": pick(["2017-07-01", "2018-03-15", "2019-11-30"]),
+    }
+    return pd.DataFrame(columns, columns=KAGGLE_COLUMNS)
+
+
+def generate(path: str, rows: int, chunk_rows: int = 500_000):
+    rng = np.random.default_rng(42)
+    written = 0
+    while written < rows:
+        chunk = synthetic_chunk(rng, min(chunk_rows, rows - written))
+        chunk.to_csv(path, mode="a" if written else "w", header=not written, index=False)
+        written += len(chunk)
+
+
+def legacy_prepare(input_path: str, output_path: str):
+    """The original prepare_dataset, with the paths made configurable"""
+    df = pd.read_csv(input_path)
+    df = df[df['reservation_status'].isin(["Check-Out", "No-Show"])].copy()
+    df['target'] = (df['reservation_status'] == 'No-Show').astype(int)
+    df['children'] = df['children'].fillna(0)
+    df['party_size'] = df['adults'] + df['children']
+    df['deposit_paid'] = df['deposit_type'].apply(lambda x: 0 if x == 'No Deposit' else 1)
+    cols = ['lead_time', 'party_size', 'deposit_paid', 'is_repeated_guest', 'previous_cancellations',
+            'total_of_special_requests', 'arrival_date_month', 'target']
+    df[cols].fillna(0).to_csv(output_path, index=False)
+
+
+def run_child(pipeline: str, input_path: str, output_path: str, formats):
+    """Runs in the subprocess: one pipeline, then prints wall time and own peak RSS"""
+    start = time.perf_counter()
+    if pipeline == "before":
+        legacy_prepare(input_path, output_path)
+    else:
+        from process_kaggle_data import prepare_dataset
+        prepare_dataset([input_path], output_path, formats)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peak_rss": peak_rss()}))
+
+
+def peak_rss() -> int:
+    """Peak resident bytes of this process.
+
+    VmHWM belongs to the process image; ru_maxrss survives fork+exec on Linux
+    and would include the parent's peak (e.g. from generating the input).
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def measure(pipeline: str, input_path: str, output_path: str, formats) -> dict:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", pipeline, "--input", input_path,
+         "--output", output_path, "--formats", *formats],
+        capture_output=True, text=True, cwd=ROOT
+    )
+    if result.returncode < 0:
+        return {"error": f"killed by signal {-result.returncode} (out of memory?)"}
+    if result.returncode != 0:
+        return {"error": (result.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--input", help="existing bookings CSV (default: generated in the temp dir)")
+    parser.add_argument("--output")
+    parser.add_argument("--formats", nargs="+")
+    parser.add_argument("--child", choices=("before", "after"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.input, args.output, args.formats)
+        return
+
+    input_path = args.input or os.path.join(tempfile.gettempdir(), f"hotel_bookings_{args.rows}.csv")
+    if not os.path.exists(input_path):
+        print(f"Generating {args.rows:,} synthetic bookings -> {input_path}")
+        generate(input_path, args.rows)
+    print(f"Input: {os.path.getsize(input_path) / 1e9:.2f} GB")
+
+    try:
+        import pyarrow  # noqa: F401
+        formats = ["csv", "parquet", "feather"]
+    except ImportError:
+        formats = ["csv"]
+
+    out_dir = tempfile.mkdtemp(prefix="noshow_ingest_")
+    runs = [("before", ["csv"]), ("after", ["csv"])] + ([("after", formats)] if len(formats) > 1 else [])
+    for pipeline, fmts in runs:
+        output = os.path.join(out_dir, f"{pipeline}_{'_'.join(fmts)}.csv")
+        result = measure(pipeline, input_path, output, fmts)
+        label = f"{pipeline} ({', '.join(fmts)})"
+        if "error" in result:
+            print(f"{label:<32} failed: {result['error']}")
+        else:
+            print(f"{label:<32} {result['seconds']:>8.1f} s   peak RSS {result['peak_rss'] / 1e6:>8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
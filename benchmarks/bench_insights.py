@@ -0,0 +1,62 @@
+"""Scalar vs vectorized business insights.
+
+Times business_insights() row by row against noshow.insights.insight_columns
+(+ insight_documents) on random party sizes and float32 model
+probabilities at --rows. Parity between the two is tests/test_insights.py.
+
+    python benchmarks/bench_insights.py --rows 100000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.insights import business_insights, insight_columns, insight_documents, load_params
+
+
+def random_book(rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    party_sizes = rng.integers(1, 21, rows)
+    # Probabilities come out of the model as float32
+    probabilities = rng.random(rows, dtype=np.float32).astype(np.float64)
+    params = load_params()
+    thresholds = [params.high_risk_threshold, params.medium_risk_threshold, params.staff_savings_threshold,
+                  params.high_confidence_threshold, params.medium_confidence_threshold, 0.0, 1.0]
+    probabilities[:len(thresholds)] = thresholds
+    return party_sizes, probabilities
+
+
+def best_of(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    party_sizes, probabilities = random_book(args.rows)
+    sizes, probs = party_sizes.tolist(), probabilities.tolist()
+    timings = {
+        "scalar business_insights": best_of(
+            lambda: [business_insights(size, prob) for size, prob in zip(sizes, probs)], args.repeats),
+        "insight_columns (arrays only)": best_of(
+            lambda: insight_columns(party_sizes, probabilities), args.repeats),
+        "insight_columns + documents": best_of(
+            lambda: insight_documents(insight_columns(party_sizes, probabilities)), args.repeats),
+    }
+    baseline = timings["scalar business_insights"]
+    for label, seconds in timings.items():
+        print(f"{label:<32} {seconds * 1000:>9.1f} ms {args.rows / seconds:>14,.0f} rows/s {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Response serialization cost of a history page: old conversion path vs FastJSONResponse.
+
+"before" is what the list endpoints used to do per request: copy every
+document converting `_id` and `timestamp` to strings, then let FastAPI
+run jsonable_encoder over the payload and render it with the stdlib
+JSONResponse. "after" renders the raw Mongo documents with
+noshow.responses.FastJSONResponse (orjson when installed). Both bodies
+are decoded and compared so the JSON stays identical.
+
+    python benchmarks/bench_json.py --pages 50 500
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from bench_projection import median_ms, project, stored_prediction
+from noshow.projection import projection_for
+from noshow.responses import FastJSONResponse, orjson
+
+
+def before(docs) -> bytes:
+    data = []
+    for doc in docs:
+        doc = dict(doc)
+        doc["_id"] = str(doc["_id"])
+        doc["timestamp"] = doc["timestamp"].isoformat()
+        data.append(doc)
+    content = {"success": True, "data": data, "has_more": True}
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def after(docs) -> bytes:
+    return FastJSONResponse({"success": True, "data": docs, "has_more": True}).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+    print(f"{'page':>6} {'fields':<6} {'bytes':>10} {'before ms':>10} {'after ms':>9} {'speedup':>8}")
+    for size in args.pages:
+        docs = [stored_prediction(i) for i in range(size)]
+        for label, fields in (("slim", None), ("all", "all")):
+            page = [project(doc, projection_for(fields)) for doc in docs]
+            body = after(page)
+            assert json.loads(body) == json.loads(before(page)), "response bodies differ"
+            before_ms = median_ms(lambda: before(page), args.repeats)
+            after_ms = median_ms(lambda: after(page), args.repeats)
+            print(f"{size:>6} {label:<6} {len(body):>10,} {before_ms:>10.3f} {after_ms:>9.3f} "
+                  f"{before_ms / after_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
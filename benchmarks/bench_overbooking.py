@@ -0,0 +1,53 @@
+"""DP vs FFT no-show cover distributions for /slots/optimize.
+
+For each service size, draws party sizes (1-8) and no-show probabilities,
+checks that noshow.overbooking's DP and FFT product-tree pmfs agree, and
+reports the time of each plus a full optimize_overbooking() call (auto
+method, 50-step profit curve):
+
+    python benchmarks/bench_overbooking.py --bookings 100 1000 5000
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.overbooking import no_show_pmf_dp, no_show_pmf_fft, optimize_overbooking
+
+TOLERANCE = 1e-12
+
+
+def best_ms(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'bookings':>8} {'covers':>8} {'max |dp-fft|':>13} {'dp ms':>9} {'fft ms':>9} {'optimize ms':>12}")
+    for bookings in args.bookings:
+        sizes = rng.integers(1, 9, bookings)
+        probabilities = rng.beta(2, 8, bookings)
+        error = float(np.abs(no_show_pmf_dp(sizes, probabilities) - no_show_pmf_fft(sizes, probabilities)).max())
+        if error > TOLERANCE:
+            sys.exit(f"DP and FFT disagree by {error:.2e} at {bookings} bookings")
+        dp_ms = best_ms(lambda: no_show_pmf_dp(sizes, probabilities), args.repeats)
+        fft_ms = best_ms(lambda: no_show_pmf_fft(sizes, probabilities), args.repeats)
+        capacity = int(sizes.sum() * 0.9)
+        optimize_ms = best_ms(lambda: optimize_overbooking(sizes, probabilities, capacity), args.repeats)
+        print(f"{bookings:>8,} {int(sizes.sum()):>8,} {error:>13.1e} {dp_ms:>9.2f} {fft_ms:>9.2f} {optimize_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Page latency by depth: skip/limit versus keyset cursors.
+
+Seeds a scratch database with --documents synthetic predictions (once;
+rerun with --reseed to rebuild), then times one history page at several
+depths both ways. Skip pages grow linearly with depth because Mongo walks
+and discards every earlier index entry; cursor pages stay flat.
+
+    python benchmarks/bench_pagination.py --mongo-uri mongodb://localhost:27017 --documents 1000000
+
+Never point this at the production cluster: it writes to --db (default
+noshow_bench).
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.indexes import ensure_indexes
+from noshow.pagination import HISTORY_SORT, encode_cursor, fetch_page
+
+RISK_LEVELS = ("Low", "Moderate", "Critical")
+
+
+def synthetic_prediction(index: int, start: datetime) -> dict:
+    probability = random.random()
+    return {
+        "customer_name": f"Guest {index}",
+        "party_size": random.randint(1, 12),
+        "deposit_paid": random.randint(0, 1),
+        "lead_time_days": random.randint(0, 365),
+        "is_repeated_guest": random.randint(0, 1),
+        "previous_cancellations": random.randint(0, 3),
+        "special_requests_count": random.randint(0, 5),
+        "visit_month": random.randint(1, 12),
+        "prediction_prob": round(probability, 3),
+        "risk_level": RISK_LEVELS[min(int(probability * 3), 2)],
+        # Several predictions per second, so timestamps tie and _id has to break them
+        "timestamp": start + timedelta(milliseconds=index * 300)
+    }
+
+
+async def seed(collection, documents: int, chunk: int = 10000):
+    start = datetime.utcnow() - timedelta(milliseconds=documents * 300)
+    for offset in range(0, documents, chunk):
+        batch = [synthetic_prediction(i, start) for i in range(offset, min(offset + chunk, documents))]
+        await collection.insert_many(batch, ordered=False)
+        print(f"\r  seeded {offset + len(batch):,}/{documents:,}", end="", flush=True)
+    print()
+
+
+async def time_page(fetch, repeats: int) -> float:
+    """Median milliseconds of `repeats` calls to fetch()"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await fetch()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="noshow_bench")
+    parser.add_argument("--documents", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--reseed", action="store_true")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    collection = client[args.db].predictions
+    if args.reseed:
+        await collection.drop()
+    if await collection.estimated_document_count() < args.documents:
+        await collection.drop()
+        await seed(collection, args.documents)
+    await ensure_indexes(collection)
+
+    depths = [d for d in (0, 1000, 10000, 100000, 500000, args.documents - args.limit) if d < args.documents]
+    print(f"{'depth':>10} {'skip ms':>10} {'cursor ms':>10}")
+    for depth in depths:
+        skip_ms = await time_page(lambda: fetch_page(collection, {}, args.limit, skip=depth), args.repeats)
+
+        # Position the cursor on the row just before `depth` (not timed)
+        cursor = None
+        if depth:
+            anchor = await collection.find({}, {"timestamp": 1}).sort(HISTORY_SORT).skip(depth - 1).limit(1).to_list(1)
+            cursor = encode_cursor(anchor[0])
+        cursor_ms = await time_page(lambda: fetch_page(collection, {}, args.limit, cursor=cursor), args.repeats)
+        print(f"{depth:>10,} {skip_ms:>10.2f} {cursor_ms:>10.2f}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
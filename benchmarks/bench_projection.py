@@ -0,0 +1,129 @@
+"""Payload size and encode/decode cost of a history page: full documents vs slim projection.
+
+Builds --page stored-prediction documents shaped like /predict writes them
+and measures, per page: BSON bytes on the wire from Mongo, BSON decode time,
+the API's JSON response size and its serialization time. The slim
+projection is applied with noshow.projection exactly as the list endpoints
+do. With --mongo-uri the same comparison runs end to end against a scratch
+collection (default db noshow_bench_projection).
+
+    python benchmarks/bench_projection.py --page 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import bson
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.projection import projection_for
+from noshow.search import search_terms
+
+
+def stored_prediction(index: int) -> dict:
+    name = f"Guest Number {index}"
+    return {
+        "_id": bson.ObjectId(),
+        "customer_name": name,
+        "party_size": 4,
+        "deposit_paid": 0,
+        "lead_time_days": 45,
+        "is_repeated_guest": 0,
+        "previous_cancellations": 0,
+        "special_requests_count": 1,
+        "visit_month": 7,
+        "prediction_prob": 0.478,
+        "risk_level": "Moderate",
+        "model_version": "976bbb9a8df2",
+        "search_terms": search_terms(name),
+        "timestamp": datetime(2025, 7, 1) + timedelta(minutes=index),
+        "business_insights": {
+            "revenue_impact": {"potential_revenue": 180, "potential_loss": 86.04, "risk_percentage": 47.8},
+            "cost_optimization": {"prep_waste_avoided": 15.3, "staff_savings": 0, "total_savings": 15.3},
+            "operational_recommendations": {
+                "overbooking": "MEDIUM RISK - Consider accepting 1 additional reservation",
+                "staffing": "Maintain standard staffing but keep backup available",
+                "food_prep": "Prepare 10% less food as precaution"
+            },
+            "financial_summary": {"net_impact": 78.56, "confidence_level": "Medium"}
+        }
+    }
+
+
+def project(doc: dict, projection: dict) -> dict:
+    """What Mongo returns for `doc` under an inclusion or exclusion projection"""
+    if any(projection.values()):
+        return {key: value for key, value in doc.items() if key == "_id" or projection.get(key)}
+    return {key: value for key, value in doc.items() if key not in projection}
+
+
+def to_response(docs):
+    """The list endpoints' per-document conversion + JSON encoding"""
+    data = []
+    for doc in docs:
+        doc = dict(doc)
+        doc["_id"] = str(doc["_id"])
+        doc["timestamp"] = doc["timestamp"].isoformat()
+        data.append(doc)
+    return json.dumps({"success": True, "data": data})
+
+
+def median_ms(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+async def time_mongo(uri: str, db_name: str, docs, projections, repeats: int):
+    from motor.motor_asyncio import AsyncIOMotorClient
+    collection = AsyncIOMotorClient(uri)[db_name].predictions
+    await collection.drop()
+    await collection.insert_many([dict(doc) for doc in docs])
+    results = {}
+    for label, projection in projections.items():
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await collection.find({}, projection).sort("timestamp", -1).limit(len(docs)).to_list(length=None)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[label] = float(np.median(timings))
+    await collection.drop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--mongo-uri")
+    parser.add_argument("--db", default="noshow_bench_projection")
+    args = parser.parse_args()
+
+    docs = [stored_prediction(i) for i in range(args.page)]
+    projections = {"full (fields=all)": projection_for("all"), "slim (default)": projection_for(None)}
+
+    print(f"{args.page}-document page")
+    print(f"{'':<20} {'BSON bytes':>11} {'decode ms':>10} {'JSON bytes':>11} {'encode ms':>10}")
+    for label, projection in projections.items():
+        page = [project(doc, projection) for doc in docs]
+        raw = [bson.encode(doc) for doc in page]
+        decode_ms = median_ms(lambda: [bson.decode(b) for b in raw], args.repeats)
+        body = to_response(page)
+        encode_ms = median_ms(lambda: to_response(page), args.repeats)
+        print(f"{label:<20} {sum(map(len, raw)):>11,} {decode_ms:>10.3f} {len(body):>11,} {encode_ms:>10.3f}")
+
+    if args.mongo_uri:
+        latencies = asyncio.run(time_mongo(args.mongo_uri, args.db, docs, projections, args.repeats // 10 or 1))
+        for label, ms in latencies.items():
+            print(f"Mongo round trip, {label}: {ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""History search latency: unanchored $regex versus indexed search_terms prefixes.
+
+Seeds a scratch database with --documents synthetic predictions carrying
+realistic names (once; --reseed rebuilds), ensures the API's indexes, then
+times the first /predictions/all page plus its count for a few search
+terms in each SEARCH_MODE.
+
+    python benchmarks/bench_search.py --mongo-uri mongodb://localhost:27017 --documents 1000000
+
+Writes only to --db (default noshow_bench_search); never point it at production.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.indexes import ensure_indexes
+from noshow.pagination import fetch_page
+from noshow.search import HIDDEN_FIELDS, RISK_LEVELS, search_query, search_terms
+
+FIRST_NAMES = ["James", "Maria", "Chen", "Aisha", "Olga", "José", "Priya", "Liam", "Fatima", "Kenji", "Zoë", "Noah"]
+LAST_NAMES = ["Smith", "García", "Wang", "Okafor", "Ivanova", "Müller", "Patel", "Kim", "Rossi", "Nguyen", "O'Brien", "Dubois"]
+SEARCHES = ["j", "smi", "maria garc", "moderate", "nobody"]
+
+
+async def seed(collection, documents: int, chunk: int = 10000):
+    start = datetime.utcnow() - timedelta(seconds=documents)
+    for offset in range(0, documents, chunk):
+        batch = []
+        for index in range(offset, min(offset + chunk, documents)):
+            name = f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)} {index}"
+            batch.append({
+                "customer_name": name,
+                "search_terms": search_terms(name),
+                "party_size": random.randint(1, 12),
+                "prediction_prob": round(random.random(), 3),
+                "risk_level": random.choice(RISK_LEVELS),
+                "timestamp": start + timedelta(seconds=index)
+            })
+        await collection.insert_many(batch, ordered=False)
+        print(f"\r  seeded {offset + len(batch):,}/{documents:,}", end="", flush=True)
+    print()
+
+
+async def time_search(collection, query: dict, repeats: int):
+    """Median ms for one page + count, and the match count"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        total = await collection.count_documents(query)
+        await fetch_page(collection, query, 50, projection=HIDDEN_FIELDS)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), total
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="noshow_bench_search")
+    parser.add_argument("--documents", type=int, default=1000000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--reseed", action="store_true")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    collection = client[args.db].predictions
+    if args.reseed or await collection.estimated_document_count() < args.documents:
+        await collection.drop()
+        await seed(collection, args.documents)
+    await ensure_indexes(collection)
+
+    print(f"{'search':<14} {'matches':>10} {'regex ms':>10} {'prefix ms':>10}")
+    for term in SEARCHES:
+        regex_ms, _ = await time_search(collection, search_query(term, "regex"), args.repeats)
+        prefix_ms, matches = await time_search(collection, search_query(term, "prefix"), args.repeats)
+        print(f"{term!r:<14} {matches:>10,} {regex_ms:>10.1f} {prefix_ms:>10.1f}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,167 @@
+"""Wall time and peak RSS of train_model.py vs dataset size: legacy, in-memory hist and external memory.
+
+For each --rows size, writes a synthetic processed_reservations dataset
+(chunked with process_kaggle_data.ChunkWriters, CSV plus Parquet when
+pyarrow is installed, cached between runs) whose no-show label depends on
+the features. Each pipeline then trains in a fresh subprocess that reports
+its own peak RSS:
+
+- legacy: the original train_pipeline (pd.read_csv, encode, train_test_split,
+  plain DMatrix, 100 rounds)
+- memory: train_model.train_pipeline() from the feature store with
+  QuantileDMatrix (first run builds the store, the second reuses it)
+- external: train_model.train_pipeline(mode="external") over the CSV and,
+  with pyarrow, the Parquet file, via ExtMemQuantileDMatrix
+
+The new pipelines use hist, 100 rounds at most and early stopping on the
+test AUC.
+
+    python benchmarks/bench_training.py --rows 1000000 4000000 --nthread 4
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def synthetic_chunk(rng, rows: int) -> pd.DataFrame:
+    from process_kaggle_data import MONTHS, OUTPUT_COLUMNS
+    lead_time = rng.integers(0, 700, rows)
+    deposit_paid = rng.integers(0, 2, rows)
+    previous_cancellations = rng.integers(0, 5, rows)
+    special_requests = rng.integers(0, 6, rows)
+    logit = -4 + 0.004 * lead_time - 1.5 * deposit_paid + 0.6 * previous_cancellations - 0.3 * special_requests
+    return pd.DataFrame({
+        'lead_time': lead_time,
+        'party_size': rng.integers(1, 12, rows),
+        'deposit_paid': deposit_paid,
+        'is_repeated_guest': rng.integers(0, 2, rows),
+        'previous_cancellations': previous_cancellations,
+        'total_of_special_requests': special_requests,
+        'arrival_date_month': np.asarray(MONTHS, dtype=object)[rng.integers(0, 12, rows)],
+        'target': (rng.random(rows) < 1 / (1 + np.exp(-logit))).astype(int)
+    }, columns=OUTPUT_COLUMNS)
+
+
+def generate(base: str, rows: int, formats, chunk_rows: int = 500_000):
+    from process_kaggle_data import ChunkWriters
+    rng = np.random.default_rng(42)
+    writers = ChunkWriters(base + ".csv", formats)
+    try:
+        written = 0
+        while written < rows:
+            chunk = synthetic_chunk(rng, min(chunk_rows, rows - written))
+            writers.write(chunk)
+            written += len(chunk)
+    finally:
+        writers.close()
+
+
+def legacy_train(path: str, nthread: int) -> dict:
+    """The original train_pipeline steps 1-7 (no early stopping, no saving)"""
+    import xgboost as xgb
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import roc_auc_score
+    from noshow.features import FEATURE_COLUMNS, encode_frame
+    df = pd.read_csv(path)
+    X = encode_frame(df)
+    y = df['target'].to_numpy()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    ratio = float(np.sum(y == 0)) / np.sum(y == 1)
+    dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=FEATURE_COLUMNS, nthread=nthread)
+    dtest = xgb.DMatrix(X_test, label=y_test, feature_names=FEATURE_COLUMNS, nthread=nthread)
+    params = {"objective": "binary:logistic", "eval_metric": "auc", "scale_pos_weight": ratio,
+              "max_depth": 4, "eta": 0.1, "nthread": nthread}
+    bst = xgb.train(params=params, dtrain=dtrain, num_boost_round=100,
+                    evals=[(dtrain, "train"), (dtest, "test")], verbose_eval=False)
+    return {"rounds": bst.num_boosted_rounds(), "auc": roc_auc_score(y_test, bst.predict(dtest))}
+
+
+def run_child(pipeline: str, path: str, nthread: int):
+    """Runs in the subprocess: one training run, then prints wall time, rounds, AUC and own peak RSS"""
+    start = time.perf_counter()
+    if pipeline == "legacy":
+        report = legacy_train(path, nthread)
+    else:
+        import contextlib
+        from train_model import train_pipeline
+        with contextlib.redirect_stdout(sys.stderr):
+            report = train_pipeline([path], pipeline, nthread)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peak_rss": peak_rss(), **report}))
+
+
+def peak_rss() -> int:
+    """Peak resident bytes of this process (VmHWM; ru_maxrss would include the parent's)"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def measure(pipeline: str, path: str, nthread: int, workdir: str) -> dict:
+    # Runs in workdir so the feature store and saved models stay out of the repo
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", pipeline, "--input", path, "--nthread", str(nthread)],
+        capture_output=True, text=True, cwd=workdir, env={**os.environ, "PYTHONPATH": ROOT}
+    )
+    if result.returncode < 0:
+        return {"error": f"killed by signal {-result.returncode} (out of memory?)"}
+    if result.returncode != 0:
+        return {"error": (result.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[500_000, 2_000_000, 8_000_000])
+    parser.add_argument("--nthread", type=int, default=os.cpu_count())
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    parser.add_argument("--child", choices=("legacy", "memory", "external"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.input, args.nthread)
+        return
+
+    try:
+        import pyarrow  # noqa: F401
+        formats = ["csv", "parquet"]
+    except ImportError:
+        formats = ["csv"]
+
+    print(f"{'rows':>11}  {'pipeline':<22} {'seconds':>8} {'peak RSS MB':>12} {'rounds':>7} {'AUC':>7}")
+    for rows in args.rows:
+        base = os.path.join(tempfile.gettempdir(), f"processed_reservations_train_{rows}")
+        if not all(os.path.exists(f"{base}.{fmt}") for fmt in formats):
+            generate(base, rows, formats)
+        workdir = tempfile.mkdtemp(prefix="noshow_train_")
+        runs = [("legacy", "csv", "legacy (csv)"), ("memory", "csv", "memory (cold store)"),
+                ("memory", "csv", "memory (warm store)"), ("external", "csv", "external (csv)")]
+        runs += [("external", "parquet", "external (parquet)")] if "parquet" in formats else []
+        for pipeline, fmt, label in runs:
+            result = measure(pipeline, f"{base}.{fmt}", args.nthread, workdir)
+            if "error" in result:
+                print(f"{rows:>11,}  {label:<22} failed: {result['error']}")
+            else:
+                print(f"{rows:>11,}  {label:<22} {result['seconds']:>8.1f} {result['peak_rss'] / 1e6:>12.0f} "
+                      f"{result['rounds']:>7} {result['auc']:>7.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Prediction persistence throughput with and without the write-behind queue.
+
+Uses an in-process Mongo stand-in: each round trip costs --rtt-ms plus
+--per-doc-us per document, and at most --pool-size operations run at once
+(like Motor's maxPoolSize). --concurrency simulated /predict requests
+persist --requests documents either with insert_one each (current path)
+or through WriteBehindQueue.
+
+    python benchmarks/bench_write_behind.py --requests 5000 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noshow.persistence import WriteBehindQueue
+
+
+class StandInCollection:
+    """Latency model of a remote collection behind a bounded connection pool"""
+
+    def __init__(self, rtt_ms: float, per_doc_us: float, pool_size: int):
+        self.rtt = rtt_ms / 1000
+        self.per_doc = per_doc_us / 1e6
+        self.pool = asyncio.Semaphore(pool_size)
+        self.count = 0
+
+    async def insert_one(self, doc):
+        async with self.pool:
+            await asyncio.sleep(self.rtt + self.per_doc)
+            self.count += 1
+
+    async def insert_many(self, docs, ordered=True):
+        async with self.pool:
+            await asyncio.sleep(self.rtt + self.per_doc * len(docs))
+            self.count += len(docs)
+
+
+def document(index: int) -> dict:
+    return {"customer_name": f"Guest {index}", "party_size": 2, "prediction_prob": 0.42, "risk_level": "Low"}
+
+
+async def drive(persist, requests: int, concurrency: int) -> np.ndarray:
+    """Run `requests` persist() calls from `concurrency` clients; returns per-request latency (ms)"""
+    latencies = []
+    counter = iter(range(requests))
+
+    async def client():
+        for index in counter:
+            start = time.perf_counter()
+            await persist(document(index))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return np.array(latencies)
+
+
+def report(label: str, elapsed: float, persisted_after: float, latencies: np.ndarray, requests: int):
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{label:<14} {requests / elapsed:>12,.0f} {requests / persisted_after:>14,.0f} {p50:>9.2f} {p99:>9.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--per-doc-us", type=float, default=20.0)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'mode':<14} {'responses/s':>12} {'persisted/s':>14} {'p50 ms':>9} {'p99 ms':>9}")
+
+    collection = StandInCollection(args.rtt_ms, args.per_doc_us, args.pool_size)
+    start = time.perf_counter()
+    latencies = await drive(collection.insert_one, args.requests, args.concurrency)
+    elapsed = time.perf_counter() - start
+    report("insert_one", elapsed, elapsed, latencies, args.requests)
+
+    collection = StandInCollection(args.rtt_ms, args.per_doc_us, args.pool_size)
+    queue = WriteBehindQueue(lambda: collection, batch_size=args.batch_size, flush_ms=50)
+    await queue.start()
+    start = time.perf_counter()
+    latencies = await drive(queue.put, args.requests, args.concurrency)
+    elapsed = time.perf_counter() - start
+    await queue.stop()
+    persisted_after = time.perf_counter() - start
+    assert collection.count == args.requests, "write-behind lost documents"
+    report("write-behind", elapsed, persisted_after, latencies, args.requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Check that read endpoints stay responsive while /predict is saturated.
+
+Start the API first (python main.py), then:
+
+    python benchmarks/load_test.py --url http://127.0.0.1:8000
+
+Phase 1 measures /predictions/recent latency on an idle server; phase 2
+measures it again while --concurrency clients hammer /predict/batch.
+With inference on the thread pool the two sets of percentiles should be
+close; with inference on the event loop phase 2 degrades sharply.
+Requires httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import time
+import httpx
+import numpy as np
+
+RESERVATION = {
+    "customer_name": "Load Test",
+    "party_size": 4,
+    "deposit_paid": 0,
+    "lead_time_days": 45,
+    "is_repeated_guest": 0,
+    "previous_cancellations": 0,
+    "special_requests_count": 1,
+    "visit_month": 7
+}
+
+
+async def time_reads(client: httpx.AsyncClient, count: int) -> np.ndarray:
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/predictions/recent", params={"limit": 20})
+        response.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+async def hammer_predict(client: httpx.AsyncClient, stop: asyncio.Event, batch_rows: int, counter: list):
+    payload = {"reservations": [RESERVATION] * batch_rows}
+    while not stop.is_set():
+        await client.post("/predict/batch", json=payload)
+        counter[0] += batch_rows
+
+
+def describe(label: str, timings: np.ndarray):
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    print(f"{label:<28} p50={p50:7.1f}ms  p95={p95:7.1f}ms  p99={p99:7.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-rows", type=int, default=500)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        describe("reads, idle server", await time_reads(client, args.reads))
+
+        stop = asyncio.Event()
+        counter = [0]
+        workers = [
+            asyncio.create_task(hammer_predict(client, stop, args.batch_rows, counter))
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.sleep(1)  # let the predict load build up
+        start = time.perf_counter()
+        timings = await time_reads(client, args.reads)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*workers)
+
+        describe("reads, /predict saturated", timings)
+        print(f"predict throughput during reads: {counter[0] / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
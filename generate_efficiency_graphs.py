@@ -1,12 +1,12 @@
-import pandas as pd
 import numpy as np
 import xgboost as xgb
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.model_selection import train_test_split, validation_curve
+from sklearn.model_selection import validation_curve
 from sklearn.metrics import classification_report, roc_auc_score, roc_curve, confusion_matrix
 from sklearn.metrics import precision_recall_curve, auc
-import math
+from noshow.features import FEATURE_COLUMNS
+from noshow.featurestore import load_features
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,38 +19,18 @@ def generate_model_efficiency_graphs():
     
     # 1. Load and prepare data
     print("Loading and preparing data...")
-    df = pd.read_csv("processed_reservations.csv")
-    
-    # Feature Engineering
-    month_map = {
-        'January':1, 'February':2, 'March':3, 'April':4, 'May':5, 'June':6,
-        'July':7, 'August':8, 'September':9, 'October':10, 'November':11, 'December':12
-    }
-    df['month_num'] = df['arrival_date_month'].map(month_map).fillna(1)
-    df['month_sin'] = np.sin(2 * math.pi * df['month_num'] / 12)
-    df['month_cos'] = np.cos(2 * math.pi * df['month_num'] / 12)
-    
-    feature_cols = [
-        'lead_time', 'party_size', 'deposit_paid', 
-        'is_repeated_guest', 'previous_cancellations', 
-        'total_of_special_requests', 'month_sin', 'month_cos'
-    ]
-    
-    X = df[feature_cols]
-    y = df['target']
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+    # Encoded features and split from the feature store (same as train_model.py)
+    features = load_features("processed_reservations.csv")
+    y = features.y
+    X_train, X_test, y_train, y_test = features.X_train, features.X_test, features.y_train, features.y_test
     
     # Calculate class weight
     ratio = float(np.sum(y == 0)) / np.sum(y == 1)
     
     # Train model
     print("Training XGBoost model...")
-    dtrain = xgb.DMatrix(X_train, label=y_train)
-    dtest = xgb.DMatrix(X_test, label=y_test)
+    dtrain = xgb.DMatrix(X_train, label=y_train, feature_names=FEATURE_COLUMNS)
+    dtest = xgb.DMatrix(X_test, label=y_test, feature_names=FEATURE_COLUMNS)
     
     params = {
         "objective": "binary:logistic",
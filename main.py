@@ -1,23 +1,42 @@
 import uvicorn
-import xgboost as xgb
-import pandas as pd
 import numpy as np
-import math
+import asyncio
+import hmac
 import os
 import logging
 from bson import ObjectId
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
-from pydantic import BaseModel
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from pymongo.errors import BulkWriteError
+from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
-from datetime import datetime
+from datetime import datetime, timezone
+from noshow.features import encode_reservation, encode_reservations
+from noshow.registry import ModelManager, ModelRegistry
+from noshow.batching import MicroBatcher
+from noshow.executors import InferenceExecutor
+from noshow.cache import PredictionCache
+from noshow.persistence import WriteBehindQueue
+from noshow.pagination import decode_cursor
+from noshow.indexes import ensure_indexes
+from noshow.search import HIDDEN_FIELDS, search_query, search_terms
+from noshow.counts import CountCache
+from noshow.projection import SLIM_FIELDS, projection_for
+from noshow.responses import FastJSONResponse
+from noshow.export import FORMATS as EXPORT_FORMATS, export_chunks, export_query
+from noshow.broadcast import Broadcaster, sse_message
+from noshow.rollups import ROLLUP_COLLECTION, aggregate_stats, read_stats, record as record_rollups, rollups_rebuilt
+from noshow.insights import business_insights as reservation_insights, insight_columns, insight_documents, load_params
+from noshow.overbooking import METHODS as OVERBOOKING_METHODS, optimize_overbooking
+from noshow.retention import Archive, count_history, fetch_history, find_prediction, run_archiver, time_range
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Hotel No-Show Prediction API - MongoDB Atlas")
+app = FastAPI(title="Hotel No-Show Prediction API - MongoDB Atlas", default_response_class=FastJSONResponse)
 
 # Mount static files for frontend
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -36,22 +55,168 @@ client = AsyncIOMotorClient(
     serverSelectionTimeoutMS=15000,  # 15 second timeout
     connectTimeoutMS=15000,
     socketTimeoutMS=15000,
-    maxPoolSize=1,  # Limit connection pool
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "1")),  # Limit connection pool
     ssl=True,
     tlsAllowInvalidCertificates=True
 )
 db = client[DB_NAME]
 
-# Load XGBoost model
-model = None
+# Model file used when MODEL_REGISTRY_DIR is not set
+model_path = "noshow_xgb.json"
+
+# Load XGBoost model into the configured inference engine ("xgboost", "numpy" or "auto")
+INFERENCE_ENGINE = os.getenv("INFERENCE_ENGINE", "xgboost")
+# libxgboost threads per predict call (0 = XGBoost default)
+INFERENCE_NTHREAD = int(os.getenv("INFERENCE_NTHREAD", "0"))
+# Optional precomputed lookup table in front of the model (build: python -m noshow.lookup)
+LOOKUP_TABLE_PATH = os.getenv("LOOKUP_TABLE_PATH", "")
+# Versioned model registry (python -m noshow.registry); unset = single model file
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "")
+# Poll for a new model every N seconds and hot-swap it (0 = off)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+# Admin endpoints (/admin/*) are disabled unless this is set, then require it in X-Admin-Token
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Micro-batching of concurrent /predict calls (MICROBATCH_WINDOW_MS=0 disables it)
+MICROBATCH_WINDOW_MS = float(os.getenv("MICROBATCH_WINDOW_MS", "0"))
+MICROBATCH_MAX_SIZE = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+
+# Inference runs on a bounded thread pool so it never blocks the event loop;
+# INFERENCE_PROCESSES > 0 adds a process pool for large /predict/batch calls
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "4"))
+INFERENCE_PROCESSES = int(os.getenv("INFERENCE_PROCESSES", "0"))
+
+inference_pool = InferenceExecutor(threads=INFERENCE_THREADS, processes=INFERENCE_PROCESSES)
+
+def restart_inference_processes(manager):
+    """Point process-pool workers at the model that was just swapped in"""
+    inference_pool.restart_processes(manager.path, INFERENCE_ENGINE, INFERENCE_NTHREAD, manager.lookup_path)
+
+model_watcher = None
+
+model_manager = ModelManager(
+    engine=INFERENCE_ENGINE,
+    nthread=INFERENCE_NTHREAD,
+    registry=ModelRegistry(MODEL_REGISTRY_DIR) if MODEL_REGISTRY_DIR else None,
+    default_path=model_path,
+    default_lookup=LOOKUP_TABLE_PATH or None,
+    on_swap=restart_inference_processes
+)
 try:
-    booster = xgb.Booster()
-    booster.load_model("noshow_xgb.json")
-    model = booster
-    logger.info("✅ XGBoost model loaded successfully")
+    model_manager.load()
+    logger.info(f"✅ XGBoost model loaded successfully (version {model_manager.version}, {model_manager.engine.name} engine)")
 except Exception as e:
     logger.error(f"❌ Failed to load model: {e}")
-    model = None
+
+async def score(features, engine):
+    """Score features on the inference pool without blocking the event loop"""
+    return await inference_pool.run(engine.predict, features)
+
+batcher = MicroBatcher(score, MICROBATCH_WINDOW_MS, MICROBATCH_MAX_SIZE) if MICROBATCH_WINDOW_MS > 0 else None
+
+# LRU cache keyed on (model version, encoded features); PREDICTION_CACHE_SIZE=0 disables it
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL = float(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+
+prediction_cache = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL) if PREDICTION_CACHE_SIZE > 0 else None
+
+async def predict_probability(features, engine) -> float:
+    """Probability for one encoded row: cache first, then micro-batcher or inference pool"""
+    cache_key = prediction_cache.key(features, engine.version) if prediction_cache else None
+    if cache_key is not None:
+        cached = prediction_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    if batcher is not None:
+        probability = await batcher.predict(features, engine)
+    else:
+        probability = float((await score(features, engine))[0])
+    
+    if cache_key is not None:
+        prediction_cache.put(cache_key, probability)
+    return probability
+
+async def predict_probabilities(features, engine) -> np.ndarray:
+    """Probabilities for an encoded batch, scoring only the rows missing from the cache"""
+    if prediction_cache is None:
+        return await inference_pool.run_batch(engine.predict, features)
+    
+    keys = [prediction_cache.key(row, engine.version) for row in features]
+    probabilities = np.empty(len(features), dtype=np.float32)
+    missing = []
+    for index, key in enumerate(keys):
+        cached = prediction_cache.get(key)
+        if cached is None:
+            missing.append(index)
+        else:
+            probabilities[index] = cached
+    
+    if missing:
+        scored = await inference_pool.run_batch(engine.predict, features[missing])
+        probabilities[missing] = scored
+        for index, probability in zip(missing, scored):
+            prediction_cache.put(keys[index], float(probability))
+    return probabilities
+
+async def update_rollups(docs):
+    """Fold saved predictions into the /predictions/stats rollups (never fails the request)"""
+    try:
+        await record_rollups(db[ROLLUP_COLLECTION], docs)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not update statistics rollups: {e}")
+
+# Write-behind persistence: /predict returns before the insert, a background
+# task flushes queued documents with ordered insert_many (WRITE_BEHIND=1)
+WRITE_BEHIND = os.getenv("WRITE_BEHIND", "0") == "1"
+
+write_behind = WriteBehindQueue(
+    lambda: db.predictions,
+    max_size=int(os.getenv("WRITE_BEHIND_QUEUE_SIZE", "10000")),
+    batch_size=int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "100")),
+    flush_ms=float(os.getenv("WRITE_BEHIND_FLUSH_MS", "200")),
+    on_flush=update_rollups
+) if WRITE_BEHIND else None
+
+# /predictions/stats reads the rollups once they cover existing history (after
+# `python -m noshow.rollups rebuild`, or from the start on an empty database) and
+# aggregates the raw predictions and archives until then
+rollups_ready = False
+
+# History search: escaped "regex" scan (finds every stored prediction), or indexed name
+# prefixes with SEARCH_MODE=prefix once `python -m noshow.search backfill` has run
+SEARCH_MODE = os.getenv("SEARCH_MODE", "regex")
+# Largest page /predictions/recent and /predictions/all return
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+# Filtered history counts are cached this many seconds
+count_cache = CountCache(ttl_seconds=float(os.getenv("COUNT_CACHE_TTL", "30")))
+# Create the predictions indexes at startup (python -m noshow.indexes)
+ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "1") == "1"
+
+# Live history updates on /predictions/stream: "local" publishes this worker's saves,
+# "changestream" follows MongoDB inserts (every worker sees every save), "off" disables
+# Off by default on Vercel: functions end after maxDuration, so every open tab would
+# hold an invocation and reconnect; the dashboard refreshes after its own predictions
+PREDICTION_EVENTS = os.getenv("PREDICTION_EVENTS", "off" if os.getenv("VERCEL") else "local")
+broadcaster = Broadcaster(buffer_size=int(os.getenv("STREAM_BUFFER_SIZE", "100")))
+STREAM_FIELDS = ("_id",) + SLIM_FIELDS
+# Seconds between SSE keep-alive comments
+STREAM_KEEPALIVE = float(os.getenv("STREAM_KEEPALIVE", "15"))
+change_stream_task = None
+
+# Retention: predictions older than PREDICTION_HOT_DAYS move to monthly archive collections
+# every ARCHIVE_EVERY_MINUTES (python -m noshow.retention); 0 keeps everything hot
+PREDICTION_HOT_DAYS = int(os.getenv("PREDICTION_HOT_DAYS", "0"))
+ARCHIVE_EVERY_MINUTES = float(os.getenv("ARCHIVE_EVERY_MINUTES", "60"))
+archive = Archive()
+archiver_task = None
+
+def publish_predictions(docs):
+    """Push saved predictions (card fields only) to /predictions/stream subscribers"""
+    if PREDICTION_EVENTS != "local":
+        return
+    for doc in docs:
+        broadcaster.publish({name: doc.get(name) for name in STREAM_FIELDS})
 
 class ReservationRequest(BaseModel):
     customer_name: str
@@ -63,59 +228,42 @@ class ReservationRequest(BaseModel):
     special_requests_count: int
     visit_month: int
 
+class BatchReservationRequest(BaseModel):
+    reservations: List[Dict[str, Any]]
+
+# /slots/optimize limits: bookings per call, covers per party and per service
+# (booked plus extra; the cover distribution is that long), and extra reservations
+MAX_SLOT_SIZE = int(os.getenv("MAX_SLOT_SIZE", "10000"))
+MAX_PARTY_SIZE = int(os.getenv("MAX_PARTY_SIZE", "100"))
+MAX_SLOT_COVERS = int(os.getenv("MAX_SLOT_COVERS", "200000"))
+MAX_OVERBOOKING = 500
+
+class SlotReservation(ReservationRequest):
+    party_size: int = Field(ge=1, le=MAX_PARTY_SIZE)
+
+class SlotOptimizationRequest(BaseModel):
+    reservations: List[SlotReservation]
+    capacity: int
+    extra_party_size: Optional[int] = Field(None, ge=1, le=MAX_PARTY_SIZE)
+    extra_probability: Optional[float] = None
+    max_extra: int = 50
+    method: str = "auto"
+
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+# Revenue/cost constants for business insights, overridable with BUSINESS_PARAMS (JSON)
+business_params = load_params()
+
+def get_risk_level(probability: float) -> str:
+    """Map a no-show probability to its risk bucket"""
+    if probability > 0.75:
+        return "Critical"
+    elif probability > 0.45:
+        return "Moderate"
+    return "Low"
+
 def calculate_business_insights(request: ReservationRequest, probability: float, risk_level: str):
-    """Calculate business impact and recommendations"""
-    
-    # Business parameters
-    avg_revenue_per_person = 45
-    prep_cost_per_person = 8
-    staff_cost_per_hour = 15
-    table_turnover_hours = 1.5
-    
-    # Calculate potential impacts
-    potential_revenue = request.party_size * avg_revenue_per_person
-    potential_loss = potential_revenue * probability
-    prep_waste = request.party_size * prep_cost_per_person * probability
-    
-    # Generate recommendations
-    if probability > 0.7:
-        overbook_rec = "HIGH RISK - Accept 1-2 additional reservations for this time slot"
-        staff_rec = f"Reduce staff allocation by 1 server for this {request.party_size}-person party"
-        prep_rec = "Prepare 20% less food to minimize waste"
-    elif probability > 0.4:
-        overbook_rec = "MEDIUM RISK - Consider accepting 1 additional reservation"
-        staff_rec = "Maintain standard staffing but keep backup available"
-        prep_rec = "Prepare 10% less food as precaution"
-    else:
-        overbook_rec = "LOW RISK - Follow standard booking policy"
-        staff_rec = "Maintain full staffing for optimal service"
-        prep_rec = "Prepare full portions as planned"
-    
-    # Calculate savings opportunity
-    staff_savings = staff_cost_per_hour * table_turnover_hours * 0.3 if probability > 0.6 else 0
-    total_savings = prep_waste + staff_savings
-    
-    return {
-        "revenue_impact": {
-            "potential_revenue": round(potential_revenue, 2),
-            "potential_loss": round(potential_loss, 2),
-            "risk_percentage": round(probability * 100, 1)
-        },
-        "cost_optimization": {
-            "prep_waste_avoided": round(prep_waste, 2),
-            "staff_savings": round(staff_savings, 2),
-            "total_savings": round(total_savings, 2)
-        },
-        "operational_recommendations": {
-            "overbooking": overbook_rec,
-            "staffing": staff_rec,
-            "food_prep": prep_rec
-        },
-        "financial_summary": {
-            "net_impact": round(potential_revenue - potential_loss - total_savings, 2),
-            "confidence_level": "High" if probability > 0.6 else "Medium" if probability > 0.3 else "Low"
-        }
-    }
+    """Calculate business impact and recommendations (constants in noshow.insights.BusinessParams)"""
+    return reservation_insights(request.party_size, probability, business_params)
 
 @app.on_event("startup")
 async def startup_event():
@@ -127,6 +275,57 @@ async def startup_event():
         logger.error(f"❌ MongoDB connection failed: {e}")
         raise e
 
+@app.on_event("startup")
+async def start_model_watcher():
+    """Hot-swap new models as they are published (MODEL_WATCH_INTERVAL > 0)"""
+    global model_watcher
+    if MODEL_WATCH_INTERVAL > 0 and model_manager.engine is not None:
+        model_watcher = asyncio.create_task(model_manager.watch(MODEL_WATCH_INTERVAL))
+
+@app.on_event("startup")
+async def ensure_collection_indexes():
+    """Make sure the indexes behind the history queries exist (idempotent)"""
+    if not ENSURE_INDEXES:
+        return
+    try:
+        names = await ensure_indexes(db.predictions)
+        logger.info(f"✅ Indexes in place: {', '.join(names)}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not ensure indexes: {e}")
+
+@app.on_event("startup")
+async def start_change_stream():
+    """Feed /predictions/stream from MongoDB inserts (PREDICTION_EVENTS=changestream)"""
+    global change_stream_task
+    if PREDICTION_EVENTS == "changestream":
+        change_stream_task = asyncio.create_task(broadcaster.follow_change_stream(db.predictions, STREAM_FIELDS))
+
+@app.on_event("startup")
+async def start_archiver():
+    """Move predictions older than the hot window into monthly archives on a schedule"""
+    global archiver_task
+    if PREDICTION_HOT_DAYS > 0 and ARCHIVE_EVERY_MINUTES > 0:
+        archiver_task = asyncio.create_task(run_archiver(lambda: db, archive, PREDICTION_HOT_DAYS, ARCHIVE_EVERY_MINUTES))
+
+@app.on_event("startup")
+async def start_write_behind():
+    """Start flushing queued prediction documents (WRITE_BEHIND=1)"""
+    if write_behind is not None:
+        await write_behind.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Let in-flight inference and queued writes finish before the worker exits"""
+    if model_watcher is not None:
+        model_watcher.cancel()
+    if change_stream_task is not None:
+        change_stream_task.cancel()
+    if archiver_task is not None:
+        archiver_task.cancel()
+    if write_behind is not None:
+        await write_behind.stop()
+    inference_pool.shutdown()
+
 @app.get("/")
 async def serve_homepage():
     """Serve the main HTML page"""
@@ -136,40 +335,19 @@ async def serve_homepage():
 async def predict_no_show(request: ReservationRequest):
     """Make prediction and save to MongoDB"""
     try:
-        if model is None:
+        # Pin the live model for this request; a hot-swap mid-request doesn't affect it
+        engine = model_manager.get_engine()
+        if engine is None:
             raise HTTPException(status_code=500, detail="Model not available")
         
-        # Prepare features for prediction - match training feature names
-        # Convert month to cyclical features (same as training)
-        month_sin = math.sin(2 * math.pi * request.visit_month / 12)
-        month_cos = math.cos(2 * math.pi * request.visit_month / 12)
+        # Prepare features for prediction - same encoder as training
+        features = encode_reservation(request)
         
-        features = pd.DataFrame([[
-            request.lead_time_days,  # lead_time in training
-            request.party_size,
-            request.deposit_paid,
-            request.is_repeated_guest,
-            request.previous_cancellations,
-            request.special_requests_count,  # total_of_special_requests in training
-            month_sin,
-            month_cos
-        ]], columns=[
-            'lead_time', 'party_size', 'deposit_paid',
-            'is_repeated_guest', 'previous_cancellations',
-            'total_of_special_requests', 'month_sin', 'month_cos'
-        ])
-        
-        # Make prediction
-        dmatrix = xgb.DMatrix(features)
-        probability = float(model.predict(dmatrix)[0])
+        # Make prediction (cached, and coalesced with concurrent requests when micro-batching is on)
+        probability = await predict_probability(features, engine)
         
         # Determine risk level
-        if probability > 0.75:
-            risk_level = "Critical"
-        elif probability > 0.45:
-            risk_level = "Moderate"
-        else:
-            risk_level = "Low"
+        risk_level = get_risk_level(probability)
         
         # Calculate business insights
         business_insights = calculate_business_insights(request, probability, risk_level)
@@ -179,58 +357,236 @@ async def predict_no_show(request: ReservationRequest):
             **request.dict(),
             "prediction_prob": round(probability, 3),
             "risk_level": risk_level,
+            "model_version": engine.version,
+            "search_terms": search_terms(request.customer_name),
             "timestamp": datetime.utcnow(),
             "business_insights": business_insights
         }
         
-        # Save to MongoDB Atlas
-        result = await db.predictions.insert_one(prediction_doc)
+        # Save to MongoDB Atlas (or hand off to the write-behind queue)
+        if write_behind is not None:
+            document_id = await write_behind.put(prediction_doc)
+            message = "Prediction queued for saving"
+        else:
+            result = await db.predictions.insert_one(prediction_doc)
+            document_id = result.inserted_id
+            await update_rollups([prediction_doc])
+            message = "Prediction saved successfully"
         
-        logger.info(f"Prediction saved with ID: {result.inserted_id}")
+        publish_predictions([prediction_doc])
+        logger.info(f"Prediction saved with ID: {document_id}")
         
         return {
             "success": True,
             "probability": round(probability, 3),
             "risk_level": risk_level,
             "business_insights": business_insights,
-            "document_id": str(result.inserted_id),
-            "message": "Prediction saved successfully"
+            "model_version": engine.version,
+            "document_id": str(document_id),
+            "message": message
         }
         
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/predictions/recent")
-async def get_recent_predictions(skip: int = 0, limit: int = 20):
-    """Get recent predictions from MongoDB Atlas with pagination"""
-    try:
-        # Get total count
-        total_count = await db.predictions.count_documents({})
+@app.post("/predict/batch")
+async def predict_no_show_batch(batch: BatchReservationRequest):
+    """Score a list of reservations in one model call and save them with one bulk insert"""
+    engine = model_manager.get_engine()
+    if engine is None:
+        raise HTTPException(status_code=500, detail="Model not available")
+    if len(batch.reservations) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch limited to {MAX_BATCH_SIZE} reservations")
+    
+    results = [None] * len(batch.reservations)
+    
+    # Validate rows individually so one bad row doesn't reject the whole book
+    valid = []
+    for index, raw in enumerate(batch.reservations):
+        try:
+            valid.append((index, ReservationRequest(**raw)))
+        except ValidationError as e:
+            results[index] = {"index": index, "success": False, "error": str(e)}
+    
+    if valid:
+        try:
+            # One feature matrix and one predict call for the whole batch
+            features = encode_reservations([request for _, request in valid])
+            probabilities = await predict_probabilities(features, engine)
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+        
+        # Insight figures for the whole batch at once
+        insights = insight_documents(insight_columns(
+            [request.party_size for _, request in valid], probabilities, business_params
+        ))
         
-        # Fetch recent predictions with pagination
-        cursor = db.predictions.find().sort("timestamp", -1).skip(skip).limit(limit)
-        predictions = []
+        timestamp = datetime.utcnow()
+        prediction_docs = []
+        for (index, request), probability, business_insights in zip(valid, probabilities, insights):
+            probability = float(probability)
+            risk_level = get_risk_level(probability)
+            prediction_docs.append({
+                **request.dict(),
+                "prediction_prob": round(probability, 3),
+                "risk_level": risk_level,
+                "model_version": engine.version,
+                "search_terms": search_terms(request.customer_name),
+                "timestamp": timestamp,
+                "business_insights": business_insights
+            })
+            results[index] = {
+                "index": index,
+                "success": True,
+                "probability": round(probability, 3),
+                "risk_level": risk_level,
+                "business_insights": business_insights
+            }
+        
+        # Unordered bulk insert: a failed document doesn't stop the rest
+        write_errors = {}
+        try:
+            await db.predictions.insert_many(prediction_docs, ordered=False)
+        except BulkWriteError as e:
+            write_errors = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+        except Exception as e:
+            logger.error(f"Batch insert error: {e}")
+            write_errors = {position: str(e) for position in range(len(prediction_docs))}
         
-        async for doc in cursor:
-            doc["_id"] = str(doc["_id"])  # Convert ObjectId to string
-            # Ensure timestamp is properly formatted
-            if isinstance(doc.get("timestamp"), str):
-                doc["timestamp"] = doc["timestamp"]
+        # insert_many assigns _id on each document before sending
+        for position, ((index, _), doc) in enumerate(zip(valid, prediction_docs)):
+            if position in write_errors:
+                results[index].update(success=False, error=write_errors[position])
             else:
-                doc["timestamp"] = doc.get("timestamp", datetime.utcnow()).isoformat()
-            predictions.append(doc)
+                results[index]["document_id"] = str(doc["_id"])
+        saved_docs = [doc for position, doc in enumerate(prediction_docs) if position not in write_errors]
+        await update_rollups(saved_docs)
+        publish_predictions(saved_docs)
+    
+    saved = sum(1 for result in results if result["success"])
+    logger.info(f"Batch prediction: {saved}/{len(results)} saved")
+    
+    return {
+        "success": saved == len(results),
+        "total": len(results),
+        "saved": saved,
+        "failed": len(results) - saved,
+        "results": results,
+        "message": f"Saved {saved} of {len(results)} predictions"
+    }
+
+@app.post("/slots/optimize")
+async def optimize_slot(slot: SlotOptimizationRequest):
+    """Score every booking in a service and find the expected-profit-maximizing
+    number of extra reservations from the exact no-show cover distribution"""
+    engine = model_manager.get_engine()
+    if engine is None:
+        raise HTTPException(status_code=500, detail="Model not available")
+    if len(slot.reservations) > MAX_SLOT_SIZE:
+        raise HTTPException(status_code=413, detail=f"Services limited to {MAX_SLOT_SIZE} reservations")
+    if slot.method not in OVERBOOKING_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown method '{slot.method}', expected one of {OVERBOOKING_METHODS}")
+    if not 0 <= slot.max_extra <= MAX_OVERBOOKING:
+        raise HTTPException(status_code=400, detail=f"max_extra must be between 0 and {MAX_OVERBOOKING}")
+    # Worst case for the default extra size (the median party) is the largest party
+    booked_covers = sum(reservation.party_size for reservation in slot.reservations)
+    extra_size = slot.extra_party_size or max((r.party_size for r in slot.reservations), default=2)
+    if booked_covers + slot.max_extra * extra_size > MAX_SLOT_COVERS:
+        raise HTTPException(status_code=400, detail=f"Services limited to {MAX_SLOT_COVERS} covers including extra reservations")
+    
+    probabilities = np.zeros(0)
+    if slot.reservations:
+        try:
+            # One feature matrix and one predict call for the whole service
+            probabilities = await predict_probabilities(encode_reservations(slot.reservations), engine)
+        except Exception as e:
+            logger.error(f"Slot scoring error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    try:
+        result = optimize_overbooking(
+            [reservation.party_size for reservation in slot.reservations], probabilities, slot.capacity,
+            slot.extra_party_size, slot.extra_probability, slot.max_extra, slot.method, business_params
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    logger.info(f"Slot optimized: {result['bookings']} bookings, capacity {slot.capacity}, "
+                f"+{result['recommended_extra_reservations']} reservations")
+    return {"success": True, "model_version": engine.version, **result}
+
+def check_cursor(cursor: Optional[str]):
+    """Reject malformed pagination cursors with a 400 instead of an empty page"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+def parse_utc(value: str) -> datetime:
+    """ISO date/datetime as naive UTC, the way timestamps are stored ("Z" and offsets accepted)"""
+    parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def check_time_range(start: Optional[str], end: Optional[str]):
+    """(start, end) naive UTC datetimes from ISO date parameters; 400 if either is malformed"""
+    try:
+        return (parse_utc(start) if start else None,
+                parse_utc(end) if end else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def check_fields(fields: Optional[str]) -> dict:
+    """Projection for the `fields` parameter; 400 on invalid names"""
+    try:
+        return projection_for(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/predictions/recent")
+async def get_recent_predictions(skip: int = Query(0, ge=0), limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+                                 cursor: Optional[str] = None, include_count: bool = True,
+                                 fields: Optional[str] = None, start: Optional[str] = None,
+                                 end: Optional[str] = None):
+    """Get recent predictions from MongoDB Atlas with pagination.
+
+    Pass the previous response's `next_cursor` as `cursor` to page by
+    position instead of offset; `skip` is ignored when a cursor is given.
+    With include_count=false the total is skipped (total_count is null)
+    and `has_more` alone says whether another page exists. Documents are
+    slim by default; `fields` picks others (comma-separated, or "all").
+    `start`/`end` (ISO dates, end exclusive) limit the time range and so
+    which archive months are read (noshow.retention).
+    """
+    check_cursor(cursor)
+    projection = check_fields(fields)
+    start_date, end_date = check_time_range(start, end)
+    try:
+        await archive.refresh(db)
+        query = time_range({}, start_date, end_date)
         
-        logger.info(f"Retrieved {len(predictions)} predictions (skip: {skip}, limit: {limit})")
+        # Get total count (estimated from collection metadata, see noshow.counts)
+        total_count = await count_history(count_cache, db.predictions, archive.collections(db, start_date, end_date), query) if include_count else None
         
-        return {
+        # Fetch recent predictions with pagination, continuing into the archives
+        archives = archive.collections(db, start_date, end_date, cursor)
+        docs, next_cursor = await fetch_history(db.predictions, archives, query, limit, skip, cursor, projection)
+        logger.info(f"Retrieved {len(docs)} predictions (skip: {skip}, limit: {limit}, cursor: {bool(cursor)})")
+        
+        # ObjectId/datetime are encoded directly by FastJSONResponse
+        return FastJSONResponse({
             "success": True,
-            "total": len(predictions),
+            "total": len(docs),
             "total_count": total_count,
-            "data": predictions,
-            "has_more": (skip + limit) < total_count,
-            "message": f"Found {len(predictions)} predictions"
-        }
+            "data": docs,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+            "message": f"Found {len(docs)} predictions"
+        })
         
     except Exception as e:
         logger.error(f"Error fetching predictions: {e}")
@@ -240,46 +596,42 @@ async def get_recent_predictions(skip: int = 0, limit: int = 20):
             "data": [],
             "total": 0,
             "total_count": 0,
-            "has_more": False
+            "has_more": False,
+            "next_cursor": None
         }
 
 @app.get("/predictions/all")
-async def get_all_predictions(skip: int = 0, limit: int = 50, search: str = ""):
-    """Get all predictions with optional search and pagination"""
+async def get_all_predictions(skip: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+                              search: str = "", cursor: Optional[str] = None, include_count: bool = True,
+                              fields: Optional[str] = None, start: Optional[str] = None,
+                              end: Optional[str] = None):
+    """Get all predictions with optional search, time range (`start`/`end`, ISO dates, end exclusive)
+    and pagination (offset or `cursor`), slim unless `fields` says otherwise"""
+    check_cursor(cursor)
+    projection = check_fields(fields)
+    start_date, end_date = check_time_range(start, end)
     try:
-        # Build query
-        query = {}
-        if search:
-            query = {
-                "$or": [
-                    {"customer_name": {"$regex": search, "$options": "i"}},
-                    {"risk_level": {"$regex": search, "$options": "i"}}
-                ]
-            }
-        
-        # Get total count
-        total_count = await db.predictions.count_documents(query)
+        await archive.refresh(db)
+        # Build query (indexed prefix search, see noshow.search)
+        query = time_range(search_query(search, SEARCH_MODE), start_date, end_date)
         
-        # Fetch predictions
-        cursor = db.predictions.find(query).sort("timestamp", -1).skip(skip).limit(limit)
-        predictions = []
+        # Get total count (cached briefly per search, see noshow.counts)
+        total_count = await count_history(count_cache, db.predictions, archive.collections(db, start_date, end_date), query) if include_count else None
         
-        async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            if isinstance(doc.get("timestamp"), str):
-                doc["timestamp"] = doc["timestamp"]
-            else:
-                doc["timestamp"] = doc.get("timestamp", datetime.utcnow()).isoformat()
-            predictions.append(doc)
+        # Fetch predictions from the hot collection, then the archive months in range
+        archives = archive.collections(db, start_date, end_date, cursor)
+        docs, next_cursor = await fetch_history(db.predictions, archives, query, limit, skip, cursor, projection)
         
-        return {
+        # ObjectId/datetime are encoded directly by FastJSONResponse
+        return FastJSONResponse({
             "success": True,
-            "data": predictions,
+            "data": docs,
             "total_count": total_count,
-            "has_more": (skip + limit) < total_count,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
             "current_page": (skip // limit) + 1,
-            "total_pages": (total_count + limit - 1) // limit
-        }
+            "total_pages": (total_count + limit - 1) // limit if total_count is not None else None
+        })
         
     except Exception as e:
         logger.error(f"Error fetching all predictions: {e}")
@@ -288,25 +640,108 @@ async def get_all_predictions(skip: int = 0, limit: int = 50, search: str = ""):
             "error": str(e),
             "data": [],
             "total_count": 0,
-            "has_more": False
+            "has_more": False,
+            "next_cursor": None
         }
 
+@app.get("/predictions/stats")
+async def get_prediction_stats(period: str = "month", start: Optional[str] = None, end: Optional[str] = None):
+    """Totals, risk distribution, average probability and summed business figures
+    from the per-day/per-month rollups (`start`/`end` are ISO dates, end exclusive).
+    Rollups cover archived predictions too; until they cover existing history the
+    same figures are aggregated from the predictions and archive collections."""
+    global rollups_ready
+    start_date, end_date = check_time_range(start, end)
+    try:
+        rollups_ready = rollups_ready or await rollups_rebuilt(db)
+        if rollups_ready:
+            stats = await read_stats(db[ROLLUP_COLLECTION], period, start_date, end_date)
+        else:
+            await archive.refresh(db)
+            archives = [collection.name for collection in archive.collections(db, start_date, end_date)]
+            stats = await aggregate_stats(db.predictions, archives, period, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching prediction stats: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {"success": True, "period": period, "source": "rollups" if rollups_ready else "aggregation", **stats}
+
+@app.get("/predictions/export")
+async def export_predictions(fmt: str = Query("ndjson", alias="format"), start: Optional[str] = None,
+                             end: Optional[str] = None, risk_level: Optional[str] = None):
+    """Stream the whole prediction history as NDJSON or CSV (`start`/`end` are ISO dates, end exclusive)"""
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{fmt}', expected one of {tuple(EXPORT_FORMATS)}")
+    start_date, end_date = check_time_range(start, end)
+    try:
+        query = export_query(start_date, end_date, risk_level)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    await archive.refresh(db)
+    archives = archive.collections(db, start_date, end_date)
+    logger.info(f"Exporting predictions as {fmt}: {query} (+{len(archives)} archive months)")
+    return StreamingResponse(
+        export_chunks(db.predictions, query, fmt, archives=archives),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="predictions.{fmt}"'}
+    )
+
+@app.get("/predictions/stream")
+async def stream_predictions(request: Request):
+    """Server-Sent Events feed of newly saved predictions for open dashboards"""
+    if PREDICTION_EVENTS == "off":
+        raise HTTPException(status_code=404, detail="Prediction stream is disabled")
+    try:
+        # Replays what a reconnecting browser missed since its Last-Event-ID
+        subscription = broadcaster.subscribe(request.headers.get("last-event-id"))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    async def events():
+        try:
+            # The id gives the browser a Last-Event-ID even before the first event
+            yield f"retry: 3000\nid: {subscription.start_id}\n\n"
+            if subscription.gap:
+                # Missed events are no longer held (or came from another instance)
+                yield sse_message({}, "resync", subscription.start_id)
+            while not await request.is_disconnected():
+                try:
+                    item = await subscription.get(timeout=STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    # Dropped as a slow consumer; the browser reconnects with its Last-Event-ID
+                    break
+                event_id, event = item
+                yield sse_message(event, event_id=event_id)
+        finally:
+            broadcaster.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/predictions/{prediction_id}")
 async def get_prediction_details(prediction_id: str):
     """Get detailed prediction data by ID"""
     try:
-        prediction = await db.predictions.find_one({"_id": ObjectId(prediction_id)})
+        # Falls back to the prediction's archive month (noshow.retention)
+        prediction = await find_prediction(db, archive, ObjectId(prediction_id), HIDDEN_FIELDS)
         
         if not prediction:
             raise HTTPException(status_code=404, detail="Prediction not found")
         
-        prediction["_id"] = str(prediction["_id"])
-        
-        return {
+        return FastJSONResponse({
             "success": True,
             "prediction": prediction,
             "business_insights": prediction.get("business_insights", {})
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error fetching prediction {prediction_id}: {e}")
@@ -322,17 +757,64 @@ async def health_check():
         return {
             "status": "healthy",
             "database": "connected",
-            "model": "loaded" if model else "not_loaded",
+            "model": "loaded" if model_manager.engine else "not_loaded",
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
         return {
             "status": "unhealthy",
             "database": "disconnected",
-            "model": "loaded" if model else "not_loaded",
+            "model": "loaded" if model_manager.engine else "not_loaded",
             "error": str(e),
             "timestamp": datetime.utcnow().isoformat()
         }
 
+class ModelReloadRequest(BaseModel):
+    version: Optional[str] = None
+
+def require_admin(token: str):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/model")
+async def get_model_status(x_admin_token: str = Header(default="")):
+    """Live model version and the versions available in the registry"""
+    require_admin(x_admin_token)
+    return {"success": True, "model": model_manager.status()}
+
+@app.post("/admin/model/reload")
+async def reload_model(body: ModelReloadRequest = None, x_admin_token: str = Header(default="")):
+    """Load a model version (default: the registry's current one), warm it and swap it in"""
+    require_admin(x_admin_token)
+    version = body.version if body else None
+    try:
+        await model_manager.reload(version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model reload failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "success": True,
+        "model": model_manager.status(),
+        "message": f"Model {model_manager.version} is live"
+    }
+
+@app.get("/metrics/inference")
+async def inference_metrics():
+    """Inference engine, micro-batching histograms, cache and write-behind counters for tuning"""
+    return {
+        "engine": model_manager.engine.name if model_manager.engine else None,
+        "model_version": model_manager.version,
+        "micro_batching": batcher.stats() if batcher else {"enabled": False},
+        "prediction_cache": prediction_cache.stats() if prediction_cache else {"enabled": False},
+        "write_behind": write_behind.stats() if write_behind else {"enabled": False},
+        "prediction_stream": {"source": PREDICTION_EVENTS, **broadcaster.stats()},
+        "retention": {"hot_days": PREDICTION_HOT_DAYS, **archive.stats()}
+    }
+
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
\ No newline at end of file
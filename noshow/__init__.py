@@ -0,0 +1 @@
+"""Shared building blocks for the no-show prediction API and training scripts."""
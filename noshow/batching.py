@@ -0,0 +1,87 @@
+"""Micro-batching for concurrent /predict calls.
+
+Requests that arrive within `window_ms` of the first queued one (or until
+`max_batch_size` rows are waiting) are stacked into one feature matrix and
+scored with a single model call; each caller awaits its own future. Rows
+queued against different engines (across a model hot-swap) are scored
+separately, so every row is answered by the engine its request picked.
+"""
+import asyncio
+import time
+import numpy as np
+from noshow.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+QUEUE_WAIT_MS_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100]
+
+
+class MicroBatcher:
+    """Coalesce single-row predictions into batched model calls"""
+
+    def __init__(self, predict, window_ms: float = 2.0, max_batch_size: int = 64):
+        # `predict` is a coroutine function: (features matrix, engine) -> probabilities
+        self.predict_batch = predict
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_MS_BUCKETS)
+        self._pending = []
+        self._timer = None
+
+    async def predict(self, features: np.ndarray, engine) -> float:
+        """Queue one encoded (1, n_features) row for `engine` and wait for its probability"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((features, engine, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._score(batch))
+
+    async def _score(self, batch):
+        started = time.perf_counter()
+        for _, _, _, enqueued in batch:
+            self.queue_wait_ms.observe((started - enqueued) * 1000)
+        self.batch_sizes.observe(len(batch))
+
+        groups = {}
+        for item in batch:
+            groups.setdefault(id(item[1]), []).append(item)
+        for group in groups.values():
+            await self._score_group(group)
+
+    async def _score_group(self, group):
+        engine = group[0][1]
+        try:
+            probabilities = await self.predict_batch(np.concatenate([features for features, _, _, _ in group]), engine)
+        except Exception as e:
+            for _, _, future, _ in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future, _), probability in zip(group, probabilities):
+            # The caller may have gone away (client disconnect / cancellation)
+            if not future.done():
+                future.set_result(float(probability))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "pending": len(self._pending),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot()
+        }
@@ -0,0 +1,163 @@
+"""In-process fan-out of new predictions to Server-Sent Events clients.
+
+Open dashboards subscribe through GET /predictions/stream instead of
+re-polling /predictions/recent. The save paths publish each new
+prediction (slim card fields only) to the Broadcaster, which copies it
+into every subscriber's bounded buffer without awaiting anything, so a
+slow client can never hold up /predict. A subscriber whose buffer fills
+up is dropped; its stream ends and the browser's EventSource reconnects.
+
+Every event carries an id ("<broadcaster>-<sequence>") and the
+broadcaster keeps the last buffer_size events. A reconnecting browser
+sends its Last-Event-ID; the missed events are replayed from that
+history, and only when they are gone (or the id comes from another
+instance or a restart) does the client get a "resync" event telling it
+to reload history.
+
+With several API workers an in-process broadcaster only sees its own
+inserts. PREDICTION_EVENTS=changestream feeds it from a MongoDB change
+stream instead (replica sets / Atlas only), so every worker sees every
+insert.
+"""
+import asyncio
+import logging
+import uuid
+from collections import deque
+from noshow.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+
+def sse_message(event: dict, name: str = "prediction", event_id: str = None) -> str:
+    """One Server-Sent Events message carrying `event` as JSON"""
+    data = dumps(event).decode()
+    return f"id: {event_id if event_id is not None else event.get('_id', '')}\nevent: {name}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """Bounded event buffer for one connected client"""
+
+    def __init__(self, buffer_size: int):
+        self.buffer = deque()
+        self.buffer_size = buffer_size
+        self.closed = False
+        # Set when events after the client's Last-Event-ID could not be replayed
+        self.gap = False
+        # Id of the last event before the first one this subscription delivers
+        self.start_id = None
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict) -> bool:
+        """Queue `event`; returns False (and closes) if the buffer is full"""
+        if self.closed:
+            return False
+        if len(self.buffer) >= self.buffer_size:
+            self.close()
+            return False
+        self.buffer.append(event)
+        self._ready.set()
+        return True
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def get(self, timeout: float = None):
+        """Next (event_id, event); None once closed, TimeoutError if nothing arrives in `timeout`"""
+        while not self.buffer:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        return self.buffer.popleft()
+
+
+class Broadcaster:
+    """Fan-out of published events to every live Subscription"""
+
+    def __init__(self, buffer_size: int = 100, max_subscribers: int = 1000):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self.dropped_subscribers = 0
+        self.resyncs = 0
+        self._subscribers = set()
+        # Ids from another instance or an earlier process never match this prefix
+        self._prefix = uuid.uuid4().hex[:12]
+        self._recent = deque(maxlen=buffer_size)
+
+    @property
+    def last_event_id(self) -> str:
+        return f"{self._prefix}-{self.published}"
+
+    def missed_since(self, last_event_id: str):
+        """(event_id, event) published after `last_event_id`; None if some are no longer held"""
+        prefix, _, sequence = (last_event_id or "").rpartition("-")
+        if prefix != self._prefix or not sequence.isdigit() or int(sequence) > self.published:
+            return None
+        sequence = int(sequence)
+        oldest = self.published - len(self._recent) + 1
+        if sequence + 1 < oldest:
+            return None
+        return list(self._recent)[sequence + 1 - oldest:]
+
+    def subscribe(self, last_event_id: str = None) -> Subscription:
+        """New subscription, first replaying whatever was published after `last_event_id`"""
+        if len(self._subscribers) >= self.max_subscribers:
+            raise RuntimeError("Too many stream subscribers")
+        subscription = Subscription(self.buffer_size)
+        subscription.start_id = self.last_event_id
+        if last_event_id:
+            missed = self.missed_since(last_event_id)
+            if missed is None:
+                subscription.gap = True
+                self.resyncs += 1
+            else:
+                subscription.start_id = last_event_id
+                for item in missed:
+                    subscription.push(item)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: dict):
+        """Hand `event` to every subscriber; never blocks"""
+        self.published += 1
+        item = (self.last_event_id, event)
+        self._recent.append(item)
+        for subscription in list(self._subscribers):
+            if not subscription.push(item):
+                self._subscribers.discard(subscription)
+                self.dropped_subscribers += 1
+                logger.warning("⚠️ Dropped a slow prediction stream subscriber")
+
+    async def follow_change_stream(self, collection, fields):
+        """Publish every insert into `collection` (Motor), resuming after errors"""
+        pipeline = [
+            {"$match": {"operationType": "insert"}},
+            {"$project": {"fullDocument." + name: 1 for name in fields}}
+        ]
+        resume_token = None
+        while True:
+            try:
+                async with collection.watch(pipeline, resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        self.publish(change["fullDocument"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Change stream interrupted, retrying: {e}")
+                await asyncio.sleep(5)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "dropped_subscribers": self.dropped_subscribers,
+            "resyncs": self.resyncs
+        }
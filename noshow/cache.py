@@ -0,0 +1,76 @@
+"""Bounded LRU cache of predicted probabilities.
+
+The model's input space is small and repetitive (12 months, binary flags,
+a handful of common party sizes and counts), so identical encoded feature
+vectors come up constantly. Keys combine the model version with the raw
+float32 bytes of the row, so a new model never serves stale entries; the
+cache also drops everything as soon as it sees a new version.
+"""
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """LRU + TTL cache: (model version, encoded row) -> probability"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._model_version = None
+
+    def key(self, row, model_version: str):
+        """Cache key for one encoded float32 row"""
+        if model_version != self._model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._model_version = model_version
+        return (model_version, row.tobytes())
+
+    def get(self, key):
+        """Cached probability for `key`, or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        probability, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return probability
+
+    def put(self, key, probability: float):
+        self._entries[key] = (probability, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "model_version": self._model_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
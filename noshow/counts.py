@@ -0,0 +1,54 @@
+"""Cheap totals for the paginated history endpoints.
+
+Every page used to run count_documents, a full count for filtered
+queries and an extra round trip either way. Instead:
+
+- unfiltered totals come from estimated_document_count (collection
+  metadata, no scan)
+- filtered totals (searches) are cached per query for a short TTL, so
+  paging through results or retyping a search costs one count, not one
+  per request
+- clients that only need "is there more?" can pass include_count=false
+  and rely on has_more, which fetch_page derives from limit + 1 rows
+"""
+import time
+from collections import OrderedDict
+
+
+class CountCache:
+    """Short-lived cache of count_documents results keyed by collection and query"""
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    async def count(self, collection, query: dict) -> int:
+        """Total documents matching `query` (estimated when unfiltered)"""
+        if not query:
+            return await collection.estimated_document_count()
+
+        key = (getattr(collection, "name", None), repr(query))
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        total = await collection.count_documents(query)
+        self._entries[key] = (total, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return total
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,68 @@
+"""Run model inference off the asyncio event loop.
+
+libxgboost releases the GIL inside predict, so a small thread pool keeps
+the event loop free to serve Mongo-backed endpoints while a prediction is
+running. Large /predict/batch requests can optionally go to a process
+pool whose workers each load their own copy of the model.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from noshow.inference import load_engine, with_lookup_table
+
+# Model loaded once in each process-pool worker
+_worker_engine = None
+
+
+def _init_worker(model_path: str, engine: str, nthread: int, lookup_table_path: str):
+    global _worker_engine
+    _worker_engine = load_engine(model_path, engine, nthread)
+    if lookup_table_path:
+        _worker_engine = with_lookup_table(_worker_engine, lookup_table_path)
+
+
+def _predict_in_worker(features):
+    return _worker_engine.predict(features)
+
+
+class InferenceExecutor:
+    """Bounded thread pool for requests plus an optional process pool for big batches"""
+
+    def __init__(self, threads: int = 4, processes: int = 0, model_path: str = None,
+                 engine: str = "xgboost", nthread: int = 0, lookup_table_path: str = None,
+                 process_min_rows: int = 256):
+        self.thread_pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="inference")
+        self.processes = processes
+        self.process_pool = None
+        self.process_min_rows = process_min_rows
+        self.restart_processes(model_path, engine, nthread, lookup_table_path)
+
+    def restart_processes(self, model_path: str, engine: str = "xgboost", nthread: int = 0,
+                          lookup_table_path: str = None):
+        """(Re)start the process pool on `model_path`; in-flight work finishes on the old pool"""
+        previous = self.process_pool
+        self.process_pool = None
+        if self.processes > 0 and model_path:
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(model_path, engine, nthread, lookup_table_path)
+            )
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    async def run(self, predict, features):
+        """Call predict(features) on the thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.thread_pool, predict, features)
+
+    async def run_batch(self, predict, features):
+        """Like run(), but large matrices go to the process pool when one is configured"""
+        if self.process_pool is not None and len(features) >= self.process_min_rows:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.process_pool, _predict_in_worker, features)
+        return await self.run(predict, features)
+
+    def shutdown(self):
+        self.thread_pool.shutdown(wait=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True)
@@ -0,0 +1,103 @@
+"""Streaming export of prediction history as NDJSON or CSV.
+
+GET /predictions/export walks one async Motor cursor (large batch size,
+newest first) and yields encoded chunks as the documents arrive, so memory
+stays flat whatever the collection size. There is no count and no paging.
+Filters: timestamp range [start, end) and an exact risk_level; both are
+served by the collection's indexes (noshow.indexes). Archived months in
+the range (noshow.retention) follow the hot collection.
+"""
+import csv
+import io
+from datetime import datetime
+from bson import ObjectId
+from noshow.pagination import HISTORY_SORT
+from noshow.responses import dumps
+from noshow.search import HIDDEN_FIELDS, RISK_LEVELS
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# CSV columns; dotted names reach into business_insights
+CSV_COLUMNS = (
+    "_id", "timestamp", "customer_name", "party_size", "deposit_paid", "lead_time_days",
+    "is_repeated_guest", "previous_cancellations", "special_requests_count", "visit_month",
+    "prediction_prob", "risk_level", "model_version",
+    "business_insights.revenue_impact.potential_revenue",
+    "business_insights.revenue_impact.potential_loss",
+    "business_insights.cost_optimization.total_savings",
+    "business_insights.financial_summary.net_impact",
+)
+
+# Documents encoded per yielded chunk
+ROWS_PER_CHUNK = 500
+
+
+def export_query(start: datetime = None, end: datetime = None, risk_level: str = None) -> dict:
+    """Mongo filter for the export parameters; raises ValueError for an unknown risk level"""
+    query = {}
+    if start or end:
+        query["timestamp"] = {}
+        if start:
+            query["timestamp"]["$gte"] = start
+        if end:
+            query["timestamp"]["$lt"] = end
+    if risk_level:
+        if risk_level not in RISK_LEVELS:
+            raise ValueError(f"Unknown risk_level '{risk_level}', expected one of {RISK_LEVELS}")
+        query["risk_level"] = risk_level
+    return query
+
+
+def _plain(value):
+    """CSV cell for the BSON types stored in predictions"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _field(doc: dict, path: str):
+    value = doc
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+async def _documents(collections, query: dict, batch_size: int):
+    for collection in collections:
+        async for doc in collection.find(query, HIDDEN_FIELDS).sort(HISTORY_SORT).batch_size(batch_size):
+            yield doc
+
+
+async def export_chunks(collection, query: dict, fmt: str = "ndjson", batch_size: int = 5000, archives=()):
+    """Async generator of encoded byte chunks for every matching prediction.
+
+    `archives` (older monthly collections, newest first) are read after `collection`.
+    """
+    cursor = _documents([collection, *archives], query, batch_size)
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        rows = 0
+        async for doc in cursor:
+            writer.writerow([_plain(v) if isinstance(v, (datetime, ObjectId)) else v
+                             for v in (_field(doc, column) for column in CSV_COLUMNS)])
+            rows += 1
+            if rows % ROWS_PER_CHUNK == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+        return
+
+    lines = []
+    async for doc in cursor:
+        lines.append(dumps(doc))
+        if len(lines) == ROWS_PER_CHUNK:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
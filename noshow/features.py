@@ -0,0 +1,102 @@
+"""Feature encoding shared by training (train_model.py) and serving (main.py, api/index.py).
+
+Everything writes straight into float32 NumPy buffers - the dtype XGBoost
+uses internally - so the serving path never builds a pandas DataFrame.
+"""
+import math
+import numpy as np
+
+# Feature order the booster was trained on
+FEATURE_COLUMNS = [
+    'lead_time', 'party_size', 'deposit_paid',
+    'is_repeated_guest', 'previous_cancellations',
+    'total_of_special_requests', 'month_sin', 'month_cos'
+]
+NUM_FEATURES = len(FEATURE_COLUMNS)
+
+MONTH_MAP = {
+    'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
+    'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12
+}
+
+# Cyclical month encoding, precomputed once. Row `month % 12` holds
+# (sin, cos) of 2*pi*month/12, computed in float64 exactly as training
+# did and then rounded to float32 like DMatrix does.
+MONTH_TABLE = np.empty((12, 2), dtype=np.float32)
+for _month in range(1, 13):
+    MONTH_TABLE[_month % 12] = (
+        math.sin(2 * math.pi * _month / 12),
+        math.cos(2 * math.pi * _month / 12)
+    )
+
+
+def allocate(rows: int) -> np.ndarray:
+    """Allocate an uninitialised feature buffer for `rows` reservations"""
+    return np.empty((rows, NUM_FEATURES), dtype=np.float32)
+
+
+def encode_reservation(request, out: np.ndarray = None) -> np.ndarray:
+    """Encode one ReservationRequest into a (1, NUM_FEATURES) float32 buffer"""
+    if out is None:
+        out = allocate(1)
+    row = out[0]
+    row[0] = request.lead_time_days
+    row[1] = request.party_size
+    row[2] = request.deposit_paid
+    row[3] = request.is_repeated_guest
+    row[4] = request.previous_cancellations
+    row[5] = request.special_requests_count
+    row[6:] = MONTH_TABLE[request.visit_month % 12]
+    return out
+
+
+def encode_reservations(requests, out: np.ndarray = None) -> np.ndarray:
+    """Encode a sequence of ReservationRequests into an (n, NUM_FEATURES) float32 buffer"""
+    raw = np.array([
+        (
+            request.lead_time_days,
+            request.party_size,
+            request.deposit_paid,
+            request.is_repeated_guest,
+            request.previous_cancellations,
+            request.special_requests_count,
+            request.visit_month
+        )
+        for request in requests
+    ], dtype=np.int64).reshape(-1, 7)
+    return encode_columns(*raw.T, out=out)
+
+
+def encode_columns(lead_time, party_size, deposit_paid, is_repeated_guest,
+                   previous_cancellations, special_requests, month_num,
+                   out: np.ndarray = None) -> np.ndarray:
+    """Encode column arrays (training data or a batch) into an (n, NUM_FEATURES) float32 buffer"""
+    if out is None:
+        out = allocate(len(lead_time))
+    out[:, 0] = lead_time
+    out[:, 1] = party_size
+    out[:, 2] = deposit_paid
+    out[:, 3] = is_repeated_guest
+    out[:, 4] = previous_cancellations
+    out[:, 5] = special_requests
+    out[:, 6:] = MONTH_TABLE[np.asarray(month_num, dtype=np.int64) % 12]
+    return out
+
+
+def encode_frame(df, out: np.ndarray = None) -> np.ndarray:
+    """Encode a processed_reservations.csv DataFrame (month names included)"""
+    month = df['arrival_date_month']
+    if hasattr(month, 'cat'):
+        # Parquet/Feather exports keep the month as a categorical
+        month = month.astype(object)
+    month_num = month.map(MONTH_MAP).fillna(1)
+    return encode_columns(
+        df['lead_time'].to_numpy(),
+        df['party_size'].to_numpy(),
+        df['deposit_paid'].to_numpy(),
+        df['is_repeated_guest'].to_numpy(),
+        df['previous_cancellations'].to_numpy(),
+        df['total_of_special_requests'].to_numpy(),
+        month_num.to_numpy(),
+        out=out
+    )
@@ -0,0 +1,239 @@
+"""Memory-mapped feature store for training and evaluation scripts.
+
+train_model.py, generate_efficiency_graphs.py and benchmarks used to each
+re-read processed_reservations.csv, re-encode it and re-split it. The
+store does that once per version of the data. It writes the encoded
+float32 matrix (noshow.features), the labels and the split into .npy
+files under .feature_store/<key>/, and later runs np.load them with
+mmap_mode="r".
+
+Rows are stored in split order (train rows first, in the order
+train_test_split returned them, then test rows). X_train and X_test are
+therefore plain slices of the memory map: zero-copy, and identical to
+what the scripts built before.
+
+The key hashes the source file's contents together with the feature
+columns, ENCODING_VERSION and the split parameters. Changing any of them
+rebuilds the entry; anything else reuses it. The content hash is cached
+against the file's size and mtime, so an unchanged multi-GB export is not
+re-hashed on every load.
+
+    python -m noshow.featurestore build
+    python -m noshow.featurestore info
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from noshow.features import FEATURE_COLUMNS, NUM_FEATURES, encode_frame
+
+SOURCE = "processed_reservations.csv"
+STORE_DIR = ".feature_store"
+
+# Bump when encode_frame's output changes for the same input
+ENCODING_VERSION = 1
+
+# Rows read and encoded at a time while building
+BUILD_CHUNK_ROWS = 1_000_000
+
+FEATURE_SOURCE_COLUMNS = [
+    'lead_time', 'party_size', 'deposit_paid', 'is_repeated_guest', 'previous_cancellations',
+    'total_of_special_requests', 'arrival_date_month', 'target'
+]
+
+
+class FeatureSet:
+    """Memory-mapped features, labels and split of one store entry"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.key = self.meta["key"]
+        self.n_train = self.meta["n_train"]
+        self.X = np.load(os.path.join(path, "X.npy"), mmap_mode="r")
+        self.y = np.load(os.path.join(path, "y.npy"), mmap_mode="r")
+        # Source row of each stored row
+        self.rows = np.load(os.path.join(path, "rows.npy"), mmap_mode="r")
+
+    @property
+    def X_train(self):
+        return self.X[:self.n_train]
+
+    @property
+    def X_test(self):
+        return self.X[self.n_train:]
+
+    @property
+    def y_train(self):
+        return self.y[:self.n_train]
+
+    @property
+    def y_test(self):
+        return self.y[self.n_train:]
+
+    def __len__(self):
+        return len(self.y)
+
+
+def _content_hash(source: str, store_dir: str) -> str:
+    """sha256 of the source file, cached against its size and mtime"""
+    stat = os.stat(source)
+    cache_path = os.path.join(store_dir, "hashes.json")
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(os.path.abspath(source))
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry["sha256"]
+
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    cache[os.path.abspath(source)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+    os.makedirs(store_dir, exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=2)
+    return digest.hexdigest()
+
+
+def store_key(source: str, store_dir: str = STORE_DIR, test_size: float = 0.2, random_state: int = 42) -> str:
+    recipe = json.dumps({
+        "data": _content_hash(source, store_dir),
+        "features": FEATURE_COLUMNS,
+        "encoding": ENCODING_VERSION,
+        "test_size": test_size,
+        "random_state": random_state
+    }, sort_keys=True)
+    return hashlib.sha256(recipe.encode()).hexdigest()[:16]
+
+
+def read_processed(source: str, chunk_rows: int = BUILD_CHUNK_ROWS):
+    """DataFrames of the processed columns from CSV, Parquet or Feather, chunk by chunk"""
+    import pandas as pd
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".parquet":
+        import pyarrow.parquet
+        parquet = pyarrow.parquet.ParquetFile(source)
+        for batch in parquet.iter_batches(chunk_rows, columns=FEATURE_SOURCE_COLUMNS):
+            yield batch.to_pandas()
+    elif extension == ".feather":
+        # Arrow IPC file: memory-mapped, one record batch per chunk process_kaggle_data wrote
+        import pyarrow
+        import pyarrow.ipc
+        with pyarrow.memory_map(source) as stream:
+            reader = pyarrow.ipc.open_file(stream)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).select(FEATURE_SOURCE_COLUMNS).to_pandas()
+    else:
+        yield from pd.read_csv(source, usecols=FEATURE_SOURCE_COLUMNS, chunksize=chunk_rows)
+
+
+def build(source: str = SOURCE, store_dir: str = STORE_DIR, test_size: float = 0.2, random_state: int = 42) -> str:
+    """Encode and split `source` into a new store entry; returns its directory"""
+    from sklearn.model_selection import train_test_split
+
+    key = store_key(source, store_dir, test_size, random_state)
+    start = time.perf_counter()
+    scratch = tempfile.mkdtemp(prefix=f"{key}.", dir=store_dir)
+    try:
+        # Encode chunk by chunk into a growing list of float32 blocks
+        blocks, labels = [], []
+        for chunk in read_processed(source):
+            blocks.append(encode_frame(chunk))
+            labels.append(chunk['target'].to_numpy(dtype=np.int8))
+        X = np.concatenate(blocks) if blocks else np.empty((0, NUM_FEATURES), dtype=np.float32)
+        y = np.concatenate(labels) if labels else np.empty(0, dtype=np.int8)
+        del blocks, labels
+
+        # Same split the scripts always used, stored as a row order
+        train_rows, test_rows = train_test_split(
+            np.arange(len(y)), test_size=test_size, random_state=random_state, stratify=y
+        )
+        rows = np.concatenate([train_rows, test_rows])
+
+        np.save(os.path.join(scratch, "X.npy"), X[rows])
+        np.save(os.path.join(scratch, "y.npy"), y[rows])
+        np.save(os.path.join(scratch, "rows.npy"), rows)
+        with open(os.path.join(scratch, "meta.json"), "w") as f:
+            json.dump({
+                "key": key,
+                "source": os.path.abspath(source),
+                "rows": int(len(y)),
+                "n_train": int(len(train_rows)),
+                "feature_columns": FEATURE_COLUMNS,
+                "encoding_version": ENCODING_VERSION,
+                "test_size": test_size,
+                "random_state": random_state,
+                "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "build_seconds": round(time.perf_counter() - start, 2)
+            }, f, indent=2)
+
+        path = os.path.join(store_dir, key)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.rename(scratch, path)
+        return path
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+
+
+def load_features(source: str = SOURCE, store_dir: str = STORE_DIR, test_size: float = 0.2,
+                  random_state: int = 42) -> FeatureSet:
+    """FeatureSet for `source`, built first if the data or recipe changed.
+
+    Raises FileNotFoundError if `source` does not exist.
+    """
+    if not os.path.exists(source):
+        raise FileNotFoundError(source)
+    os.makedirs(store_dir, exist_ok=True)
+    path = os.path.join(store_dir, store_key(source, store_dir, test_size, random_state))
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        print(f"🧱 Building feature store entry from '{source}'...")
+        path = build(source, store_dir, test_size, random_state)
+    return FeatureSet(path)
+
+
+def entries(store_dir: str = STORE_DIR):
+    """meta.json of every store entry"""
+    if not os.path.isdir(store_dir):
+        return []
+    metas = []
+    for name in sorted(os.listdir(store_dir)):
+        meta_path = os.path.join(store_dir, name, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                metas.append(json.load(f))
+    return metas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the memory-mapped feature store")
+    parser.add_argument("command", choices=("build", "info", "clear"))
+    parser.add_argument("--source", default=SOURCE)
+    parser.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        features = load_features(args.source, args.store)
+        print(f"✅ {features.path}: {len(features):,} rows ({features.n_train:,} train) "
+              f"ready in {time.perf_counter() - start:.3f}s")
+    elif args.command == "info":
+        for meta in entries(args.store):
+            print(f"{meta['key']}  {meta['rows']:>12,} rows  {meta['built_at']}  {meta['source']}")
+    else:
+        shutil.rmtree(args.store, ignore_errors=True)
+        print(f"🗑️ Removed '{args.store}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Index set for the `predictions` collection.
+
+INDEXES is the single declaration of what the API's queries need:
+
+- history pages sort newest first on (timestamp, _id), and cursors range on it
+- risk-level filters sort the same way, so risk_level leads a compound index
+- name search ranges over search_terms (noshow.search), newest first
+- detail lookups use the built-in _id index
+- time ranges (history, export, the archiver) range on timestamp
+
+The API ensures them at startup (ENSURE_INDEXES, idempotent: existing
+indexes with the same spec are left alone). The CLI does the same from a
+shell and can check that every endpoint query is served by an index, on
+predictions and on each monthly archive (tests/test_indexes.py runs the
+same check against a local MongoDB):
+
+    python -m noshow.indexes ensure
+    python -m noshow.indexes check      # exits 1 if any query plans a COLLSCAN
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+from bson import ObjectId
+from noshow.pagination import HISTORY_SORT, after_cursor, encode_cursor
+from noshow.search import search_query
+
+logger = logging.getLogger(__name__)
+
+# (keys, options) pairs; names are fixed so changes show up as new indexes
+INDEXES = [
+    (HISTORY_SORT, {"name": "timestamp_id_desc"}),
+    ([("risk_level", 1)] + HISTORY_SORT, {"name": "risk_level_timestamp"}),
+    ([("search_terms", 1)] + HISTORY_SORT, {"name": "search_terms_timestamp"}),
+]
+
+
+def index_models():
+    from pymongo import IndexModel
+    return [IndexModel(keys, **options) for keys, options in INDEXES]
+
+
+async def ensure_indexes(collection):
+    """Create any missing index (Motor collection); returns the index names"""
+    return await collection.create_indexes(index_models())
+
+
+def endpoint_queries():
+    """(label, filter, sort) for each query shape the list/detail/export endpoints and the archiver issue"""
+    # Imported here: both modules build on this one
+    from noshow.export import export_query
+    from noshow.retention import time_range
+
+    cursor = encode_cursor({"timestamp": datetime.utcnow(), "_id": ObjectId()})
+    start, end = datetime(2025, 1, 1), datetime(2025, 2, 1)
+    name = search_query("smith")
+    name_or_risk = search_query("moderate")
+    return [
+        ("recent: first page", {}, HISTORY_SORT),
+        ("recent: cursor page", after_cursor({}, cursor), HISTORY_SORT),
+        ("recent: time range", time_range({}, start, end), HISTORY_SORT),
+        ("all: name search", name, HISTORY_SORT),
+        ("all: name or risk search", name_or_risk, HISTORY_SORT),
+        ("all: search, cursor page", after_cursor(name_or_risk, cursor), HISTORY_SORT),
+        ("all: search, time range", time_range(name_or_risk, start, end), HISTORY_SORT),
+        ("export: time range", export_query(start, end), HISTORY_SORT),
+        ("export: risk level", export_query(risk_level="Moderate"), HISTORY_SORT),
+        ("export: risk level, range", export_query(start, end, "Moderate"), HISTORY_SORT),
+        ("archiver: older than cutoff", {"timestamp": {"$lt": end}}, [("timestamp", 1)]),
+        ("details: by id", {"_id": ObjectId()}, None),
+    ]
+
+
+def plan_collections(db):
+    """predictions plus every monthly archive (sync pymongo database); they share INDEXES"""
+    from noshow.retention import archive_month
+    return [db.predictions] + [db[name] for name in sorted(db.list_collection_names()) if archive_month(name)]
+
+
+def plan_stages(plan: dict):
+    """Every stage name in a winning plan tree"""
+    stages = [plan.get("stage")]
+    for child in plan.get("inputStages", []) + ([plan["inputStage"]] if "inputStage" in plan else []):
+        stages.extend(plan_stages(child))
+    return stages
+
+
+def check_plans(collection, limit: int = 20):
+    """Explain every endpoint query (sync pymongo collection); returns [(label, stages)] of COLLSCANs"""
+    failures = []
+    for label, query, sort in endpoint_queries():
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = cursor.limit(limit).explain()["queryPlanner"]["winningPlan"]
+        # Mongo 7+ wraps classic plans in queryPlan
+        stages = plan_stages(plan.get("queryPlan", plan))
+        status = "COLLSCAN" if "COLLSCAN" in stages else "ok"
+        print(f"{status:<9} {collection.name:<28} {label:<28} {' <- '.join(s for s in stages if s)}")
+        if status != "ok":
+            failures.append((f"{collection.name}: {label}", stages))
+    return failures
+
+
+def main():
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Manage indexes on the predictions collection")
+    parser.add_argument("command", choices=("ensure", "check", "list"))
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="restaurant_db")
+    args = parser.parse_args()
+
+    db = MongoClient(args.mongo_uri)[args.db]
+    collection = db.predictions
+    if args.command == "ensure":
+        names = collection.create_indexes(index_models())
+        print(f"✅ Indexes in place: {', '.join(names)}")
+    elif args.command == "list":
+        for name, info in collection.index_information().items():
+            print(f"{name:<24} {info['key']}")
+    elif [failure for target in plan_collections(db) for failure in check_plans(target)]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
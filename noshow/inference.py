@@ -0,0 +1,205 @@
+"""Inference engines behind /predict.
+
+Every engine takes the float32 matrix produced by noshow.features and
+returns one no-show probability per row:
+
+- "xgboost": the original libxgboost Booster via DMatrix (default)
+- "numpy":   noshow.trees.TreeEnsemble compiled from the same JSON file
+- "auto":    numpy for small requests, xgboost for large batches
+
+Any of them can sit behind a precomputed lookup table (noshow.lookup),
+enabled with LOOKUP_TABLE_PATH.
+
+The NumPy walk wins for single rows (no DMatrix/libxgboost entry cost)
+but loses to multithreaded libxgboost somewhere around 100 rows; see
+benchmarks/bench_inference.py.
+
+Pick one with the INFERENCE_ENGINE environment variable.
+
+For fast cold starts the JSON model can be exported to artifacts that load
+without parsing JSON: XGBoost's binary UBJSON (.ubj) for the booster and a
+compiled .npz for the NumPy engine, which never imports xgboost at all:
+
+    python -m noshow.inference --model noshow_xgb.json
+"""
+import argparse
+import hashlib
+import logging
+import os
+import numpy as np
+from noshow.features import FEATURE_COLUMNS
+from noshow.trees import TreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("xgboost", "numpy", "auto")
+
+# Largest batch the "auto" engine sends to the NumPy evaluator
+AUTO_NUMPY_MAX_ROWS = 64
+
+
+class BoosterEngine:
+    """libxgboost Booster behind the common predict(features) interface"""
+
+    name = "xgboost"
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    @classmethod
+    def from_file(cls, path: str, nthread: int = 0) -> "BoosterEngine":
+        import xgboost as xgb
+        booster = xgb.Booster()
+        booster.load_model(path)
+        if nthread > 0:
+            booster.set_param({"nthread": nthread})
+        engine = cls(booster)
+        engine.source_version = booster.attr("source_version")
+        return engine
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        import xgboost as xgb
+        return self.booster.predict(xgb.DMatrix(features, feature_names=FEATURE_COLUMNS))
+
+
+class NumpyEngine:
+    """Compiled TreeEnsemble behind the common predict(features) interface"""
+
+    name = "numpy"
+
+    def __init__(self, ensemble: TreeEnsemble):
+        self.ensemble = ensemble
+
+    @classmethod
+    def from_file(cls, path: str) -> "NumpyEngine":
+        engine = cls(TreeEnsemble.from_file(path))
+        engine.source_version = engine.ensemble.source_version
+        return engine
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.ensemble.predict(features)
+
+
+class AutoEngine:
+    """Route each call to whichever engine is faster for its batch size"""
+
+    name = "auto"
+
+    def __init__(self, booster_engine: BoosterEngine, numpy_engine: NumpyEngine,
+                 numpy_max_rows: int = AUTO_NUMPY_MAX_ROWS):
+        self.booster_engine = booster_engine
+        self.numpy_engine = numpy_engine
+        self.numpy_max_rows = numpy_max_rows
+
+    @classmethod
+    def from_file(cls, path: str, nthread: int = 0) -> "AutoEngine":
+        return cls(BoosterEngine.from_file(path, nthread), NumpyEngine.from_file(path))
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        if len(features) <= self.numpy_max_rows:
+            return self.numpy_engine.predict(features)
+        return self.booster_engine.predict(features)
+
+
+class LookupEngine:
+    """Precomputed noshow.lookup table with another engine for rows it can't answer"""
+
+    def __init__(self, table, fallback):
+        self.table = table
+        self.fallback = fallback
+        self.name = f"lookup+{fallback.name}"
+        self.version = getattr(fallback, "version", None)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        probabilities, found = self.table.lookup(features)
+        if not found.all():
+            probabilities[~found] = self.fallback.predict(features[~found])
+        return probabilities
+
+
+def with_lookup_table(engine, prefix: str) -> LookupEngine:
+    """Put the lookup table saved at `prefix` in front of `engine`.
+
+    Raises ValueError when the table was compiled from a different model.
+    """
+    from noshow.lookup import LookupTable
+    table = LookupTable.load(prefix)
+    if table.model_version != engine.version:
+        raise ValueError(f"Lookup table built for model {table.model_version}, loaded model is {engine.version}")
+    return LookupEngine(table, engine)
+
+
+def model_version(path: str) -> str:
+    """Short content hash identifying a model file"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def _open_engine(path: str, engine: str, nthread: int):
+    if engine == "numpy":
+        return NumpyEngine.from_file(path)
+    if engine == "xgboost":
+        return BoosterEngine.from_file(path, nthread)
+    if engine == "auto":
+        return AutoEngine.from_file(path, nthread)
+    raise ValueError(f"Unknown inference engine '{engine}', expected one of {ENGINES}")
+
+
+def load_engine(path: str, engine: str = "xgboost", nthread: int = 0):
+    """Load the model at `path` into the requested inference engine.
+
+    `nthread` caps libxgboost's own threads per predict call (0 keeps the
+    XGBoost default); it has no effect on the NumPy engine. The returned
+    engine carries a `version`: the content hash of the model file, or of
+    the JSON model an exported .ubj/.npz artifact was built from. An
+    artifact whose JSON model sits next to it with a different hash is
+    stale (the JSON was replaced without re-exporting), so the JSON is
+    loaded instead.
+    """
+    loaded = _open_engine(path, engine, nthread)
+    source = os.path.splitext(path)[0] + ".json"
+    if path != source and os.path.exists(source):
+        expected = model_version(source)
+        if getattr(loaded, "source_version", None) != expected:
+            logger.warning(f"⚠️ {path} was exported from model {getattr(loaded, 'source_version', None)}, "
+                           f"{source} is {expected}; loading the JSON (re-run python -m noshow.inference)")
+            loaded = _open_engine(source, engine, nthread)
+            path = source
+    loaded.version = getattr(loaded, "source_version", None) or model_version(path)
+    return loaded
+
+
+def fast_model_path(path: str, engine: str) -> str:
+    """Exported sibling of a JSON model that loads fastest for `engine`, if one exists"""
+    base, _ = os.path.splitext(path)
+    extension = {"numpy": ".npz", "xgboost": ".ubj"}.get(engine)
+    if extension and os.path.exists(base + extension):
+        return base + extension
+    return path
+
+
+def export_fast_artifacts(path: str):
+    """Write <model>.ubj and <model>.npz next to a JSON model; returns their paths"""
+    import xgboost as xgb
+    base, _ = os.path.splitext(path)
+    version = model_version(path)
+
+    booster = xgb.Booster()
+    booster.load_model(path)
+    booster.set_attr(source_version=version)
+    booster.save_model(base + ".ubj")
+
+    TreeEnsemble.from_file(path).save(base + ".npz", source_version=version)
+    return base + ".ubj", base + ".npz"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a JSON model to fast-loading .ubj/.npz artifacts")
+    parser.add_argument("--model", default="noshow_xgb.json")
+    args = parser.parse_args()
+    for artifact in export_fast_artifacts(args.model):
+        print(f"✅ Wrote {artifact} ({os.path.getsize(artifact) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
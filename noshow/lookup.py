@@ -0,0 +1,155 @@
+"""Precomputed probability table covering the whole feature domain.
+
+Trees only change their output when a feature crosses one of its split
+thresholds, so every numeric feature can be replaced by the index of the
+threshold interval it falls in. Months are enumerated directly (12
+encoded sin/cos pairs). The product of those intervals for the current
+model is under a million cells, small enough to score once and keep in a
+memory-mapped float32 array. /predict then needs only a few searchsorted
+calls and one array read.
+
+Because intervals are taken at the booster's own thresholds, the table is
+exact for every integer input, not just a "realistic" range: a party of
+40 falls in the same interval as a party of 13. Rows whose month columns
+are not one of the 12 encodings (e.g. NaN) are reported as misses and
+scored by the fallback engine.
+
+Build and verify a table:
+
+    python -m noshow.lookup --model noshow_xgb.json --out noshow_lut
+"""
+import argparse
+import json
+import numpy as np
+from noshow.features import MONTH_TABLE, NUM_FEATURES
+
+# Features 0-5 are bucketed at split thresholds; 6-7 (month sin/cos) are enumerated
+BUCKETED_FEATURES = range(6)
+
+
+class LookupTable:
+    """Probability table indexed by (threshold interval per feature..., month slot)"""
+
+    def __init__(self, table: np.ndarray, thresholds, model_version: str):
+        self.table = table
+        self.thresholds = [np.asarray(t, dtype=np.float32) for t in thresholds]
+        self.model_version = model_version
+
+    @staticmethod
+    def thresholds_from(ensemble):
+        """Sorted distinct split thresholds of each bucketed feature"""
+        internal = ensemble.left != np.arange(len(ensemble.left))
+        return [
+            np.unique(ensemble.threshold[internal & (ensemble.split_feature == feature)])
+            for feature in BUCKETED_FEATURES
+        ]
+
+    @staticmethod
+    def representatives(thresholds: np.ndarray) -> np.ndarray:
+        """One value inside each threshold interval (values equal to a threshold go right)"""
+        if len(thresholds) == 0:
+            return np.zeros(1, dtype=np.float32)
+        return np.concatenate([[thresholds[0] - 1], thresholds]).astype(np.float32)
+
+    @classmethod
+    def compile(cls, ensemble, predict, model_version: str) -> "LookupTable":
+        """Score every cell of the domain with `predict` (features -> probabilities)"""
+        thresholds = cls.thresholds_from(ensemble)
+        axes = [cls.representatives(t) for t in thresholds] + [np.arange(12)]
+        grid = np.meshgrid(*axes, indexing="ij")
+
+        features = np.empty((grid[0].size, NUM_FEATURES), dtype=np.float32)
+        for feature in BUCKETED_FEATURES:
+            features[:, feature] = grid[feature].ravel()
+        features[:, 6:] = MONTH_TABLE[grid[-1].ravel()]
+
+        table = np.asarray(predict(features), dtype=np.float32).reshape(grid[0].shape)
+        return cls(table, thresholds, model_version)
+
+    def lookup(self, features: np.ndarray):
+        """Return (probabilities, found) for an (n, NUM_FEATURES) float32 matrix"""
+        features = np.asarray(features, dtype=np.float32)
+        index = [
+            np.searchsorted(self.thresholds[feature], features[:, feature], side="right")
+            for feature in BUCKETED_FEATURES
+        ]
+
+        month_match = (features[:, None, 6:] == MONTH_TABLE[None, :, :]).all(axis=2)
+        found = month_match.any(axis=1) & ~np.isnan(features[:, :6]).any(axis=1)
+        index.append(month_match.argmax(axis=1))
+
+        probabilities = self.table[tuple(index)]
+        return probabilities, found
+
+    def verify(self, predict, rows: int = 200000, seed: int = 0) -> int:
+        """Compare against `predict` on random rows plus every threshold edge; returns rows checked"""
+        rng = np.random.default_rng(seed)
+        raw = np.column_stack([
+            rng.integers(-5, 800, rows),
+            rng.integers(0, 60, rows),
+            rng.integers(0, 2, rows),
+            rng.integers(0, 2, rows),
+            rng.integers(0, 30, rows),
+            rng.integers(0, 10, rows)
+        ]).astype(np.float32)
+
+        # Also hit each threshold and its integer neighbours on every feature
+        edges = []
+        for feature, thresholds in zip(BUCKETED_FEATURES, self.thresholds):
+            for value in np.concatenate([thresholds - 1, thresholds, thresholds + 1]):
+                row = raw[len(edges) % rows].copy()
+                row[feature] = value
+                edges.append(row)
+        if edges:
+            raw = np.vstack([raw, np.array(edges, dtype=np.float32)])
+
+        features = np.empty((len(raw), NUM_FEATURES), dtype=np.float32)
+        features[:, :6] = raw
+        features[:, 6:] = MONTH_TABLE[rng.integers(0, 12, len(raw))]
+
+        expected = np.asarray(predict(features), dtype=np.float32)
+        actual, found = self.lookup(features)
+        if not found.all():
+            raise ValueError(f"{int((~found).sum())} verification rows fell outside the table")
+        mismatched = int((actual != expected).sum())
+        if mismatched:
+            raise ValueError(f"Lookup table disagrees with the model on {mismatched} of {len(features)} rows")
+        return len(features)
+
+    def save(self, prefix: str):
+        """Write `<prefix>.npy` (the table) and `<prefix>.json` (thresholds, model version)"""
+        np.save(f"{prefix}.npy", self.table)
+        with open(f"{prefix}.json", "w") as f:
+            json.dump({
+                "model_version": self.model_version,
+                "shape": list(self.table.shape),
+                "thresholds": [t.tolist() for t in self.thresholds]
+            }, f)
+
+    @classmethod
+    def load(cls, prefix: str, mmap: bool = True) -> "LookupTable":
+        with open(f"{prefix}.json", "r") as f:
+            meta = json.load(f)
+        table = np.load(f"{prefix}.npy", mmap_mode="r" if mmap else None)
+        return cls(table, meta["thresholds"], meta["model_version"])
+
+
+def main():
+    from noshow.inference import BoosterEngine, model_version
+    from noshow.trees import TreeEnsemble
+
+    parser = argparse.ArgumentParser(description="Compile noshow_xgb.json into a probability lookup table")
+    parser.add_argument("--model", default="noshow_xgb.json")
+    parser.add_argument("--out", default="noshow_lut")
+    args = parser.parse_args()
+
+    booster = BoosterEngine.from_file(args.model)
+    table = LookupTable.compile(TreeEnsemble.from_file(args.model), booster.predict, model_version(args.model))
+    checked = table.verify(booster.predict)
+    table.save(args.out)
+    print(f"✅ {table.table.size:,} cells {table.table.shape}, {table.table.nbytes / 1e6:.1f} MB -> {args.out}.npy")
+    print(f"✅ Matches Booster.predict exactly on {checked:,} verification rows")
+
+
+if __name__ == "__main__":
+    main()
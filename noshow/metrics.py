@@ -0,0 +1,30 @@
+"""Small in-process counters and histograms for the monitoring endpoints."""
+import bisect
+import threading
+
+
+class Histogram:
+    """Fixed-bucket histogram; each observation lands in the first bucket >= value"""
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={bound:g}" for bound in self.buckets] + ["+Inf"]
+            return {
+                "count": self.count,
+                "mean": round(self.total / self.count, 4) if self.count else 0.0,
+                "buckets": dict(zip(labels, self.counts))
+            }
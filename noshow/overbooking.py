@@ -0,0 +1,190 @@
+"""Service-level overbooking from the exact distribution of no-show covers.
+
+The per-reservation advice in noshow.insights looks at one booking at a
+time. Here every booking in a service counts. Booking i (party size s_i,
+no-show probability p_i) contributes s_i no-show covers with probability
+p_i, so the total is a weighted Poisson-binomial variable whose
+probability generating function is
+
+    prod_i ((1 - p_i) + p_i * z**s_i)
+
+Its coefficients are the exact pmf. Two ways to get them:
+
+- "dp": multiply the factors in one at a time, O(bookings x covers). Each
+  step is one vector update.
+- "fft": a product tree. All factors are stacked in one matrix and
+  multiplied pairwise level by level, so there are only log2(bookings)
+  levels of batched NumPy work. Low levels, where the factors are short,
+  use shifted multiply-adds; higher levels use real FFTs. Round-off
+  (~1e-16) is clipped and the pmf renormalized.
+
+optimize_overbooking() adds k extra reservations of a typical size and
+no-show rate, one DP step each, and picks the k with the highest
+expected profit:
+
+    (avg_revenue_per_person - prep_cost_per_person) * E[seated covers]
+        - denied_cost_per_person * E[covers turned away]
+
+where seated = min(showing covers, capacity). The constants come from
+noshow.insights.BusinessParams.
+
+    python benchmarks/bench_overbooking.py --bookings 100 1000 5000
+"""
+import numpy as np
+from noshow.insights import BusinessParams, load_params
+
+METHODS = ("auto", "dp", "fft")
+
+# Above this many bookings "auto" uses the FFT product tree
+FFT_MIN_BOOKINGS = 256
+# Product-tree levels with factors up to this wide multiply directly instead of by FFT
+DIRECT_MAX_WIDTH = 32
+
+
+def _inputs(party_sizes, probabilities):
+    sizes = np.asarray(party_sizes, dtype=np.int64)
+    probs = np.asarray(probabilities, dtype=np.float64)
+    if sizes.shape != probs.shape or sizes.ndim != 1:
+        raise ValueError("party_sizes and probabilities must be 1-D arrays of the same length")
+    if (sizes < 0).any():
+        raise ValueError("party sizes must be non-negative")
+    if ((probs < 0) | (probs > 1)).any():
+        raise ValueError("probabilities must be within [0, 1]")
+    return sizes, probs
+
+
+def no_show_pmf_dp(party_sizes, probabilities) -> np.ndarray:
+    """pmf[j] = P(exactly j no-show covers), one DP step per booking"""
+    sizes, probs = _inputs(party_sizes, probabilities)
+    pmf = np.zeros(int(sizes.sum()) + 1)
+    pmf[0] = 1.0
+    reach = 0
+    for size, p in zip(sizes.tolist(), probs.tolist()):
+        shifted = pmf[:reach + 1] * p
+        pmf[:reach + 1] *= 1.0 - p
+        pmf[size:reach + size + 1] += shifted
+        reach += size
+    return pmf
+
+
+def _multiply_pairs(left: np.ndarray, right: np.ndarray, length: int) -> np.ndarray:
+    """Row-wise polynomial products left[i] * right[i], truncated to `length` coefficients"""
+    width = left.shape[1]
+    if width <= DIRECT_MAX_WIDTH:
+        # Short factors: shifted multiply-adds beat a batch of tiny FFTs
+        product = np.zeros((len(left), 2 * width - 1))
+        for shift in range(width):
+            product[:, shift:shift + width] += left[:, shift:shift + 1] * right
+        return product[:, :length]
+    n_fft = 1 << (2 * width - 2).bit_length()
+    spectra = np.fft.rfft(left, n_fft, axis=1) * np.fft.rfft(right, n_fft, axis=1)
+    return np.fft.irfft(spectra, n_fft, axis=1)[:, :length]
+
+
+def no_show_pmf_fft(party_sizes, probabilities) -> np.ndarray:
+    """pmf[j] = P(exactly j no-show covers), by a batched FFT product tree"""
+    sizes, probs = _inputs(party_sizes, probabilities)
+    total = int(sizes.sum())
+    if len(sizes) == 0:
+        return np.ones(1)
+
+    # One row per booking: (1 - p) + p * z**size
+    factors = np.zeros((len(sizes), int(sizes.max()) + 1))
+    factors[:, 0] = 1.0 - probs
+    factors[np.arange(len(sizes)), sizes] += probs
+    degrees = sizes
+
+    while len(factors) > 1:
+        if len(factors) % 2:
+            identity = np.zeros((1, factors.shape[1]))
+            identity[0, 0] = 1.0
+            factors = np.vstack([factors, identity])
+            degrees = np.append(degrees, 0)
+        degrees = degrees[0::2] + degrees[1::2]
+        factors = _multiply_pairs(factors[0::2], factors[1::2], int(degrees.max()) + 1)
+
+    pmf = np.clip(factors[0, :total + 1], 0.0, None)
+    return pmf / pmf.sum()
+
+
+def no_show_pmf(party_sizes, probabilities, method: str = "auto") -> np.ndarray:
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+    if method == "auto":
+        method = "fft" if len(party_sizes) >= FFT_MIN_BOOKINGS else "dp"
+    return (no_show_pmf_fft if method == "fft" else no_show_pmf_dp)(party_sizes, probabilities)
+
+
+def _outcome(pmf: np.ndarray, booked_covers: int, capacity: int, params: BusinessParams) -> dict:
+    """Expected seated/denied covers and profit when `booked_covers` are booked"""
+    showing = booked_covers - np.arange(len(pmf))
+    seated = np.minimum(showing, capacity)
+    denied = np.maximum(showing - capacity, 0)
+    expected_seated = float(pmf @ seated)
+    expected_denied = float(pmf @ denied)
+    margin = params.avg_revenue_per_person - params.prep_cost_per_person
+    return {
+        "expected_seated_covers": round(expected_seated, 2),
+        "expected_denied_covers": round(expected_denied, 2),
+        "overflow_probability": round(float(pmf[denied > 0].sum()), 4),
+        "expected_profit": round(margin * expected_seated - params.denied_cost_per_person * expected_denied, 2)
+    }
+
+
+def optimize_overbooking(party_sizes, probabilities, capacity: int, extra_party_size: int = None,
+                         extra_probability: float = None, max_extra: int = 50, method: str = "auto",
+                         params: BusinessParams = None) -> dict:
+    """Expected-profit-maximizing number of extra reservations for one service.
+
+    Extra reservations default to the median party size and the mean
+    no-show probability of the bookings already taken. Only 0..max_extra
+    is searched; search_limit_reached is set when the best point is the
+    last one, i.e. a larger max_extra may pay off further.
+    """
+    params = params or load_params()
+    sizes, probs = _inputs(party_sizes, probabilities)
+    if capacity <= 0:
+        raise ValueError("capacity must be positive")
+    if extra_party_size is None:
+        extra_party_size = max(1, int(np.median(sizes))) if len(sizes) else 2
+    if extra_probability is None:
+        extra_probability = float(probs.mean()) if len(probs) else 0.0
+    if extra_party_size <= 0 or not 0 <= extra_probability <= 1:
+        raise ValueError("extra_party_size must be positive and extra_probability within [0, 1]")
+
+    pmf = no_show_pmf(sizes, probs, method)
+    booked_covers = int(sizes.sum())
+    expected_no_shows = float(pmf @ np.arange(len(pmf)))
+    cdf = np.cumsum(pmf)
+
+    curve = []
+    for extra in range(max_extra + 1):
+        if extra:
+            # One more reservation of the typical size: a single DP step
+            shifted = pmf * extra_probability
+            pmf = np.concatenate([pmf * (1.0 - extra_probability), np.zeros(extra_party_size)])
+            pmf[extra_party_size:] += shifted
+        covers = booked_covers + extra * extra_party_size
+        curve.append({"extra_reservations": extra, "booked_covers": covers, **_outcome(pmf, covers, capacity, params)})
+
+    best = max(curve, key=lambda point: point["expected_profit"])
+    return {
+        "bookings": len(sizes),
+        "booked_covers": booked_covers,
+        "capacity": capacity,
+        "no_show_covers": {
+            "expected": round(expected_no_shows, 2),
+            "p10": int(np.searchsorted(cdf, 0.1)),
+            "median": int(np.searchsorted(cdf, 0.5)),
+            "p90": int(np.searchsorted(cdf, 0.9))
+        },
+        "extra_party_size": extra_party_size,
+        "extra_probability": round(extra_probability, 4),
+        "recommended_extra_reservations": best["extra_reservations"],
+        "recommended_extra_covers": best["extra_reservations"] * extra_party_size,
+        "current": curve[0],
+        "recommended": best,
+        # Profit was still best at the last step: the optimum may lie beyond max_extra
+        "search_limit_reached": max_extra > 0 and best["extra_reservations"] == max_extra,
+        "profit_curve": curve
+    }
@@ -0,0 +1,71 @@
+"""Keyset (cursor) pagination for the prediction history endpoints.
+
+History is listed newest first on (timestamp, _id). Instead of skipping N
+documents, the next page asks for everything strictly after the last row
+already returned:
+
+    timestamp < t  OR  (timestamp == t AND _id < id)
+
+With an index on (timestamp, _id) that is a bounded index range no matter
+how deep the page is, and predictions inserted in the meantime can't
+shift rows between pages. The position travels to the client as an opaque
+URL-safe token (`next_cursor`).
+"""
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+
+# Sort shared by every paginated query; _id breaks timestamp ties
+HISTORY_SORT = [("timestamp", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: dict) -> str:
+    """Opaque token pointing just past `doc` (a raw Mongo document)"""
+    timestamp = doc.get("timestamp")
+    if isinstance(timestamp, datetime):
+        position = {"t": timestamp.isoformat(), "id": str(doc["_id"])}
+    else:
+        # Very old documents stored the timestamp as a string
+        position = {"s": timestamp, "id": str(doc["_id"])}
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """(timestamp, ObjectId) from a token; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        position = json.loads(raw)
+        timestamp = datetime.fromisoformat(position["t"]) if "t" in position else position["s"]
+        return timestamp, ObjectId(position["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def after_cursor(query: dict, token: str) -> dict:
+    """`query` restricted to the rows that sort after the cursor position"""
+    timestamp, last_id = decode_cursor(token)
+    after = {"$or": [
+        {"timestamp": {"$lt": timestamp}},
+        {"timestamp": timestamp, "_id": {"$lt": last_id}}
+    ]}
+    return {"$and": [query, after]} if query else after
+
+
+async def fetch_page(collection, query: dict, limit: int, skip: int = 0, cursor: str = None,
+                     projection: dict = None):
+    """One page of raw documents plus the cursor for the next page (None on the last page).
+
+    With a cursor `skip` is ignored. One extra row is fetched to tell whether
+    another page exists.
+    """
+    if cursor:
+        query = after_cursor(query, cursor)
+        skip = 0
+    docs = await collection.find(query, projection).sort(HISTORY_SORT).skip(skip).limit(limit + 1).to_list(length=limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, encode_cursor(docs[-1])
+    return docs, None
@@ -0,0 +1,151 @@
+"""Write-behind persistence for prediction documents.
+
+With WRITE_BEHIND=1, /predict no longer waits on insert_one: the document
+gets a client-side ObjectId, goes into a bounded in-process queue and the
+response returns straight away. A background task drains the queue with
+ordered insert_many calls of up to `batch_size` documents, flushing at
+least every `flush_ms`. A full queue makes put() wait (backpressure), and
+stop() drains whatever is left before the worker exits. `on_flush`, if
+given, is awaited with the documents of each successful write (this is
+how the statistics rollups stay current).
+
+A flush that fails with a connection error may still have reached the
+server, so retries insert unordered and treat a duplicate _id (code 11000)
+as "already written": those documents count as written and go to
+`on_flush` like the rest. Every _id comes from put(), so a duplicate can
+only be our own earlier attempt.
+"""
+import asyncio
+import logging
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+def _already_written(error: dict) -> bool:
+    """Whether a write error on a retry means an earlier attempt inserted the document"""
+    return error.get("code") == DUPLICATE_KEY and set(error.get("keyPattern") or {"_id": 1}) == {"_id"}
+
+
+class WriteBehindQueue:
+    """Bounded queue of documents flushed to a collection in ordered batches"""
+
+    def __init__(self, collection, max_size: int = 10000, batch_size: int = 100,
+                 flush_ms: float = 200, max_retries: int = 3, on_flush=None):
+        # `collection` is a zero-argument callable returning the Motor collection
+        self.collection = collection
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000.0
+        self.max_retries = max_retries
+        self.on_flush = on_flush
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        # Created here so the queue binds to the running loop
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, doc: dict) -> ObjectId:
+        """Queue `doc` (waits while the queue is full) and return its _id"""
+        if self._queue is None:
+            raise RuntimeError("Write-behind queue is not running")
+        doc.setdefault("_id", ObjectId())
+        await self._queue.put(doc)
+        return doc["_id"]
+
+    async def stop(self):
+        """Flush everything still queued, then stop the background task"""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, docs):
+        from pymongo.errors import BulkWriteError
+        attempt = 0
+        while docs:
+            try:
+                # Retries are unordered so every already-written document is reported at once
+                await self.collection().insert_many(docs, ordered=attempt == 0)
+                self.written += len(docs)
+                self.flushes += 1
+                await self._notify(docs)
+                return
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if attempt == 0:
+                    # Ordered insert stops at the first bad document: skip it, retry the rest
+                    inserted = e.details.get("nInserted", 0)
+                    written, failed, remaining = docs[:inserted], errors[:1] or [{"index": inserted}], docs[inserted + 1:]
+                else:
+                    # Unordered retry: duplicate _ids were written by a previous attempt
+                    failed = [error for error in errors if not _already_written(error)]
+                    rejected = {error["index"] for error in failed}
+                    written = [doc for index, doc in enumerate(docs) if index not in rejected]
+                    remaining = []
+                self.written += len(written)
+                self.dropped += len(failed)
+                await self._notify(written)
+                for error in failed:
+                    logger.error(f"❌ Dropped prediction {docs[error['index']].get('_id')}: {error}")
+                docs = remaining
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    self.dropped += len(docs)
+                    logger.error(f"❌ Dropped {len(docs)} predictions after {self.max_retries} retries: {e}")
+                    return
+                logger.warning(f"⚠️ Write-behind flush failed (attempt {attempt}): {e}")
+                await asyncio.sleep(0.5 * attempt)
+
+    async def _notify(self, docs):
+        if self.on_flush is None or not docs:
+            return
+        try:
+            await self.on_flush(docs)
+        except Exception as e:
+            logger.warning(f"⚠️ Write-behind on_flush hook failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "batch_size": self.batch_size,
+            "flush_ms": self.flush_interval * 1000,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes
+        }
@@ -0,0 +1,40 @@
+"""Field projections for the prediction history endpoints.
+
+History cards show a handful of fields, but a stored prediction also
+carries the request echo, model version and the nested business_insights
+block with its long recommendation strings. List endpoints now project in
+the Mongo query itself, so the trimmed fields are never sent over the
+wire, decoded or re-serialized. GET /predictions/{id} still returns the
+full document.
+
+    ?fields=customer_name,risk_level   only these (plus _id and timestamp)
+    ?fields=all                        the whole document, as before
+"""
+from noshow.search import HIDDEN_FIELDS
+
+# What the history cards render (static/js/app.js renderPredictions)
+SLIM_FIELDS = (
+    "customer_name", "party_size", "lead_time_days", "deposit_paid",
+    "prediction_prob", "risk_level", "timestamp"
+)
+
+# Internal fields that never leave the API
+INTERNAL_FIELDS = tuple(HIDDEN_FIELDS)
+
+
+def projection_for(fields: str = None) -> dict:
+    """Mongo projection for a `fields` query parameter (None = slim default).
+
+    Raises ValueError for nested or operator-like names.
+    """
+    if fields is not None and fields.strip().lower() == "all":
+        return {name: 0 for name in INTERNAL_FIELDS}
+
+    names = SLIM_FIELDS if fields is None else [name.strip() for name in fields.split(",") if name.strip()]
+    for name in names:
+        if "." in name or name.startswith("$"):
+            raise ValueError(f"Invalid field name '{name}'")
+    # _id and timestamp are always needed for cursors
+    projection = {name: 1 for name in names if name not in INTERNAL_FIELDS}
+    projection["timestamp"] = 1
+    return projection
@@ -0,0 +1,271 @@
+"""Versioned model registry and zero-downtime model swaps.
+
+Registry layout (MODEL_REGISTRY_DIR):
+
+    models/
+        CURRENT                  # name of the active version
+        976bbb9a8df2/
+            noshow_xgb.json
+            noshow_lut.npy       # optional lookup table (noshow.lookup)
+            noshow_lut.json
+
+ModelManager owns the engine used by the API. A reload loads the new
+model in a worker thread, warms it with a probe batch and only then swaps
+the `engine` attribute - a single reference assignment, so requests that
+already picked up the old engine finish on it and new ones get the new one.
+
+    python -m noshow.registry publish noshow_xgb.json --activate
+    python -m noshow.registry list
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+from datetime import datetime
+import numpy as np
+from noshow.features import encode_columns
+from noshow.inference import load_engine, model_version, with_lookup_table
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "noshow_xgb.json"
+LOOKUP_PREFIX = "noshow_lut"
+CURRENT_FILE = "CURRENT"
+
+
+class ModelRegistry:
+    """Directory of versioned model artifacts with a CURRENT pointer"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def versions(self):
+        """Published versions, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        entries = [
+            name for name in os.listdir(self.root)
+            if os.path.isfile(os.path.join(self.root, name, MODEL_FILE))
+        ]
+        return sorted(entries, key=lambda name: os.path.getmtime(os.path.join(self.root, name, MODEL_FILE)))
+
+    def current(self):
+        """Active version: the CURRENT pointer, else the newest published version"""
+        pointer = os.path.join(self.root, CURRENT_FILE)
+        if os.path.exists(pointer):
+            with open(pointer, "r") as f:
+                version = f.read().strip()
+            if version:
+                return version
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def model_path(self, version: str) -> str:
+        return os.path.join(self.root, version, MODEL_FILE)
+
+    def lookup_prefix(self, version: str):
+        """Lookup table prefix for `version`, or None if it has no table"""
+        prefix = os.path.join(self.root, version, LOOKUP_PREFIX)
+        return prefix if os.path.exists(f"{prefix}.npy") else None
+
+    def publish(self, model_file: str, version: str = None, build_lookup: bool = False) -> str:
+        """Copy a trained model into the registry; the version defaults to its content hash"""
+        version = version or model_version(model_file)
+        target = os.path.join(self.root, version)
+        os.makedirs(target, exist_ok=True)
+        shutil.copyfile(model_file, os.path.join(target, MODEL_FILE))
+
+        if build_lookup:
+            from noshow.lookup import LookupTable
+            from noshow.trees import TreeEnsemble
+            path = self.model_path(version)
+            booster = load_engine(path, "xgboost")
+            table = LookupTable.compile(TreeEnsemble.from_file(path), booster.predict, booster.version)
+            table.verify(booster.predict)
+            table.save(os.path.join(target, LOOKUP_PREFIX))
+        return version
+
+    def activate(self, version: str):
+        """Point CURRENT at `version` (atomic rename, safe for file watchers)"""
+        if not os.path.isfile(self.model_path(version)):
+            raise ValueError(f"Model version '{version}' is not in the registry")
+        pointer = os.path.join(self.root, CURRENT_FILE)
+        with open(f"{pointer}.tmp", "w") as f:
+            f.write(version)
+        os.replace(f"{pointer}.tmp", pointer)
+
+
+def probe_batch() -> np.ndarray:
+    """Small spread of realistic reservations used to warm and sanity-check a new model"""
+    lead_time = np.array([0, 3, 14, 30, 60, 120, 250, 400] * 3)
+    rows = len(lead_time)
+    index = np.arange(rows)
+    return encode_columns(
+        lead_time, index % 6 + 1, index % 2, (index // 2) % 2,
+        index % 3, index % 4, index % 12 + 1
+    )
+
+
+class ModelManager:
+    """Holds the live inference engine and swaps it atomically on reload"""
+
+    def __init__(self, engine: str = "xgboost", nthread: int = 0, registry: ModelRegistry = None,
+                 default_path: str = None, default_lookup: str = None, on_swap=None):
+        self.engine_name = engine
+        self.nthread = nthread
+        self.registry = registry
+        self.default_path = default_path
+        self.default_lookup = default_lookup
+        self.engine = None
+        self.path = None
+        self.lookup_path = None
+        self.version = None
+        self.loaded_at = None
+        self.on_swap = on_swap
+        self._reload_lock = None
+        self._deferred = False
+
+    def resolve(self, version: str = None):
+        """(version, model path, lookup prefix) to load for `version` (None = current)"""
+        if self.registry is not None:
+            version = version or self.registry.current()
+            if version is None:
+                raise ValueError(f"No model versions in registry {self.registry.root}")
+            # Only published names: never join a caller-supplied string into a path
+            if version not in self.registry.versions():
+                raise ValueError(f"Model version '{version}' is not in the registry")
+            return version, self.registry.model_path(version), self.registry.lookup_prefix(version)
+        if version is not None:
+            raise ValueError("Model versions need MODEL_REGISTRY_DIR")
+        return None, self.default_path, self.default_lookup
+
+    def build(self, version, path: str, lookup_path: str = None):
+        """Load, wrap and warm a new engine without touching the live one"""
+        engine = load_engine(path, self.engine_name, self.nthread)
+        if lookup_path:
+            try:
+                engine = with_lookup_table(engine, lookup_path)
+            except Exception as e:
+                logger.warning(f"⚠️ Lookup table not used: {e}")
+                lookup_path = None
+        if version:
+            engine.version = version
+
+        probabilities = np.asarray(engine.predict(probe_batch()))
+        if not (np.isfinite(probabilities).all() and ((probabilities >= 0) & (probabilities <= 1)).all()):
+            raise ValueError("New model produced invalid probabilities on the probe batch")
+        return engine, lookup_path
+
+    def swap(self, engine, path: str, lookup_path: str = None):
+        self.engine = engine
+        self.path = path
+        self.lookup_path = lookup_path
+        self.version = engine.version
+        self.loaded_at = datetime.utcnow()
+        if self.on_swap is not None:
+            self.on_swap(self)
+
+    def load(self, version: str = None):
+        """Synchronous initial load (import time)"""
+        version, path, lookup_path = self.resolve(version)
+        engine, lookup_path = self.build(version, path, lookup_path)
+        self.swap(engine, path, lookup_path)
+        return engine
+
+    def defer_load(self):
+        """Skip the import-time load; the first get_engine() call loads the model"""
+        self._deferred = True
+
+    def get_engine(self):
+        """Live engine, loading it on first use when the initial load was deferred"""
+        if self.engine is None and self._deferred:
+            self._deferred = False
+            try:
+                self.load()
+                logger.info(f"✅ Model loaded on first use (version {self.version}, {self.engine.name} engine)")
+            except Exception as e:
+                logger.error(f"❌ Failed to load model: {e}")
+        return self.engine
+
+    async def reload(self, version: str = None):
+        """Load `version` (None = current) in the background and swap it in once warm"""
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+        async with self._reload_lock:
+            version, path, lookup_path = self.resolve(version)
+            loop = asyncio.get_running_loop()
+            engine, lookup_path = await loop.run_in_executor(None, self.build, version, path, lookup_path)
+            previous = self.version
+            self.swap(engine, path, lookup_path)
+            logger.info(f"✅ Model swapped: {previous} -> {self.version}")
+            return engine
+
+    def _signature(self):
+        """What the watcher compares: the CURRENT version, or the default file's mtime/size"""
+        if self.registry is not None:
+            return self.registry.current()
+        stat = os.stat(self.default_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    async def watch(self, interval: float):
+        """Poll for a new model every `interval` seconds and hot-swap it"""
+        last = self._signature()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                signature = self._signature()
+                if signature == last:
+                    continue
+                await self.reload()
+                last = signature
+            except Exception as e:
+                logger.error(f"❌ Model reload failed, keeping {self.version}: {e}")
+
+    def status(self) -> dict:
+        return {
+            "version": self.version,
+            "engine": self.engine.name if self.engine else None,
+            "path": self.path,
+            "lookup_table": self.lookup_path,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "registry": self.registry.root if self.registry else None,
+            "available_versions": self.registry.versions() if self.registry else []
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry")
+    parser.add_argument("--registry", default=os.getenv("MODEL_REGISTRY_DIR", "models"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish = commands.add_parser("publish", help="Copy a trained model into the registry")
+    publish.add_argument("model_file")
+    publish.add_argument("--version")
+    publish.add_argument("--activate", action="store_true")
+    publish.add_argument("--lookup-table", action="store_true", help="Also compile a lookup table")
+
+    activate = commands.add_parser("activate", help="Make a published version current")
+    activate.add_argument("version")
+
+    commands.add_parser("list", help="List published versions")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.registry)
+    if args.command == "publish":
+        version = registry.publish(args.model_file, args.version, args.lookup_table)
+        print(f"✅ Published {args.model_file} as {version}")
+        if args.activate:
+            registry.activate(version)
+            print(f"✅ {version} is now current")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"✅ {args.version} is now current")
+    else:
+        current = registry.current()
+        for version in registry.versions():
+            print(f"{'*' if version == current else ' '} {version}")
+
+
+if __name__ == "__main__":
+    main()
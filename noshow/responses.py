@@ -0,0 +1,51 @@
+"""Fast JSON encoding for API responses.
+
+The list endpoints used to loop over every document converting `_id` to
+str and `timestamp` via isoformat(), then hand the dict to FastAPI, which
+ran it through jsonable_encoder (another full walk) before json.dumps.
+FastJSONResponse encodes raw Mongo documents in a single pass: orjson
+handles datetime natively (same ISO format as isoformat() for the naive
+UTC timestamps we store) and numpy scalars, and ObjectId falls through to
+str(). Documents are not mutated.
+
+orjson is optional; without it the stdlib json module is used with the
+same type handling.
+"""
+import json
+from datetime import datetime
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value):
+    """Encoder fallback for the BSON/numpy types that show up in responses"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # numpy scalar
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(content) -> bytes:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+else:
+    def dumps(content) -> bytes:
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that serializes Mongo documents directly (see module docstring)"""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,283 @@
+"""Hot window and monthly archives for the predictions collection.
+
+`predictions` only keeps the last PREDICTION_HOT_DAYS days. A mover (run
+on a schedule inside the API, or from cron) copies older documents into
+one collection per month, `predictions_archive_YYYY_MM`, and then deletes
+them from the hot collection. Archived documents are compacted to the
+analytic fields (ARCHIVE_FIELDS): the request echo stays, but the
+recommendation strings do not, and business_insights keeps only the
+figures the rollups sum. Copy-then-delete with upserts by _id makes an
+interrupted run safe to repeat.
+
+A plain TTL index is not used because it would delete documents without
+keeping anything. Statistics are unaffected: /predictions/stats reads
+the rollups (noshow.rollups), which already counted every prediction
+when it was saved, and `rollups rebuild` unions the archives.
+
+Reads route by time range. The list and export endpoints read the hot
+collection first and then continue into the archive months that overlap
+the requested range (and lie before the cursor), newest first. Detail
+lookups fall back to the archive month encoded in the ObjectId.
+
+For offline analytics the mover can write Parquet files instead
+(--parquet DIR, needs pyarrow). Those months are no longer served by the
+API.
+
+    python -m noshow.retention archive --hot-days 90
+    python -m noshow.retention archive --hot-days 90 --parquet ./archive
+    python -m noshow.retention status
+"""
+import argparse
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from noshow.indexes import index_models
+from noshow.pagination import after_cursor, decode_cursor, encode_cursor, fetch_page
+from noshow.projection import SLIM_FIELDS
+from noshow.rollups import MONEY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "predictions_archive_"
+
+# Top-level fields kept in archived documents (business_insights is trimmed to MONEY_FIELDS)
+ARCHIVE_FIELDS = SLIM_FIELDS + (
+    "is_repeated_guest", "previous_cancellations", "special_requests_count", "visit_month",
+    "model_version", "search_terms"
+)
+
+
+def month_start(timestamp: datetime) -> datetime:
+    return datetime(timestamp.year, timestamp.month, 1)
+
+
+def next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def archive_name(month: datetime) -> str:
+    return f"{ARCHIVE_PREFIX}{month.year:04d}_{month.month:02d}"
+
+
+def archive_month(name: str):
+    """Month start for an archive collection name, None for any other collection"""
+    match = re.fullmatch(rf"{ARCHIVE_PREFIX}(\d{{4}})_(\d{{2}})", name)
+    return datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def compact(doc: dict) -> dict:
+    """Archived form of a stored prediction"""
+    archived = {"_id": doc["_id"]}
+    for name in ARCHIVE_FIELDS:
+        if name in doc:
+            archived[name] = doc[name]
+    insights = doc.get("business_insights") or {}
+    kept = defaultdict(dict)
+    for section, key in MONEY_FIELDS.values():
+        value = (insights.get(section) or {}).get(key)
+        if value is not None:
+            kept[section][key] = value
+    if kept:
+        archived["business_insights"] = dict(kept)
+    return archived
+
+
+class Archive:
+    """Which archive months exist, and the collections a time range routes to"""
+
+    def __init__(self, refresh_seconds: float = 60):
+        self.refresh_seconds = refresh_seconds
+        self.months = []  # newest first
+        self.last_run = None
+        self._refreshed_at = None
+
+    async def refresh(self, db, force: bool = False):
+        """Re-list archive collections (Motor database) at most every refresh_seconds"""
+        if not force and self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        names = await db.list_collection_names(filter={"name": {"$regex": f"^{ARCHIVE_PREFIX}"}})
+        self.months = sorted(filter(None, map(archive_month, names)), reverse=True)
+        self._refreshed_at = time.monotonic()
+
+    def collections(self, db, start: datetime = None, end: datetime = None, cursor: str = None):
+        """Archive collections that can hold documents in [start, end) sorting after `cursor`, newest first"""
+        if cursor:
+            position = decode_cursor(cursor)[0]
+            if isinstance(position, datetime):
+                end = min(end, position + timedelta(microseconds=1)) if end else position + timedelta(microseconds=1)
+        return [
+            db[archive_name(month)] for month in self.months
+            if (end is None or month < end) and (start is None or next_month(month) > start)
+        ]
+
+    def collections_for_id(self, db, object_id):
+        """Archive collections that may hold the document with this ObjectId"""
+        created = month_start(object_id.generation_time.replace(tzinfo=None))
+        # The timestamp is taken just before the insert, so it can fall in the previous month
+        candidates = (created, month_start(created - timedelta(days=1)))
+        return [db[archive_name(month)] for month in candidates if month in self.months]
+
+    def stats(self) -> dict:
+        return {
+            "archive_months": [month.strftime("%Y-%m") for month in self.months],
+            "last_run": self.last_run
+        }
+
+
+def time_range(query: dict, start: datetime = None, end: datetime = None) -> dict:
+    """`query` restricted to timestamps in [start, end)"""
+    if not start and not end:
+        return query
+    window = {}
+    if start:
+        window["$gte"] = start
+    if end:
+        window["$lt"] = end
+    return {"$and": [query, {"timestamp": window}]} if query else {"timestamp": window}
+
+
+async def fetch_history(hot, archives, query: dict, limit: int, skip: int = 0, cursor: str = None,
+                        projection: dict = None):
+    """fetch_page over the hot collection, continued into `archives` (newest first) when it runs out.
+
+    Hot documents are all newer than archived ones, so the concatenation is
+    still sorted and the usual cursor works across collections.
+    """
+    docs, next_cursor = await fetch_page(hot, query, limit, skip, cursor, projection)
+    if next_cursor or not archives:
+        return docs, next_cursor
+
+    position = encode_cursor(docs[-1]) if docs else cursor
+    skip = 0 if position else skip
+    previous = hot
+    for collection in archives:
+        if len(docs) == limit:
+            # Page already full: only need to know whether anything older exists
+            if await collection.find_one(after_cursor(query, position), {"_id": 1}):
+                return docs, position
+            continue
+        if skip:
+            # Offset paging past the end of the newer collections
+            skip = max(0, skip - await previous.count_documents(query))
+        page, next_cursor = await fetch_page(collection, query, limit - len(docs), skip, position, projection)
+        docs += page
+        if next_cursor:
+            return docs, next_cursor
+        if docs:
+            position, skip = encode_cursor(docs[-1]), 0
+        previous = collection
+    return docs, None
+
+
+async def count_history(count_cache, hot, archives, query: dict) -> int:
+    """Total over the hot collection and the routed archives"""
+    total = await count_cache.count(hot, query)
+    for collection in archives:
+        total += await count_cache.count(collection, query)
+    return total
+
+
+async def find_prediction(db, archive: Archive, object_id, projection: dict = None):
+    """A prediction by _id from the hot collection or its archive month"""
+    doc = await db.predictions.find_one({"_id": object_id}, projection)
+    if doc is None:
+        await archive.refresh(db)
+        for collection in archive.collections_for_id(db, object_id):
+            doc = await collection.find_one({"_id": object_id}, projection)
+            if doc is not None:
+                break
+    return doc
+
+
+def _write_parquet(directory: str, month: datetime, docs):
+    import pandas as pd
+    frame = pd.json_normalize(docs)
+    frame["_id"] = frame["_id"].astype(str)
+    folder = os.path.join(directory, month.strftime("%Y-%m"))
+    os.makedirs(folder, exist_ok=True)
+    # Named after the first _id so a repeated batch overwrites its own file
+    frame.to_parquet(os.path.join(folder, f"part-{docs[0]['_id']}.parquet"), index=False)
+
+
+async def archive_older_than(db, cutoff: datetime, batch_size: int = 1000, parquet_dir: str = None) -> dict:
+    """Move predictions older than `cutoff` out of the hot collection (Motor database).
+
+    Returns {"YYYY-MM": documents moved}.
+    """
+    from pymongo import ReplaceOne
+    moved = defaultdict(int)
+    indexed = set()
+    while True:
+        docs = await db.predictions.find({"timestamp": {"$lt": cutoff}}).sort("timestamp", 1).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            break
+        by_month = defaultdict(list)
+        for doc in docs:
+            by_month[month_start(doc["timestamp"])].append(compact(doc))
+        for month, archived in by_month.items():
+            if parquet_dir:
+                _write_parquet(parquet_dir, month, archived)
+            else:
+                collection = db[archive_name(month)]
+                if month not in indexed:
+                    await collection.create_indexes(index_models())
+                    indexed.add(month)
+                await collection.bulk_write([ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in archived], ordered=False)
+            moved[month.strftime("%Y-%m")] += len(archived)
+        await db.predictions.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+    return dict(moved)
+
+
+async def run_archiver(get_db, archive: Archive, hot_days: int, every_minutes: float):
+    """Background task: archive everything older than the hot window every `every_minutes`"""
+    while True:
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=hot_days)
+            moved = await archive_older_than(get_db(), cutoff)
+            archive.last_run = {"at": datetime.utcnow().isoformat(), "cutoff": cutoff.isoformat(), "moved": moved}
+            if moved:
+                logger.info(f"🗄️ Archived {sum(moved.values()):,} predictions older than {cutoff:%Y-%m-%d}")
+            await archive.refresh(get_db(), force=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Archiving failed: {e}")
+        await asyncio.sleep(every_minutes * 60)
+
+
+async def status(db):
+    print(f"{'predictions':<30} {await db.predictions.estimated_document_count():>12,}")
+    names = await db.list_collection_names(filter={"name": {"$regex": f"^{ARCHIVE_PREFIX}"}})
+    for name in sorted(names, reverse=True):
+        print(f"{name:<30} {await db[name].estimated_document_count():>12,}")
+
+
+def main():
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Move old predictions into monthly archives")
+    parser.add_argument("command", choices=("archive", "status"))
+    parser.add_argument("--hot-days", type=int, default=int(os.getenv("PREDICTION_HOT_DAYS", "90")))
+    parser.add_argument("--parquet", metavar="DIR", help="write Parquet files instead of archive collections")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="restaurant_db")
+    args = parser.parse_args()
+
+    db = AsyncIOMotorClient(args.mongo_uri)[args.db]
+    if args.command == "status":
+        asyncio.run(status(db))
+        return
+    cutoff = datetime.utcnow() - timedelta(days=args.hot_days)
+    moved = asyncio.run(archive_older_than(db, cutoff, args.batch_size, args.parquet))
+    for month, count in sorted(moved.items()):
+        print(f"{month}: {count:,}")
+    print(f"✅ Archived {sum(moved.values()):,} predictions older than {cutoff:%Y-%m-%d}")
+
+
+if __name__ == "__main__":
+    main()
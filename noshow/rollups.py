@@ -0,0 +1,243 @@
+"""Materialized per-day and per-month prediction statistics.
+
+The dashboard used to compute its figures in the browser from whatever page
+of predictions it had downloaded. Instead every saved prediction now bumps
+two documents in `prediction_rollups`, one for its day and one for its
+month:
+
+    {"_id": "day:2025-07-14", "period": "day", "start": <datetime>,
+     "count": 42, "probability_sum": 17.3,
+     "risk": {"Low": 20, "Moderate": 15, "Critical": 7},
+     "potential_revenue": 3780.0, "potential_loss": 1540.2,
+     "total_savings": 274.1, "net_impact": 2513.9}
+
+/predictions/stats adds up a handful of these documents, however many
+predictions they summarize. The rollups can be rebuilt from the raw
+collection, e.g. after a backfill or if writes were lost, with an
+aggregation pipeline over the predictions collection and its monthly
+archives (noshow.retention):
+
+    python -m noshow.rollups rebuild
+
+Predictions saved before the rollups existed are only counted after that
+rebuild, which leaves a marker document behind. Until the marker exists,
+/predictions/stats runs the same aggregation over the raw collections
+instead (aggregate_stats). A database without any history gets the marker
+straight away, since there is nothing to rebuild.
+"""
+import argparse
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from noshow.search import RISK_LEVELS
+
+ROLLUP_COLLECTION = "prediction_rollups"
+PERIODS = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+
+# _id of the document rebuild() leaves once the rollups cover all existing history
+REBUILT_MARKER = "rebuilt"
+
+# Summed business_insights figures: rollup field -> path in the prediction document
+MONEY_FIELDS = {
+    "potential_revenue": ("revenue_impact", "potential_revenue"),
+    "potential_loss": ("revenue_impact", "potential_loss"),
+    "total_savings": ("cost_optimization", "total_savings"),
+    "net_impact": ("financial_summary", "net_impact"),
+}
+
+
+def period_start(timestamp: datetime, period: str) -> datetime:
+    if period == "month":
+        return datetime(timestamp.year, timestamp.month, 1)
+    return datetime(timestamp.year, timestamp.month, timestamp.day)
+
+
+def next_period_start(timestamp: datetime, period: str) -> datetime:
+    start = period_start(timestamp, period)
+    if period == "month":
+        return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def increments(docs):
+    """{rollup _id: (period, start, $inc fields)} for a batch of saved predictions"""
+    totals = {}
+    for doc in docs:
+        timestamp = doc.get("timestamp")
+        if not isinstance(timestamp, datetime):
+            continue
+        insights = doc.get("business_insights") or {}
+        for period, fmt in PERIODS.items():
+            rollup_id = f"{period}:{timestamp.strftime(fmt)}"
+            if rollup_id not in totals:
+                totals[rollup_id] = (period, period_start(timestamp, period), defaultdict(int))
+            inc = totals[rollup_id][2]
+            inc["count"] += 1
+            inc["probability_sum"] += doc.get("prediction_prob", 0.0)
+            if doc.get("risk_level") in RISK_LEVELS:
+                inc[f"risk.{doc['risk_level']}"] += 1
+            for field, (section, key) in MONEY_FIELDS.items():
+                inc[field] += (insights.get(section) or {}).get(key, 0.0) or 0.0
+    return totals
+
+
+async def record(collection, docs):
+    """Fold saved prediction documents into the rollups (Motor collection, one round trip)"""
+    from pymongo import UpdateOne
+    totals = increments(docs)
+    if not totals:
+        return
+    await collection.bulk_write([
+        UpdateOne(
+            {"_id": rollup_id},
+            {"$inc": dict(inc), "$setOnInsert": {"period": period, "start": start}},
+            upsert=True
+        )
+        for rollup_id, (period, start, inc) in totals.items()
+    ], ordered=False)
+
+
+async def read_stats(collection, period: str = "month", start: datetime = None, end: datetime = None) -> dict:
+    """Totals over the rollups of `period` whose start falls in [start, end)"""
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}', expected one of {tuple(PERIODS)}")
+    query = {"period": period}
+    if start or end:
+        query["start"] = {}
+        if start:
+            query["start"]["$gte"] = period_start(start, period)
+        if end:
+            query["start"]["$lt"] = end
+
+    rows = await collection.find(query).sort("start", 1).to_list(length=None)
+    return summarize(rows)
+
+
+def summarize(rows) -> dict:
+    """Totals and per-period figures of rollup documents (sorted by start)"""
+    count = sum(row.get("count", 0) for row in rows)
+    probability_sum = sum(row.get("probability_sum", 0.0) for row in rows)
+    risk = {level: sum(int(row.get("risk", {}).get(level, 0)) for row in rows) for level in RISK_LEVELS}
+    money = {field: round(sum(row.get(field, 0.0) for row in rows), 2) for field in MONEY_FIELDS}
+
+    return {
+        "total_predictions": count,
+        "average_probability": round(probability_sum / count, 4) if count else None,
+        "risk_distribution": risk,
+        "business_totals": money,
+        "periods": [
+            {
+                "period": row["_id"].split(":", 1)[1],
+                "count": row.get("count", 0),
+                "average_probability": round(row["probability_sum"] / row["count"], 4) if row.get("count") else None,
+                "risk_distribution": {level: int(row.get("risk", {}).get(level, 0)) for level in RISK_LEVELS},
+                **{field: round(row.get(field, 0.0), 2) for field in MONEY_FIELDS}
+            }
+            for row in rows
+        ]
+    }
+
+
+def rollup_pipeline(period: str, archives=(), match: dict = None):
+    """Aggregation that computes the `period` rollup documents from the predictions
+    collection plus the named archive collections"""
+    match = {"timestamp": {"$type": "date", **(match or {})}}
+    unit = "month" if period == "month" else "day"
+    group = {
+        "_id": {"$dateTrunc": {"date": "$timestamp", "unit": unit}},
+        "count": {"$sum": 1},
+        "probability_sum": {"$sum": "$prediction_prob"},
+    }
+    for level in RISK_LEVELS:
+        group[level] = {"$sum": {"$cond": [{"$eq": ["$risk_level", level]}, 1, 0]}}
+    for field, (section, key) in MONEY_FIELDS.items():
+        group[field] = {"$sum": f"$business_insights.{section}.{key}"}
+
+    return [{"$match": match}] + [{"$unionWith": {"coll": name, "pipeline": [{"$match": match}]}} for name in archives] + [
+        {"$group": group},
+        {"$project": {
+            "_id": {"$concat": [f"{period}:", {"$dateToString": {"date": "$_id", "format": PERIODS[period]}}]},
+            "period": period,
+            "start": "$_id",
+            "count": 1,
+            "probability_sum": 1,
+            "risk": {level: f"${level}" for level in RISK_LEVELS},
+            **{field: 1 for field in MONEY_FIELDS}
+        }}
+    ]
+
+
+def rebuild_pipeline(period: str, archives=()):
+    """Aggregation that recomputes every `period` rollup into ROLLUP_COLLECTION"""
+    return rollup_pipeline(period, archives) + [
+        {"$merge": {"into": ROLLUP_COLLECTION, "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ]
+
+
+async def aggregate_stats(collection, archives=(), period: str = "month", start: datetime = None,
+                          end: datetime = None) -> dict:
+    """read_stats() figures computed from the raw predictions (Motor collection) and the
+    named archives, for before the rollups are rebuilt. Covers the same whole periods."""
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}', expected one of {tuple(PERIODS)}")
+    match = {}
+    if start:
+        match["$gte"] = period_start(start, period)
+    if end:
+        # read_stats includes every period that starts before `end`
+        match["$lt"] = end if period_start(end, period) == end else next_period_start(end, period)
+    pipeline = rollup_pipeline(period, archives, match) + [{"$sort": {"start": 1}}]
+    rows = await collection.aggregate(pipeline, allowDiskUse=True).to_list(length=None)
+    return summarize(rows)
+
+
+async def rollups_rebuilt(db) -> bool:
+    """Whether the rollups cover all existing history (Motor database).
+
+    True once rebuild() has run, or when there is no history to rebuild yet;
+    then the marker is written so every later save is reflected in the rollups.
+    """
+    from noshow.retention import ARCHIVE_PREFIX
+    if await db[ROLLUP_COLLECTION].find_one({"_id": REBUILT_MARKER}) is not None:
+        return True
+    if await db.predictions.find_one({}, {"_id": 1}) is not None:
+        return False
+    if await db.list_collection_names(filter={"name": {"$regex": f"^{ARCHIVE_PREFIX}"}}):
+        return False
+    await db[ROLLUP_COLLECTION].update_one({"_id": REBUILT_MARKER}, marker_update(), upsert=True)
+    return True
+
+
+def marker_update() -> dict:
+    # period "marker" keeps it out of every read_stats query
+    return {"$set": {"period": "marker", "rebuilt_at": datetime.utcnow()}}
+
+
+def rebuild(db):
+    """Recompute all rollups from scratch (sync pymongo database); returns rollup counts per period"""
+    from noshow.retention import ARCHIVE_PREFIX
+    archives = db.list_collection_names(filter={"name": {"$regex": f"^{ARCHIVE_PREFIX}"}})
+    counts = {}
+    for period in PERIODS:
+        db[ROLLUP_COLLECTION].delete_many({"period": period})
+        db.predictions.aggregate(rebuild_pipeline(period, archives), allowDiskUse=True)
+        counts[period] = db[ROLLUP_COLLECTION].count_documents({"period": period})
+    db[ROLLUP_COLLECTION].update_one({"_id": REBUILT_MARKER}, marker_update(), upsert=True)
+    return counts
+
+
+def main():
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Rebuild the prediction statistics rollups")
+    parser.add_argument("command", choices=("rebuild",))
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="restaurant_db")
+    args = parser.parse_args()
+
+    counts = rebuild(MongoClient(args.mongo_uri)[args.db])
+    print(f"✅ Rebuilt {counts['day']:,} daily and {counts['month']:,} monthly rollups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Indexed search for the prediction history box.
+
+The old filter was an unanchored, case-insensitive `$regex` on
+customer_name and risk_level: no index can serve it, so every keystroke
+scanned the collection, and the raw input went straight into a regex.
+
+Each document now stores `search_terms`, the normalized customer name
+(lower-cased, accents and extra whitespace removed) plus each word suffix
+of it, so "John Smith" is findable as "jo" and as "smi". A search becomes a
+single-element index range ($elemMatch) on that multikey field - the input is only ever compared,
+never interpreted - and a term that names a risk level matches risk_level
+exactly.
+
+New predictions always store the field. Documents saved before it existed
+need a one-off backfill, after which the API can switch to the indexed
+search with SEARCH_MODE=prefix (the default, "regex", finds them either
+way):
+
+    python -m noshow.search backfill
+"""
+import argparse
+import os
+import re
+import unicodedata
+
+RISK_LEVELS = ("Low", "Moderate", "Critical")
+
+# Projection that keeps the helper field out of API responses
+HIDDEN_FIELDS = {"search_terms": 0}
+
+# The API defaults to "regex" (old full-scan behaviour, input escaped); "prefix" needs the backfill
+SEARCH_MODES = ("prefix", "regex")
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case, accent-free, single-spaced form of a name"""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def search_terms(name: str):
+    """Normalized name plus each later word onwards ("john smith" -> ["john smith", "smith"])"""
+    words = normalize_name(name).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+def search_query(search: str, mode: str = "prefix") -> dict:
+    """Mongo filter for the history search box ({} for an empty search)"""
+    term = normalize_name(search)
+    if not term:
+        return {}
+    if mode == "regex":
+        pattern = re.escape(search.strip())
+        return {"$or": [
+            {"customer_name": {"$regex": pattern, "$options": "i"}},
+            {"risk_level": {"$regex": pattern, "$options": "i"}}
+        ]}
+
+    # Prefix match as an index range: every string starting with `term` sorts in [term, term + U+10FFFF).
+    # $elemMatch makes one array element satisfy both bounds; a bare range on the
+    # multikey field lets "josé smith" meet $gte and "smith" meet $lt for "mod".
+    clauses = [{"search_terms": {"$elemMatch": {"$gte": term, "$lt": term + "\U0010ffff"}}}]
+    risk_levels = [level for level in RISK_LEVELS if level.lower() == term]
+    if risk_levels:
+        clauses.append({"risk_level": risk_levels[0]})
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def backfill(collection, batch_size: int = 1000) -> int:
+    """Add search_terms to documents that lack it (sync pymongo collection); returns the count"""
+    from pymongo import UpdateOne
+    updated = 0
+    pending = []
+    for doc in collection.find({"search_terms": {"$exists": False}}, {"customer_name": 1}):
+        pending.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search_terms": search_terms(doc.get("customer_name", ""))}}))
+        if len(pending) >= batch_size:
+            updated += collection.bulk_write(pending, ordered=False).modified_count
+            pending = []
+    if pending:
+        updated += collection.bulk_write(pending, ordered=False).modified_count
+    return updated
+
+
+def main():
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Maintain the search_terms field on stored predictions")
+    parser.add_argument("command", choices=("backfill",))
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="restaurant_db")
+    args = parser.parse_args()
+
+    collection = MongoClient(args.mongo_uri)[args.db].predictions
+    print(f"✅ Added search_terms to {backfill(collection):,} predictions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Pure NumPy evaluator for the saved XGBoost model (noshow_xgb.json).
+
+The JSON booster is flattened into one set of node arrays shared by all
+trees. Leaves point back at themselves, so walking every tree for every
+row is `max_depth` rounds of fancy indexing with no Python loop over
+trees or rows - cheap enough that a single-row request skips the DMatrix
+and libxgboost call overhead entirely.
+"""
+import json
+import numpy as np
+
+
+def _parse_base_score(value) -> float:
+    """base_score is saved as '5E-1' by older XGBoost and '[5E-1]' by 3.x"""
+    return float(str(value).strip("[]"))
+
+
+class TreeEnsemble:
+    """Flat-array form of a gbtree binary:logistic booster"""
+
+    def __init__(self, split_feature, threshold, left, right, default_left,
+                 leaf_value, roots, max_depth, base_margin, num_feature):
+        self.split_feature = split_feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.base_margin = base_margin
+        self.num_feature = num_feature
+        # Version of the JSON model this was compiled from (set by load())
+        self.source_version = None
+
+    @property
+    def num_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_json(cls, model: dict) -> "TreeEnsemble":
+        """Build the flat arrays from a parsed XGBoost JSON model"""
+        learner = model["learner"]
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"Unsupported objective for NumPy engine: {objective}")
+        booster = learner["gradient_booster"]
+        if booster["name"] != "gbtree":
+            raise ValueError(f"Unsupported booster for NumPy engine: {booster['name']}")
+
+        trees = booster["model"]["trees"]
+        sizes = [len(tree["left_children"]) for tree in trees]
+        total = sum(sizes)
+
+        # Index arrays are intp so np.take never has to convert them
+        split_feature = np.zeros(total, dtype=np.intp)
+        threshold = np.zeros(total, dtype=np.float32)
+        left = np.zeros(total, dtype=np.intp)
+        right = np.zeros(total, dtype=np.intp)
+        default_left = np.zeros(total, dtype=bool)
+        leaf_value = np.zeros(total, dtype=np.float32)
+        roots = np.zeros(len(trees), dtype=np.intp)
+
+        max_depth = 0
+        offset = 0
+        for index, (tree, size) in enumerate(zip(trees, sizes)):
+            if any(tree["split_type"]):
+                raise ValueError("Categorical splits are not supported by the NumPy engine")
+            nodes = slice(offset, offset + size)
+            tree_left = np.asarray(tree["left_children"], dtype=np.intp)
+            tree_right = np.asarray(tree["right_children"], dtype=np.intp)
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            is_leaf = tree_left == -1
+            own = np.arange(offset, offset + size, dtype=np.intp)
+
+            # Leaves loop back to themselves; their split_conditions hold the leaf weight
+            split_feature[nodes] = np.where(is_leaf, 0, tree["split_indices"])
+            threshold[nodes] = np.where(is_leaf, 0, conditions)
+            left[nodes] = np.where(is_leaf, own, tree_left + offset)
+            right[nodes] = np.where(is_leaf, own, tree_right + offset)
+            default_left[nodes] = np.asarray(tree["default_left"], dtype=bool)
+            leaf_value[nodes] = np.where(is_leaf, conditions, 0)
+            roots[index] = offset
+
+            max_depth = max(max_depth, _tree_depth(tree_left, tree_right))
+            offset += size
+
+        base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+        base_margin = float(np.log(base_score / (1 - base_score)))
+        num_feature = int(learner["learner_model_param"]["num_feature"])
+
+        return cls(split_feature, threshold, left, right, default_left,
+                   leaf_value, roots, max_depth, base_margin, num_feature)
+
+    @classmethod
+    def from_file(cls, path: str) -> "TreeEnsemble":
+        """Load from the XGBoost JSON model or a compiled .npz (see save)"""
+        if path.endswith(".npz"):
+            return cls.load(path)
+        with open(path, "r") as f:
+            return cls.from_json(json.load(f))
+
+    def save(self, path: str, source_version: str = None):
+        """Write the flat arrays to an .npz that loads without parsing JSON"""
+        np.savez(
+            path,
+            split_feature=self.split_feature, threshold=self.threshold,
+            left=self.left, right=self.right, default_left=self.default_left,
+            leaf_value=self.leaf_value, roots=self.roots,
+            scalars=np.array([self.max_depth, self.base_margin, self.num_feature], dtype=np.float64),
+            source_version=np.array(source_version or "")
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsemble":
+        with np.load(path) as data:
+            max_depth, base_margin, num_feature = data["scalars"]
+            ensemble = cls(
+                data["split_feature"], data["threshold"], data["left"], data["right"],
+                data["default_left"], data["leaf_value"], data["roots"],
+                int(max_depth), float(base_margin), int(num_feature)
+            )
+            ensemble.source_version = str(data["source_version"]) or None
+        return ensemble
+
+    def predict_margin(self, features: np.ndarray) -> np.ndarray:
+        """Raw log-odds for an (n, num_feature) float32 matrix"""
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        rows, columns = features.shape
+        flat = features.ravel()
+
+        # One (row, tree) cursor per element, walked with 1-D takes
+        row_offset = np.repeat(np.arange(rows, dtype=np.intp) * columns, self.num_trees)
+        node = np.tile(self.roots, rows)
+
+        for _ in range(self.max_depth):
+            value = flat.take(row_offset + self.split_feature.take(node))
+            go_left = value < self.threshold.take(node)
+            missing = np.isnan(value)
+            if missing.any():
+                go_left = np.where(missing, self.default_left.take(node), go_left)
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+
+        leaves = self.leaf_value.take(node).reshape(rows, self.num_trees)
+        return self.base_margin + leaves.sum(axis=1, dtype=np.float32)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """No-show probabilities, matching Booster.predict for binary:logistic"""
+        return (1.0 / (1.0 + np.exp(-self.predict_margin(features)))).astype(np.float32)
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Number of splits on the longest root-to-leaf path"""
+    deepest = 0
+    stack = [(0, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if left[node] == -1:
+            deepest = max(deepest, depth)
+        else:
+            stack.append((int(left[node]), depth + 1))
+            stack.append((int(right[node]), depth + 1))
+    return deepest
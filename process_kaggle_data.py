@@ -1,50 +1,162 @@
+import argparse
+import glob
+import os
+import time
 import pandas as pd
-import numpy as np
 
-def prepare_dataset():
-    # 1. Load Kaggle Dataset
-    # Expect the CSV to be in the same folder as this script
-    try:
-        df = pd.read_csv(r"C:\\Users\\vedul\\OneDrive\\Documents\\NoSQL PROJECT\\hotel_bookings.csv")
-    except FileNotFoundError:
-        print("Error: Please place 'hotel_bookings.csv' in this project folder.")
+# Only the raw columns the features need, with compact dtypes
+# (children has blanks in the Kaggle export, so it stays float)
+MONTHS = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+# Numeric columns are read as float32 so blank cells load as NaN; transform()
+# fills them with 0 (as the original fillna(0) did) before downcasting to INT_DTYPES
+RAW_DTYPES = {
+    'lead_time': 'float32',
+    'adults': 'float32',
+    'children': 'float32',
+    'is_repeated_guest': 'float32',
+    'previous_cancellations': 'float32',
+    'total_of_special_requests': 'float32',
+    'arrival_date_month': pd.CategoricalDtype(MONTHS),
+    'deposit_type': 'category',
+    'reservation_status': 'category',
+}
+
+INT_DTYPES = {
+    'lead_time': 'int32',
+    'party_size': 'int16',
+    'is_repeated_guest': 'int8',
+    'previous_cancellations': 'int16',
+    'total_of_special_requests': 'int8',
+}
+
+OUTPUT_COLUMNS = [
+    'lead_time',
+    'party_size',
+    'deposit_paid',
+    'is_repeated_guest',
+    'previous_cancellations',
+    'total_of_special_requests',
+    'arrival_date_month',
+    'target'
+]
+
+FORMATS = ('csv', 'parquet', 'feather')
+
+
+def transform(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Raw booking rows -> processed reservation rows (vectorized)"""
+    # Filter Target Scope: keep Check-Out and No-Show only
+    status = chunk['reservation_status']
+    chunk = chunk[status.isin(["Check-Out", "No-Show"])]
+
+    def count(values: pd.Series, column: str) -> pd.Series:
+        # Missing counts become 0, as the original fillna(0) did
+        return values.fillna(0).astype(INT_DTYPES[column])
+
+    return pd.DataFrame({
+        'lead_time': count(chunk['lead_time'], 'lead_time'),
+        # Handle missing children safely before adding
+        'party_size': count(chunk['adults'] + chunk['children'].fillna(0), 'party_size'),
+        # Deposit paid binary flag
+        'deposit_paid': (chunk['deposit_type'] != 'No Deposit').astype('int8'),
+        'is_repeated_guest': count(chunk['is_repeated_guest'], 'is_repeated_guest'),
+        'previous_cancellations': count(chunk['previous_cancellations'], 'previous_cancellations'),
+        'total_of_special_requests': count(chunk['total_of_special_requests'], 'total_of_special_requests'),
+        'arrival_date_month': chunk['arrival_date_month'],
+        # Target Variable (1 = No-Show, 0 = Show)
+        'target': (chunk['reservation_status'] == 'No-Show').astype('int8'),
+    }, columns=OUTPUT_COLUMNS)
+
+
+def read_chunks(paths, chunksize: int):
+    """Typed, column-pruned chunks from every input CSV in turn"""
+    for path in paths:
+        yield from pd.read_csv(path, usecols=list(RAW_DTYPES), dtype=RAW_DTYPES, chunksize=chunksize)
+
+
+class ChunkWriters:
+    """Appends processed chunks to one output file per format"""
+
+    def __init__(self, output: str, formats):
+        self.base = os.path.splitext(output)[0]
+        self.formats = formats
+        self.paths = {fmt: f"{self.base}.{fmt}" for fmt in formats}
+        self._arrow = {}
+        self._csv_started = False
+
+    def write(self, df: pd.DataFrame):
+        if 'csv' in self.formats:
+            df.to_csv(self.paths['csv'], mode='a' if self._csv_started else 'w', header=not self._csv_started, index=False)
+            self._csv_started = True
+        if 'parquet' in self.formats or 'feather' in self.formats:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if 'parquet' in self.formats:
+                self._arrow_writer('parquet', table.schema).write_table(table)
+            if 'feather' in self.formats:
+                self._arrow_writer('feather', table.schema).write_table(table)
+
+    def _arrow_writer(self, fmt: str, schema):
+        if fmt not in self._arrow:
+            import pyarrow.ipc
+            import pyarrow.parquet
+            if fmt == 'parquet':
+                self._arrow[fmt] = pyarrow.parquet.ParquetWriter(self.paths[fmt], schema, compression='zstd')
+            else:
+                # Feather v2 is the Arrow IPC file format, which can be written batch by batch
+                self._arrow[fmt] = pyarrow.ipc.new_file(self.paths[fmt], schema)
+        return self._arrow[fmt]
+
+    def close(self):
+        for writer in self._arrow.values():
+            writer.close()
+
+
+def prepare_dataset(inputs=("hotel_bookings.csv",), output="processed_reservations.csv", formats=("csv",),
+                    chunksize=1_000_000):
+    # 1. Load Kaggle Dataset(s): every matching export, streamed in typed chunks
+    paths = sorted({path for pattern in inputs for path in (glob.glob(pattern) or [pattern])})
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        print(f"Error: Please place {', '.join(repr(path) for path in missing)} in this project folder.")
         return
 
-    print(f"Raw data shape: {df.shape}")
-
-    # 2. Filter Target Scope: keep Check-Out and No-Show only
-    df = df[df['reservation_status'].isin(["Check-Out", "No-Show"])].copy()
-    
-    # 3. Create Target Variable (1 = No-Show, 0 = Show)
-    df['target'] = (df['reservation_status'] == 'No-Show').astype(int)
-    
-    # 4. Feature Engineering
-    # Handle missing children safely before adding
-    df['children'] = df['children'].fillna(0)
-    df['party_size'] = df['adults'] + df['children']
-
-    # Deposit paid binary flag
-    df['deposit_paid'] = df['deposit_type'].apply(
-        lambda x: 0 if x == 'No Deposit' else 1
-    )
-    
-    cols = [
-        'lead_time', 
-        'party_size', 
-        'deposit_paid', 
-        'is_repeated_guest', 
-        'previous_cancellations', 
-        'total_of_special_requests', 
-        'arrival_date_month', 
-        'target'
-    ]
-    
-    final_df = df[cols].fillna(0)
-    
-    # Save dataset in the same project folder
-    final_df.to_csv(r"C:\\Users\\vedul\\OneDrive\\Documents\\NoSQL PROJECT\\processed_reservations.csv", index=False)
-    print(f"✅ Saved 'processed_reservations.csv' with {len(final_df)} rows.")
-    print(f"📊 No-Show Rate: {final_df['target'].mean():.2%}")
+    start = time.perf_counter()
+    writers = ChunkWriters(output, formats)
+    raw_rows = rows = no_shows = 0
+    try:
+        for chunk in read_chunks(paths, chunksize):
+            raw_rows += len(chunk)
+            # 2-4. Filter, target and features, then append to every output
+            processed = transform(chunk)
+            writers.write(processed)
+            rows += len(processed)
+            no_shows += int(processed['target'].sum())
+    finally:
+        writers.close()
+
+    print(f"Raw rows: {raw_rows:,} from {len(paths)} file(s)")
+    for path in writers.paths.values():
+        print(f"✅ Saved '{path}' with {rows:,} rows.")
+    print(f"📊 No-Show Rate: {no_shows / rows if rows else 0:.2%}")
+    print(f"⏱️ {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build processed_reservations from Kaggle-style hotel booking exports")
+    parser.add_argument("inputs", nargs="*", default=["hotel_bookings.csv"],
+                        help="booking CSVs or glob patterns (default: hotel_bookings.csv)")
+    parser.add_argument("--output", default="processed_reservations.csv",
+                        help="output path; the extension is replaced per format")
+    parser.add_argument("--format", dest="formats", nargs="+", choices=FORMATS, default=["csv"],
+                        help="csv, parquet and/or feather (the last two need pyarrow)")
+    parser.add_argument("--chunksize", type=int, default=1_000_000, help="rows per chunk")
+    args = parser.parse_args()
+    prepare_dataset(args.inputs, args.output, args.formats, args.chunksize)
+
 
 if __name__ == "__main__":
-    prepare_dataset()
+    main()
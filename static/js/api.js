@@ -35,15 +35,32 @@ class API {
         });
     }
 
+    // Score a list of reservations in one request
+    static async makeBatchPrediction(reservations) {
+        return this.request('/predict/batch', {
+            method: 'POST',
+            body: JSON.stringify({ reservations })
+        });
+    }
+
     // Get recent predictions
-    static async getRecentPredictions(skip = 0, limit = 20) {
-        return this.request(`/predictions/recent?skip=${skip}&limit=${limit}`);
+    // Pass the previous page's next_cursor to continue where it ended
+    // includeCount=false skips the server-side total (has_more still works)
+    static async getRecentPredictions(skip = 0, limit = 20, cursor = null, includeCount = true) {
+        const position = cursor ? `cursor=${encodeURIComponent(cursor)}` : `skip=${skip}`;
+        return this.request(`/predictions/recent?${position}&limit=${limit}&include_count=${includeCount}`);
     }
 
     // Get all predictions with pagination
-    static async getAllPredictions(skip = 0, limit = 50, search = '') {
+    static async getAllPredictions(skip = 0, limit = 50, search = '', cursor = null) {
         const searchParam = search ? `&search=${encodeURIComponent(search)}` : '';
-        return this.request(`/predictions/all?skip=${skip}&limit=${limit}${searchParam}`);
+        const position = cursor ? `cursor=${encodeURIComponent(cursor)}` : `skip=${skip}`;
+        return this.request(`/predictions/all?${position}&limit=${limit}${searchParam}`);
+    }
+
+    // Aggregated statistics (served from server-side rollups)
+    static async getPredictionStats(period = 'month') {
+        return this.request(`/predictions/stats?period=${period}`);
     }
 
     // Get specific prediction
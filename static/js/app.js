@@ -4,6 +4,7 @@ let isLoading = false;
 let currentPage = 0; // This tracks pages, not skip count
 let hasMorePredictions = true;
 let loadedPredictionIds = new Set();
+let nextCursor = null; // Position of the next history page (from the API)
 let totalCount = 0; // Track actual total count from API
 
 // Global focus management system
@@ -42,6 +43,9 @@ async function initializeApp() {
     // Start animations
     startAnimations();
     
+    // Receive new predictions as they are saved
+    subscribeToPredictionStream();
+    
     console.log('✅ App initialized successfully!');
 }
 
@@ -222,7 +226,9 @@ async function makePrediction(data) {
         // Show result card immediately
         resultCard.style.display = 'block';
         
-        // Refresh history and stats
+        // Refresh history and stats. Always reload history: behind a load balancer or on
+        // serverless the stream may be held by another instance than the one that served
+        // /predict, so its event never arrives; duplicates are dropped by _id either way.
         setTimeout(async () => {
             await Promise.all([
                 loadPredictionHistory(),
@@ -361,6 +367,7 @@ async function loadPredictionHistory(reset = true) {
             currentPage = 0;
             currentPredictions = [];
             loadedPredictionIds.clear();
+            nextCursor = null;
             hasMorePredictions = true;
             historyGrid.innerHTML = '';
         }
@@ -372,7 +379,8 @@ async function loadPredictionHistory(reset = true) {
             skipCount, 
             currentPredictionsLength: currentPredictions.length 
         });
-        const response = await API.getRecentPredictions(skipCount, 6);
+        // Only the first page needs the total; later pages rely on has_more
+        const response = await API.getRecentPredictions(skipCount, 6, reset ? null : nextCursor, reset);
         console.log('API response:', response);
         
         if (!response.success) {
@@ -382,7 +390,9 @@ async function loadPredictionHistory(reset = true) {
         const newPredictions = response.data || [];
         
         // Update total count from API
-        totalCount = response.total_count || 0;
+        if (response.total_count != null) {
+            totalCount = response.total_count;
+        }
         console.log('Total count from API:', totalCount, 'Has more:', response.has_more);
         
         // Filter out duplicates
@@ -398,6 +408,7 @@ async function loadPredictionHistory(reset = true) {
         
         currentPredictions.push(...uniquePredictions);
         hasMorePredictions = response.has_more;
+        nextCursor = response.next_cursor || null;
         
         console.log('After adding predictions:', {
             currentCount: currentPredictions.length,
@@ -468,7 +479,7 @@ function updateSimpleLoadMoreButton() {
         loadMoreContainer.remove();
     }
     
-    if (currentPredictions.length > 0 && currentPredictions.length < totalCount) {
+    if (currentPredictions.length > 0 && hasMorePredictions) {
         loadMoreContainer = document.createElement('div');
         loadMoreContainer.className = 'load-more-container';
         
@@ -501,6 +512,7 @@ function showLessPredictions() {
     // Reset pagination state to show more predictions are available
     currentPage = 1;
     hasMorePredictions = totalCount > 6; // Only set true if there are actually more predictions
+    nextCursor = null; // The old cursor points past the dropped rows; resume by offset
     console.log('Reset state - totalCount:', totalCount, 'hasMorePredictions:', hasMorePredictions);
     
     // Update loaded IDs to only include the first 6
@@ -520,7 +532,7 @@ function showLessPredictions() {
 }
 
 // Render predictions with consistent formatting
-function renderPredictions(predictions, reset = false) {
+function renderPredictions(predictions, reset = false, prepend = false) {
     const historyGrid = document.getElementById('historyGrid');
     
     const historyHTML = predictions.map(prediction => {
@@ -558,10 +570,49 @@ function renderPredictions(predictions, reset = false) {
     if (reset) {
         historyGrid.innerHTML = historyHTML;
     } else {
-        historyGrid.insertAdjacentHTML('beforeend', historyHTML);
+        historyGrid.insertAdjacentHTML(prepend ? 'afterbegin' : 'beforeend', historyHTML);
     }
 }
 
+// Live updates: new predictions arrive over Server-Sent Events instead of polling
+let predictionStream = null;
+
+function subscribeToPredictionStream() {
+    if (!window.EventSource) {
+        return;
+    }
+    
+    predictionStream = new EventSource(`${API_BASE}/predictions/stream`);
+    
+    predictionStream.addEventListener('prediction', (event) => {
+        const prediction = JSON.parse(event.data);
+        if (loadedPredictionIds.has(prediction._id)) {
+            return;
+        }
+        loadedPredictionIds.add(prediction._id);
+        
+        const wasEmpty = currentPredictions.length === 0;
+        currentPredictions.unshift(prediction);
+        totalCount += 1;
+        renderPredictions([prediction], wasEmpty, true);
+        updatePredictionCount();
+    });
+    
+    // EventSource reconnects by itself and sends its Last-Event-ID; the server replays what
+    // was missed and only sends "resync" when it no longer can
+    predictionStream.addEventListener('resync', () => {
+        loadPredictionHistory(true);
+    });
+    
+    predictionStream.onerror = () => {
+        if (predictionStream.readyState === EventSource.CLOSED) {
+            // Stream disabled (PREDICTION_EVENTS=off, the serverless default): history
+            // refreshes after each prediction instead
+            predictionStream = null;
+        }
+    };
+}
+
 // Debounce function to prevent rapid clicking
 let lastLoadMoreTime = 0;
 const LOAD_MORE_DEBOUNCE = 1000; // 1 second debounce
@@ -570,8 +621,8 @@ const LOAD_MORE_DEBOUNCE = 1000; // 1 second debounce
 async function loadMorePredictions() {
     console.log('Loading more predictions...');
     
-    // Simple check - if we have less than total, load more
-    if (currentPredictions.length >= totalCount) {
+    // Simple check - stop once the API says there is nothing left
+    if (!hasMorePredictions) {
         console.log('All predictions already loaded');
         return;
     }
@@ -586,9 +637,14 @@ async function loadMorePredictions() {
     
     try {
         const skipCount = currentPredictions.length;
-        console.log('Loading from skip:', skipCount);
+        console.log('Loading from skip:', skipCount, 'cursor:', nextCursor);
         
-        const response = await API.getRecentPredictions(skipCount, 6);
+        const response = await API.getRecentPredictions(skipCount, 6, nextCursor, false);
+        
+        if (response.success) {
+            nextCursor = response.next_cursor || null;
+            hasMorePredictions = response.has_more;
+        }
         
         if (response.success && response.data && response.data.length > 0) {
             const newPredictions = response.data.filter(prediction => {
@@ -618,39 +674,36 @@ async function loadMorePredictions() {
 // Update statistics
 async function updateStats() {
     try {
-        const response = await API.getRecentPredictions();
-        const predictions = response.data || [];
+        const stats = await API.getPredictionStats();
         
         // Update total predictions
         const totalElement = document.getElementById('totalPredictions');
         if (totalElement) {
-            animateCounter(totalElement, predictions.length);
+            animateCounter(totalElement, stats.total_predictions || 0);
         }
         
         // Update MongoDB stats
-        updateMongoStats(predictions);
+        updateMongoStats(stats);
         
     } catch (error) {
         console.error('Failed to update stats:', error);
     }
 }
 
-function updateMongoStats(predictions) {
+function updateMongoStats(stats) {
     const totalDocs = document.getElementById('totalDocuments');
     const avgRisk = document.getElementById('avgRisk');
     const highRiskCount = document.getElementById('highRiskCount');
     
-    if (predictions.length > 0) {
+    if (stats.total_predictions > 0) {
         // Total documents
-        if (totalDocs) totalDocs.textContent = predictions.length;
+        if (totalDocs) totalDocs.textContent = stats.total_predictions;
         
         // Average risk
-        const avgProbability = predictions.reduce((sum, p) => sum + p.prediction_prob, 0) / predictions.length;
-        if (avgRisk) avgRisk.textContent = `${Math.round(avgProbability * 100)}%`;
+        if (avgRisk) avgRisk.textContent = `${Math.round(stats.average_probability * 100)}%`;
         
         // High risk count
-        const highRisk = predictions.filter(p => p.risk_level === 'Critical').length;
-        if (highRiskCount) highRiskCount.textContent = highRisk;
+        if (highRiskCount) highRiskCount.textContent = stats.risk_distribution.Critical;
     }
 }
 
@@ -0,0 +1,58 @@
+"""Reconnecting stream clients get missed events replayed, and a resync only on a real gap."""
+import asyncio
+from noshow.broadcast import Broadcaster, sse_message
+
+
+def drain(subscription):
+    return [subscription.buffer.popleft() for _ in range(len(subscription.buffer))]
+
+
+def test_events_carry_sequential_ids():
+    broadcaster = Broadcaster(buffer_size=10)
+    subscription = broadcaster.subscribe()
+    first = broadcaster.last_event_id
+    broadcaster.publish({"_id": "a"})
+    broadcaster.publish({"_id": "b"})
+    ids = [event_id for event_id, _ in drain(subscription)]
+    assert subscription.start_id == first and not subscription.gap
+    assert ids == [broadcaster.missed_since(first)[0][0], broadcaster.last_event_id]
+    assert len(set(ids + [first])) == 3
+
+
+def test_reconnect_replays_missed_events():
+    broadcaster = Broadcaster(buffer_size=10)
+    broadcaster.publish({"_id": "a"})
+    seen = broadcaster.last_event_id
+    broadcaster.publish({"_id": "b"})
+    broadcaster.publish({"_id": "c"})
+    subscription = broadcaster.subscribe(seen)
+    assert not subscription.gap and subscription.start_id == seen
+    assert [event["_id"] for _, event in drain(subscription)] == ["b", "c"]
+    assert broadcaster.resyncs == 0
+
+
+def test_reconnect_up_to_date_replays_nothing():
+    broadcaster = Broadcaster(buffer_size=10)
+    broadcaster.publish({"_id": "a"})
+    subscription = broadcaster.subscribe(broadcaster.last_event_id)
+    assert not subscription.gap and drain(subscription) == []
+
+
+def test_gap_when_events_are_gone_or_id_is_foreign():
+    broadcaster = Broadcaster(buffer_size=3)
+    seen = broadcaster.last_event_id
+    for name in "abcde":
+        broadcaster.publish({"_id": name})
+    assert broadcaster.subscribe(seen).gap
+    assert broadcaster.subscribe(Broadcaster().last_event_id).gap
+    assert broadcaster.subscribe("not-an-id").gap
+    assert broadcaster.resyncs == 3
+
+
+def test_subscription_get_returns_id_and_event():
+    broadcaster = Broadcaster()
+    subscription = broadcaster.subscribe()
+    broadcaster.publish({"_id": "a"})
+    event_id, event = asyncio.run(subscription.get(timeout=1))
+    assert event == {"_id": "a"}
+    assert sse_message(event, event_id=event_id).startswith(f"id: {event_id}\nevent: prediction\n")
@@ -0,0 +1,125 @@
+"""Parity of noshow.features with the DataFrame construction it replaced.
+
+The API used to build a pd.DataFrame per request (math.sin/cos for the
+month) and training mapped month names and used np.sin/cos on the
+DataFrame; XGBoost converted both to float32. The shared encoder must
+produce the same float32 bytes and therefore the same predictions.
+"""
+import math
+import os
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from noshow.features import FEATURE_COLUMNS, encode_frame, encode_reservation, encode_reservations
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "noshow_xgb.json")
+
+MONTH_NAMES = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+
+def reservations(rows: int = 500):
+    rng = np.random.default_rng(7)
+    return [
+        SimpleNamespace(
+            customer_name="guest",
+            party_size=int(rng.integers(1, 13)),
+            deposit_paid=int(rng.integers(0, 2)),
+            lead_time_days=int(rng.integers(0, 700)),
+            is_repeated_guest=int(rng.integers(0, 2)),
+            previous_cancellations=int(rng.integers(0, 10)),
+            special_requests_count=int(rng.integers(0, 6)),
+            visit_month=month
+        )
+        for month in [m % 12 + 1 for m in range(rows)]
+    ]
+
+
+def legacy_request_frame(requests) -> pd.DataFrame:
+    """The per-request DataFrame /predict and /predict/batch used to build"""
+    return pd.DataFrame([
+        [
+            request.lead_time_days,
+            request.party_size,
+            request.deposit_paid,
+            request.is_repeated_guest,
+            request.previous_cancellations,
+            request.special_requests_count,
+            math.sin(2 * math.pi * request.visit_month / 12),
+            math.cos(2 * math.pi * request.visit_month / 12)
+        ]
+        for request in requests
+    ], columns=FEATURE_COLUMNS)
+
+
+def legacy_training_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Feature engineering train_model.py used to do on processed_reservations.csv"""
+    df = df.copy()
+    month_map = {name: number for number, name in enumerate(MONTH_NAMES, start=1)}
+    df['month_num'] = df['arrival_date_month'].map(month_map).fillna(1)
+    df['month_sin'] = np.sin(2 * math.pi * df['month_num'] / 12)
+    df['month_cos'] = np.cos(2 * math.pi * df['month_num'] / 12)
+    return df[FEATURE_COLUMNS]
+
+
+def processed_frame(rows: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    months = np.asarray(MONTH_NAMES + ["Smarch", None], dtype=object)
+    return pd.DataFrame({
+        'lead_time': rng.integers(0, 700, rows),
+        'party_size': rng.integers(1, 13, rows),
+        'deposit_paid': rng.integers(0, 2, rows),
+        'is_repeated_guest': rng.integers(0, 2, rows),
+        'previous_cancellations': rng.integers(0, 10, rows),
+        'total_of_special_requests': rng.integers(0, 6, rows),
+        'arrival_date_month': months[np.arange(rows) % len(months)],
+        'target': rng.integers(0, 2, rows)
+    })
+
+
+def as_float32(frame: pd.DataFrame) -> np.ndarray:
+    return frame.to_numpy(dtype=np.float32)
+
+
+def test_encode_reservation_matches_dataframe():
+    for request in reservations(24):
+        expected = as_float32(legacy_request_frame([request]))
+        encoded = encode_reservation(request)
+        assert encoded.dtype == np.float32
+        assert encoded.tobytes() == expected.tobytes()
+
+
+def test_encode_reservations_matches_dataframe():
+    requests = reservations()
+    assert encode_reservations(requests).tobytes() == as_float32(legacy_request_frame(requests)).tobytes()
+
+
+def test_encode_frame_matches_training_features():
+    df = processed_frame()
+    assert encode_frame(df).tobytes() == as_float32(legacy_training_frame(df)).tobytes()
+
+
+def test_encode_frame_accepts_categorical_months():
+    df = processed_frame()
+    categorical = df.assign(arrival_date_month=pd.Categorical(df['arrival_date_month'], MONTH_NAMES))
+    assert encode_frame(categorical).tobytes() == encode_frame(df).tobytes()
+
+
+@pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="noshow_xgb.json not trained")
+def test_booster_predictions_match():
+    xgb = pytest.importorskip("xgboost")
+    booster = xgb.Booster()
+    booster.load_model(MODEL_PATH)
+
+    requests = reservations()
+    expected = booster.predict(xgb.DMatrix(legacy_request_frame(requests)))
+    encoded = booster.predict(xgb.DMatrix(encode_reservations(requests), feature_names=FEATURE_COLUMNS))
+    assert np.array_equal(encoded, expected)
+
+    df = processed_frame()
+    expected = booster.predict(xgb.DMatrix(legacy_training_frame(df)))
+    encoded = booster.predict(xgb.DMatrix(encode_frame(df), feature_names=FEATURE_COLUMNS))
+    assert np.array_equal(encoded, expected)
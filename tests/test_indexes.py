@@ -0,0 +1,89 @@
+"""Every endpoint query shape is served by an index, on predictions and on an archive.
+
+Needs a MongoDB server (MONGODB_TEST_URI, default mongodb://localhost:27017);
+skipped when none is reachable. Works in a throwaway database.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+
+from noshow.indexes import check_plans, endpoint_queries, index_models, plan_collections  # noqa: E402
+from noshow.retention import archive_name  # noqa: E402
+from noshow.search import search_query, search_terms  # noqa: E402
+
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI", "mongodb://localhost:27017")
+
+
+@pytest.fixture(scope="module")
+def db():
+    client = pymongo.MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError as e:
+        pytest.skip(f"No MongoDB at {MONGODB_TEST_URI}: {e}")
+    name = f"noshow_test_{uuid.uuid4().hex[:8]}"
+    database = client[name]
+    base = datetime(2025, 1, 1)
+    docs = [
+        {
+            "timestamp": base + timedelta(hours=i),
+            "customer_name": f"Guest {i}",
+            "search_terms": [f"guest {i}", str(i)],
+            "risk_level": ("Low", "Moderate", "Critical")[i % 3],
+        }
+        for i in range(200)
+    ]
+    docs += [
+        {
+            "timestamp": base + timedelta(hours=200 + i),
+            "customer_name": "José Smith",
+            "search_terms": search_terms("José Smith"),
+            "risk_level": "Low",
+        }
+        for i in range(40)
+    ]
+    for collection in (database.predictions, database[archive_name(base)]):
+        collection.create_indexes(index_models())
+        collection.insert_many([dict(doc) for doc in docs])
+    yield database
+    client.drop_database(name)
+    client.close()
+
+
+def test_archives_are_checked(db):
+    assert [collection.name for collection in plan_collections(db)] == ["predictions", archive_name(datetime(2025, 1, 1))]
+
+
+def test_no_endpoint_query_plans_a_collscan(db):
+    failures = [failure for collection in plan_collections(db) for failure in check_plans(collection)]
+    assert failures == []
+
+
+def test_endpoint_queries_cover_time_ranges():
+    labels = [label for label, _, _ in endpoint_queries()]
+    assert any("time range" in label for label in labels)
+    assert any(label.startswith("export:") for label in labels)
+
+
+def index_bounds(plan: dict):
+    """indexBounds of every IXSCAN in a winning plan tree"""
+    bounds = [plan["indexBounds"]] if plan.get("stage") == "IXSCAN" else []
+    for child in plan.get("inputStages", []) + ([plan["inputStage"]] if "inputStage" in plan else []):
+        bounds.extend(index_bounds(child))
+    return bounds
+
+
+@pytest.mark.parametrize("search, expected", [("jos", 40), ("smi", 40), ("josé smith", 40), ("mod", 0), ("zzz", 0)])
+def test_prefix_search_matches_one_term(db, search, expected):
+    # A bare range on the multikey field would let "josé smith" meet $gte and "smith" meet $lt
+    query = search_query(search)
+    assert db.predictions.count_documents({"$and": [query, {"customer_name": "José Smith"}]}) == expected
+
+
+def test_prefix_search_is_a_bounded_index_range(db):
+    plan = db.predictions.find(search_query("smith")).explain()["queryPlanner"]["winningPlan"]
+    bounds = index_bounds(plan.get("queryPlan", plan))
+    assert [b["search_terms"] for b in bounds] == [['["smith", "smith\U0010ffff")']]
@@ -0,0 +1,81 @@
+"""The NumPy tree engine and the lookup table agree with Booster.predict.
+
+Same checks as benchmarks/bench_inference.py (NumPy within 1e-5, lookup
+exact), on random rows plus the edges tree evaluation can get wrong: values
+on and one float32 step around every split threshold, missing values in
+each feature (default directions), and out-of-range inputs.
+"""
+import os
+import numpy as np
+import pytest
+from noshow.features import MONTH_TABLE, NUM_FEATURES, encode_columns
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "noshow_xgb.json")
+TOLERANCE = 1e-5
+
+pytestmark = pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="noshow_xgb.json not trained")
+
+
+@pytest.fixture(scope="module")
+def engines():
+    pytest.importorskip("xgboost")
+    from noshow.inference import BoosterEngine, NumpyEngine
+    return BoosterEngine.from_file(MODEL_PATH), NumpyEngine.from_file(MODEL_PATH)
+
+
+def random_rows(rows: int = 20000) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    return encode_columns(
+        rng.integers(0, 700, rows), rng.integers(1, 12, rows), rng.integers(0, 2, rows),
+        rng.integers(0, 2, rows), rng.integers(0, 10, rows), rng.integers(0, 6, rows),
+        rng.integers(1, 13, rows)
+    )
+
+
+def edge_rows(ensemble) -> np.ndarray:
+    base = random_rows(64)
+    rows = []
+    internal = ensemble.left != np.arange(len(ensemble.left))
+    for feature in range(NUM_FEATURES):
+        thresholds = np.unique(ensemble.threshold[internal & (ensemble.split_feature == feature)])
+        values = np.concatenate([
+            thresholds,
+            np.nextafter(thresholds, np.float32(-np.inf)),
+            np.nextafter(thresholds, np.float32(np.inf)),
+            [np.nan, -1.0, 0.0, 1e6, -1e6],
+        ]).astype(np.float32)
+        for value in values:
+            row = base[len(rows) % len(base)].copy()
+            row[feature] = value
+            rows.append(row)
+    # Every feature missing at once, and a month encoding that is not one of the 12
+    rows.append(np.full(NUM_FEATURES, np.nan, dtype=np.float32))
+    odd_month = base[0].copy()
+    odd_month[6:] = MONTH_TABLE[0] + 0.5
+    rows.append(odd_month)
+    return np.array(rows, dtype=np.float32)
+
+
+def test_numpy_engine_matches_booster(engines):
+    booster, compiled = engines
+    X = np.vstack([random_rows(), edge_rows(compiled.ensemble)])
+    error = np.abs(booster.predict(X) - compiled.predict(X))
+    assert compiled.predict(X).dtype == np.float32
+    assert float(error.max()) <= TOLERANCE, X[int(error.argmax())]
+
+
+def test_lookup_engine_is_exact(engines):
+    from noshow.inference import LookupEngine, model_version
+    from noshow.lookup import LookupTable
+    booster, compiled = engines
+    table = LookupTable.compile(compiled.ensemble, booster.predict, model_version(MODEL_PATH))
+
+    X = random_rows()
+    probabilities, found = table.lookup(X)
+    assert found.all()
+    assert np.array_equal(LookupEngine(table, compiled).predict(X), booster.predict(X))
+
+    # Rows the table can't answer (missing values, unknown months) go to the fallback
+    edges = edge_rows(compiled.ensemble)
+    assert np.array_equal(LookupEngine(table, booster).predict(edges), booster.predict(edges))
+    assert table.verify(booster.predict, rows=20000) > 20000
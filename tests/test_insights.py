@@ -0,0 +1,49 @@
+"""Vectorized business insights (insight_columns + insight_documents) match business_insights() row by row."""
+import json
+import numpy as np
+import pytest
+from noshow.insights import (
+    BusinessParams, business_insights, insight_columns, insight_document, insight_documents, load_params
+)
+
+
+def random_book(rows: int, params: BusinessParams, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    party_sizes = rng.integers(1, 21, rows)
+    # Probabilities come out of the model as float32
+    probabilities = rng.random(rows, dtype=np.float32).astype(np.float64)
+    thresholds = [params.high_risk_threshold, params.medium_risk_threshold, params.staff_savings_threshold,
+                  params.high_confidence_threshold, params.medium_confidence_threshold, 0.0, 1.0]
+    probabilities[:len(thresholds)] = thresholds
+    # Values whose scaled form sits on a .5 rounding tie
+    probabilities[len(thresholds):len(thresholds) + 4] = [0.125, 0.375, 0.0125, 0.5125]
+    return party_sizes, probabilities
+
+
+def assert_parity(party_sizes, probabilities, params=None):
+    documents = insight_documents(insight_columns(party_sizes, probabilities, params))
+    assert len(documents) == len(party_sizes)
+    for party_size, probability, document in zip(party_sizes.tolist(), probabilities.tolist(), documents):
+        expected = business_insights(party_size, probability, params)
+        # json.dumps also catches int/float differences (0 vs 0.0) that == ignores
+        assert document == expected and json.dumps(document) == json.dumps(expected), (party_size, probability)
+
+
+def test_default_params_match_scalar():
+    assert_parity(*random_book(20000, load_params()))
+
+
+@pytest.mark.parametrize("params", [
+    BusinessParams(avg_revenue_per_person=52.5, prep_cost_per_person=7.25, staff_cost_per_hour=18.5),
+    BusinessParams(high_risk_threshold=0.6, medium_risk_threshold=0.2, staff_savings_threshold=0.3),
+])
+def test_custom_params_match_scalar(params):
+    assert_parity(*random_book(5000, params, seed=7), params)
+
+
+def test_slices_and_single_documents():
+    party_sizes, probabilities = random_book(100, load_params())
+    columns = insight_columns(party_sizes, probabilities)
+    everything = insight_documents(columns)
+    assert insight_documents(columns, 10, 20) == everything[10:20]
+    assert insight_document(columns, 57) == everything[57]
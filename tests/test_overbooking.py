@@ -0,0 +1,81 @@
+"""No-show cover distributions (DP vs FFT product tree) and the overbooking choice.
+
+The DP and FFT pmfs must agree to 1e-12 and sum to 1 (the tolerance
+benchmarks/bench_overbooking.py uses), and on a service small enough to
+enumerate every show/no-show outcome, both the pmf and the expected-profit
+curve of optimize_overbooking() must match brute force.
+"""
+import itertools
+import numpy as np
+import pytest
+from noshow.insights import BusinessParams, load_params
+from noshow.overbooking import FFT_MIN_BOOKINGS, no_show_pmf, no_show_pmf_dp, no_show_pmf_fft, optimize_overbooking
+
+TOLERANCE = 1e-12
+
+
+def service(bookings: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    return rng.integers(1, 9, bookings), rng.beta(2, 8, bookings)
+
+
+def brute_force_pmf(sizes, probabilities) -> np.ndarray:
+    pmf = np.zeros(int(np.sum(sizes)) + 1)
+    for no_shows in itertools.product((False, True), repeat=len(sizes)):
+        chance = np.prod([p if missed else 1 - p for p, missed in zip(probabilities, no_shows)])
+        pmf[sum(size for size, missed in zip(sizes, no_shows) if missed)] += chance
+    return pmf
+
+
+def brute_force_profit(sizes, probabilities, capacity: int, params: BusinessParams) -> float:
+    margin = params.avg_revenue_per_person - params.prep_cost_per_person
+    booked = int(np.sum(sizes))
+    profit = 0.0
+    for no_show_covers, chance in enumerate(brute_force_pmf(sizes, probabilities)):
+        showing = booked - no_show_covers
+        profit += chance * (margin * min(showing, capacity) - params.denied_cost_per_person * max(showing - capacity, 0))
+    return profit
+
+
+@pytest.mark.parametrize("bookings", [1, 7, 40, FFT_MIN_BOOKINGS + 1, 3000])
+def test_dp_and_fft_agree(bookings):
+    sizes, probabilities = service(bookings)
+    dp = no_show_pmf_dp(sizes, probabilities)
+    fft = no_show_pmf_fft(sizes, probabilities)
+    assert len(dp) == len(fft) == sizes.sum() + 1
+    assert float(np.abs(dp - fft).max()) <= TOLERANCE
+    assert abs(dp.sum() - 1) <= TOLERANCE and abs(fft.sum() - 1) <= TOLERANCE
+    assert (fft >= 0).all()
+
+
+def test_certain_and_empty_services():
+    for method in ("dp", "fft"):
+        assert np.array_equal(no_show_pmf([], [], method), [1.0])
+        pmf = no_show_pmf([2, 3, 4], [0.0, 1.0, 0.0], method)
+        assert np.allclose(pmf, [0, 0, 0, 1, 0, 0, 0, 0, 0, 0], atol=TOLERANCE)
+
+
+@pytest.mark.parametrize("method", ["dp", "fft"])
+def test_pmf_matches_brute_force(method):
+    sizes, probabilities = service(10, seed=3)
+    assert np.allclose(no_show_pmf(sizes, probabilities, method), brute_force_pmf(sizes, probabilities),
+                       rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize("method", ["dp", "fft"])
+@pytest.mark.parametrize("capacity_share", [0.7, 0.9, 1.0])
+def test_optimize_matches_brute_force(capacity_share, method):
+    sizes, probabilities = service(8, seed=5)
+    params = load_params()
+    capacity = int(sizes.sum() * capacity_share)
+    extra_size, extra_probability, max_extra = 3, 0.3, 5
+    result = optimize_overbooking(sizes, probabilities, capacity, extra_size, extra_probability, max_extra, method, params)
+
+    profits = [
+        brute_force_profit(sizes.tolist() + [extra_size] * extra, probabilities.tolist() + [extra_probability] * extra,
+                           capacity, params)
+        for extra in range(max_extra + 1)
+    ]
+    assert [point["expected_profit"] for point in result["profit_curve"]] == pytest.approx(profits, abs=0.005)
+    assert result["recommended_extra_reservations"] == int(np.argmax(profits))
+    assert result["search_limit_reached"] == (int(np.argmax(profits)) == max_extra)
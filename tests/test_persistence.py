@@ -0,0 +1,83 @@
+"""Write-behind flushes: retries after a partial write count duplicate _ids as written."""
+import asyncio
+import pytest
+
+errors = pytest.importorskip("pymongo.errors")
+
+from noshow.persistence import WriteBehindQueue  # noqa: E402
+
+
+class FlakyCollection:
+    """Collection whose first insert_many writes `partial` documents, then loses the connection"""
+
+    def __init__(self, partial: int = 0, reject=()):
+        self.partial = partial
+        self.reject = set(reject)
+        self.stored = {}
+        self.calls = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.calls.append(ordered)
+        if len(self.calls) == 1 and self.partial:
+            for doc in docs[:self.partial]:
+                self.stored[doc["_id"]] = doc
+            raise errors.AutoReconnect("connection reset")
+        write_errors, inserted = [], 0
+        for index, doc in enumerate(docs):
+            if doc["_id"] in self.stored:
+                write_errors.append({"index": index, "code": 11000, "keyPattern": {"_id": 1}, "errmsg": "E11000"})
+            elif doc.get("name") in self.reject:
+                write_errors.append({"index": index, "code": 121, "errmsg": "Document failed validation"})
+            else:
+                self.stored[doc["_id"]] = doc
+                inserted += 1
+                continue
+            if ordered:
+                break
+        if write_errors:
+            raise errors.BulkWriteError({"nInserted": inserted, "writeErrors": write_errors})
+
+
+def flush(collection, docs):
+    flushed = []
+
+    async def on_flush(batch):
+        flushed.extend(doc["name"] for doc in batch)
+
+    async def main():
+        queue = WriteBehindQueue(lambda: collection, flush_ms=1, on_flush=on_flush)
+        await queue.start()
+        for doc in docs:
+            await queue.put(doc)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(main())
+    return queue, flushed
+
+
+def documents(count: int):
+    return [{"name": f"p{i}"} for i in range(count)]
+
+
+def test_retry_after_partial_write_counts_duplicates_as_written():
+    collection = FlakyCollection(partial=3)
+    queue, flushed = flush(collection, documents(5))
+    assert len(collection.stored) == 5
+    assert queue.written == 5 and queue.dropped == 0
+    assert sorted(flushed) == [f"p{i}" for i in range(5)]
+    assert collection.calls == [True, False]
+
+
+def test_retry_still_drops_real_write_errors():
+    collection = FlakyCollection(partial=2, reject={"p3"})
+    queue, flushed = flush(collection, documents(5))
+    assert queue.written == 4 and queue.dropped == 1
+    assert sorted(flushed) == ["p0", "p1", "p2", "p4"]
+
+
+def test_first_attempt_skips_bad_document_and_continues():
+    collection = FlakyCollection(reject={"p1"})
+    queue, flushed = flush(collection, documents(4))
+    assert queue.written == 3 and queue.dropped == 1
+    assert flushed == ["p0", "p2", "p3"]
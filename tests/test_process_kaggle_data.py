@@ -0,0 +1,33 @@
+"""process_kaggle_data.py on exports with blank cells: missing counts become 0 instead of failing the read."""
+import pandas as pd
+from process_kaggle_data import OUTPUT_COLUMNS, prepare_dataset, read_chunks, transform
+
+RAW_CSV = """hotel,lead_time,arrival_date_month,adults,children,is_repeated_guest,previous_cancellations,deposit_type,total_of_special_requests,reservation_status
+Resort,342,July,2,0,0,0,No Deposit,0,Check-Out
+Resort,,July,2,,0,0,Non Refund,1,No-Show
+City,7,,,1,,,No Deposit,,Check-Out
+City,13,August,1,0,1,2,No Deposit,3,Canceled
+City,100,August,2.0,1.0,0,1,Refundable,2,No-Show
+"""
+
+
+def test_blank_cells_become_zero(tmp_path):
+    path = tmp_path / "hotel_bookings.csv"
+    path.write_text(RAW_CSV)
+    processed = pd.concat(transform(chunk) for chunk in read_chunks([str(path)], chunksize=2))
+
+    assert list(processed.columns) == OUTPUT_COLUMNS
+    assert processed['lead_time'].tolist() == [342, 0, 7, 100]
+    assert processed['party_size'].tolist() == [2, 2, 0, 3]
+    assert processed['is_repeated_guest'].tolist() == [0, 0, 0, 0]
+    assert processed['total_of_special_requests'].tolist() == [0, 1, 0, 2]
+    assert processed['target'].tolist() == [0, 1, 0, 1]
+    assert str(processed['lead_time'].dtype) == 'int32' and str(processed['party_size'].dtype) == 'int16'
+
+
+def test_prepare_dataset_writes_csv(tmp_path):
+    path = tmp_path / "hotel_bookings.csv"
+    path.write_text(RAW_CSV)
+    output = tmp_path / "processed_reservations.csv"
+    prepare_dataset([str(path)], str(output))
+    assert len(pd.read_csv(output)) == 4
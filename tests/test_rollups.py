@@ -0,0 +1,78 @@
+"""Stats before a rollup rebuild (raw aggregation) match the rebuilt rollups.
+
+Needs a MongoDB server (MONGODB_TEST_URI, default mongodb://localhost:27017);
+skipped when none is reachable. Works in a throwaway database.
+"""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+motor_asyncio = pytest.importorskip("motor.motor_asyncio")
+
+from noshow.retention import archive_name  # noqa: E402
+from noshow.rollups import (  # noqa: E402
+    ROLLUP_COLLECTION, aggregate_stats, read_stats, rebuild, rollups_rebuilt
+)
+
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI", "mongodb://localhost:27017")
+
+
+@pytest.fixture(scope="module")
+def db_name():
+    client = pymongo.MongoClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError as e:
+        pytest.skip(f"No MongoDB at {MONGODB_TEST_URI}: {e}")
+    name = f"noshow_test_{uuid.uuid4().hex[:8]}"
+    yield name
+    client.drop_database(name)
+    client.drop_database(name + "_empty")
+    client.close()
+
+
+def run(db_name: str, work):
+    async def main():
+        client = motor_asyncio.AsyncIOMotorClient(MONGODB_TEST_URI)
+        try:
+            return await work(client[db_name])
+        finally:
+            client.close()
+    return asyncio.run(main())
+
+
+def prediction(timestamp: datetime, i: int) -> dict:
+    return {
+        "timestamp": timestamp,
+        "prediction_prob": (i % 10) / 10,
+        "risk_level": ("Low", "Moderate", "Critical")[i % 3],
+        "business_insights": {"revenue_impact": {"potential_revenue": 50.0 * (i % 4 + 1), "potential_loss": 5.0 * i}},
+    }
+
+
+def test_aggregation_matches_rebuilt_rollups(db_name):
+    database = pymongo.MongoClient(MONGODB_TEST_URI)[db_name]
+    base = datetime(2025, 1, 1)
+    database.predictions.insert_many([prediction(base + timedelta(days=40, hours=5 * i), i) for i in range(100)])
+    database[archive_name(base)].insert_many([prediction(base + timedelta(hours=7 * i), i) for i in range(50)])
+    ranges = [(None, None), (datetime(2025, 1, 15), datetime(2025, 2, 20)), (datetime(2025, 2, 3), None)]
+
+    assert not run(db_name, rollups_rebuilt)
+    archives = [archive_name(base)]
+    before = [run(db_name, lambda db: aggregate_stats(db.predictions, archives, period, start, end))
+              for period in ("day", "month") for start, end in ranges]
+    assert before[0]["total_predictions"] == 150
+
+    rebuild(database)
+    assert run(db_name, rollups_rebuilt)
+    after = [run(db_name, lambda db: read_stats(db[ROLLUP_COLLECTION], period, start, end))
+             for period in ("day", "month") for start, end in ranges]
+    assert before == after
+
+
+def test_empty_database_starts_rebuilt(db_name):
+    assert run(db_name + "_empty", rollups_rebuilt)
+    assert run(db_name + "_empty", lambda db: db[ROLLUP_COLLECTION].count_documents({"period": "marker"})) == 1
@@ -1,78 +1,166 @@
-import pandas as pd
+import argparse
+import glob
+import os
+import tempfile
 import numpy as np
 import xgboost as xgb
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, roc_auc_score
-import math
+from noshow.features import FEATURE_COLUMNS, encode_frame
+from noshow.featurestore import BUILD_CHUNK_ROWS, load_features, read_processed
+from noshow.inference import export_fast_artifacts
+
+MODES = ("memory", "external")
+
+PARAMS = {
+    "objective": "binary:logistic",
+    "eval_metric": "auc",
+    "tree_method": "hist",
+    "max_depth": 4,
+    "eta": 0.1,
+}
 
-def train_pipeline():
-    # 1. Load Data
-    try:
-        df = pd.read_csv("processed_reservations.csv")
-    except FileNotFoundError:
-        print("Error: Run process_kaggle_data.py first.")
-        return
-    
-    # 2. Feature Engineering: Cyclical Time
-    month_map = {
-        'January':1, 'February':2, 'March':3, 'April':4, 'May':5, 'June':6,
-        'July':7, 'August':8, 'September':9, 'October':10, 'November':11, 'December':12
-    }
-    df['month_num'] = df['arrival_date_month'].map(month_map).fillna(1)
-    
-    df['month_sin'] = np.sin(2 * math.pi * df['month_num'] / 12)
-    df['month_cos'] = np.cos(2 * math.pi * df['month_num'] / 12)
-    
-    feature_cols = [
-        'lead_time', 'party_size', 'deposit_paid', 
-        'is_repeated_guest', 'previous_cancellations', 
-        'total_of_special_requests', 'month_sin', 'month_cos'
-    ]
-    
-    X = df[feature_cols]
-    y = df['target']
-
-    # 3. Split Data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
 
-    # 4. Calculate Class Weight
-    ratio = float(np.sum(y == 0)) / np.sum(y == 1)
+class ReservationChunks(xgb.DataIter):
+    """One side of the train/test split, streamed from chunked processed files.
 
-    # 5. Wrap in DMatrix for Booster training
-    dtrain = xgb.DMatrix(X_train, label=y_train)
-    dtest = xgb.DMatrix(X_test, label=y_test)
+    Every chunk is split by a random mask seeded with (random_state, chunk
+    number), so the train and test iterators agree on each row and XGBoost
+    can page the data through its external-memory cache.
+    """
 
-    params = {
-        "objective": "binary:logistic",
-        "eval_metric": "auc",
-        "scale_pos_weight": ratio,
-        "max_depth": 4,
-        "eta": 0.1,
-    }
+    def __init__(self, paths, test: bool, test_size: float = 0.2, random_state: int = 42,
+                 chunk_rows: int = BUILD_CHUNK_ROWS, cache_prefix: str = None):
+        self.paths = paths
+        self.test = test
+        self.test_size = test_size
+        self.random_state = random_state
+        self.chunk_rows = chunk_rows
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
 
+    def reset(self):
+        self._chunks = None
+
+    def next(self, input_data) -> bool:
+        if self._chunks is None:
+            self._chunks = enumerate(
+                chunk for path in self.paths for chunk in read_processed(path, self.chunk_rows)
+            )
+        for number, chunk in self._chunks:
+            in_test = np.random.default_rng([self.random_state, number]).random(len(chunk)) < self.test_size
+            rows = chunk[in_test if self.test else ~in_test]
+            if len(rows):
+                input_data(data=encode_frame(rows), label=rows['target'].to_numpy(dtype=np.float32),
+                           feature_names=FEATURE_COLUMNS)
+                return True
+        return False
+
+
+def fit(dtrain, dtest, ratio: float, nthread: int, num_boost_round: int, early_stopping_rounds: int):
+    """Train on dtrain, stopping when the test AUC stops improving"""
+    params = {**PARAMS, "scale_pos_weight": ratio, "nthread": nthread}
     evals = [(dtrain, "train"), (dtest, "test")]
 
-    # 6. Train Booster model
     bst = xgb.train(
         params=params,
         dtrain=dtrain,
-        num_boost_round=100,
-        evals=evals
+        num_boost_round=num_boost_round,
+        evals=evals,
+        early_stopping_rounds=early_stopping_rounds or None
     )
+    if early_stopping_rounds and bst.best_iteration + 1 < bst.num_boosted_rounds():
+        # Keep only the best trees so the saved model and its fast artifacts match
+        print(f"⏹️ Early stopping: best test AUC at round {bst.best_iteration + 1}")
+        bst = bst[:bst.best_iteration + 1]
+    return bst
+
+
+def train_pipeline(inputs=("processed_reservations.csv",), mode: str = "memory", nthread: int = None,
+                   num_boost_round: int = 100, early_stopping_rounds: int = 10,
+                   chunk_rows: int = BUILD_CHUNK_ROWS):
+    nthread = nthread or os.cpu_count()
+    paths = sorted({path for pattern in inputs for path in (glob.glob(pattern) or [pattern])})
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {MODES}")
+    if mode == "memory" and len(paths) != 1:
+        print("Error: In-memory training reads one processed file; use --external for several.")
+        return
 
-    # 7. Evaluate
-    probs = bst.predict(dtest)
-    preds = (probs >= 0.5).astype(int)
+    # 1. Load Data
+    if not all(os.path.exists(path) for path in paths):
+        print("Error: Run process_kaggle_data.py first.")
+        return
+
+    with tempfile.TemporaryDirectory(prefix="noshow_xgb_cache_") as cache:
+        if mode == "memory":
+            # 2-3. Encoded features and the stratified split from the feature store
+            # (memory-mapped; rebuilt only when the processed file changes)
+            features = load_features(paths[0])
+            y = features.y
+
+            # 4. Quantized matrices: hist needs only the bin indices, not float copies
+            dtrain = xgb.QuantileDMatrix(features.X_train, label=features.y_train,
+                                         feature_names=FEATURE_COLUMNS, nthread=nthread)
+            dtest = xgb.QuantileDMatrix(features.X_test, label=features.y_test,
+                                        feature_names=FEATURE_COLUMNS, nthread=nthread, ref=dtrain)
+        else:
+            # 2-4. External memory: chunks are encoded and split on the fly, and the
+            # quantized pages are cached on disk instead of held in RAM
+            print(f"📂 Streaming {len(paths)} file(s) in {chunk_rows:,}-row chunks")
+            dtrain = xgb.ExtMemQuantileDMatrix(
+                ReservationChunks(paths, test=False, chunk_rows=chunk_rows,
+                                  cache_prefix=os.path.join(cache, "train")),
+                nthread=nthread
+            )
+            dtest = xgb.ExtMemQuantileDMatrix(
+                ReservationChunks(paths, test=True, chunk_rows=chunk_rows,
+                                  cache_prefix=os.path.join(cache, "test")),
+                nthread=nthread, ref=dtrain
+            )
+            y = dtrain.get_label()
+
+        # 5. Calculate Class Weight
+        ratio = float(np.sum(y == 0)) / np.sum(y == 1)
 
+        # 6. Train Booster model (hist, early stopping on test AUC)
+        bst = fit(dtrain, dtest, ratio, nthread, num_boost_round, early_stopping_rounds)
+
+        # 7. Evaluate
+        y_test = dtest.get_label()
+        probs = bst.predict(dtest)
+        preds = (probs >= 0.5).astype(int)
+        # Release the external-memory pages before their cache directory goes away
+        del dtrain, dtest
+
+    auc = roc_auc_score(y_test, probs)
     print("--- Model Evaluation ---")
     print(classification_report(y_test, preds))
-    print(f"AUC-ROC Score: {roc_auc_score(y_test, probs):.4f}")
+    print(f"AUC-ROC Score: {auc:.4f}")
 
     # 8. Save Booster model
     bst.save_model("noshow_xgb.json")
     print("✅ Booster model saved to 'noshow_xgb.json'")
 
+    # 9. Export fast-loading copies (.ubj/.npz) used for serverless cold starts
+    for artifact in export_fast_artifacts("noshow_xgb.json"):
+        print(f"✅ Exported '{artifact}'")
+    return {"rounds": bst.num_boosted_rounds(), "auc": auc}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the no-show XGBoost model")
+    parser.add_argument("inputs", nargs="*", default=["processed_reservations.csv"],
+                        help="processed CSV/Parquet/Feather files or glob patterns")
+    parser.add_argument("--external", action="store_const", const="external", default="memory", dest="mode",
+                        help="stream chunks through XGBoost external memory instead of the feature store")
+    parser.add_argument("--nthread", type=int, help="training threads (default: all CPUs)")
+    parser.add_argument("--rounds", type=int, default=100, help="maximum boosting rounds")
+    parser.add_argument("--early-stopping", type=int, default=10,
+                        help="stop after this many rounds without a better test AUC (0 disables)")
+    parser.add_argument("--chunk-rows", type=int, default=BUILD_CHUNK_ROWS, help="rows per external-memory chunk")
+    args = parser.parse_args()
+    train_pipeline(args.inputs, args.mode, args.nthread, args.rounds, args.early_stopping, args.chunk_rows)
+
+
 if __name__ == "__main__":
-    train_pipeline()
+    main()